@@ -1,14 +1,28 @@
-from flask import Flask, render_template_string, send_from_directory, jsonify
+from flask import Flask, Response, render_template_string, send_from_directory, jsonify, request
 import os
-import re
 import json
+import time
+import threading
+import sqlite3
+from solver.runlog import read_tail, LogTail
+from solver.telemetry import read_telemetry, telemetry_name
+from solver.store import SolutionStore
 
 app = Flask(__name__)
 server = app
 
 IMG_FOLDER = "img"
 os.makedirs(IMG_FOLDER, exist_ok=True)
-LOG_FILE = "log.json"
+LOG_FILE = "log.jsonl"
+STORE_FILE = "solutions/index.sqlite"  # index des solutions écrit par le solveur
+# Puzzle affiché (nom du fichier de définition sans extension, comme dans
+# l'index) : les solutions des autres puzzles ne sont pas mélangées
+PUZZLE = os.environ.get("PUZZLE", "eternity2_256_1")
+# Télémétrie du solveur lancé sur ce puzzle
+TELEMETRY = telemetry_name(PUZZLE)
+LOG_TAIL = 12  # entrées affichées dans la console
+EVENT_INTERVAL = 1.0  # secondes entre deux vérifications du flux /events
+HEARTBEAT = 15.0  # commentaire SSE envoyé sans événement pour garder la connexion
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -50,6 +64,16 @@ body {
     line-height: 1.2;
 }
 #log-window::-webkit-scrollbar { display: none; }
+#chains-window {
+    background-color: #111;
+    padding: 6px;
+    font-size: 14px;
+    line-height: 1.2;
+    max-height: 120px;
+    overflow-y: auto;
+    scrollbar-width: none;
+}
+#chains-window::-webkit-scrollbar { display: none; }
 .log-entry {
     white-space: pre;
     margin: 0;
@@ -120,7 +144,7 @@ body {
 </style>
 <script>
 let currentFiles = {{ current_files | safe }};
-let lastLogHash = "";
+let logEntries = {{ log_entries | safe }};
 
 window.addEventListener('wheel', function(e) { e.preventDefault(); }, { passive: false });
 
@@ -166,29 +190,42 @@ function renderLog(entries) {
     container.scrollTop = container.scrollHeight;
 }
 
-async function fetchUpdates() {
-    try {
-        const respImg = await fetch("/file_list");
-        const dataImg = await respImg.json();
-        const newFiles = dataImg.files;
-        const added = newFiles.filter(f => !currentFiles.includes(f));
-        if (added.length > 0 || newFiles.length !== currentFiles.length) {
-            window.location.reload();
-            return;
-        }
-
-        const respLog = await fetch("/log_data");
-        const dataLog = await respLog.json();
-        if (dataLog.hash !== lastLogHash) {
-            renderLog(dataLog.entries);
-            lastLogHash = dataLog.hash;
-        }
-    } catch(e) {
-        console.error(e);
-    }
+function renderChains(chains) {
+    const container = document.getElementById("chains-window");
+    container.innerHTML = "";
+    const now = Date.now() / 1000;
+    chains.forEach(c => {
+        const stale = c.stale || now - c.updated > 60 ? " (stale)" : "";
+        const div = document.createElement("div");
+        div.className = "log-entry";
+        div.innerHTML =
+            `<span class="key">chain</span>: <span class="value">${padRight(c.chain, 2)}</span> | ` +
+            `<span class="key">best</span>: <span class="value">${padRight(c.best - c.border, 3)}</span> | ` +
+            `<span class="key">current</span>: <span class="value">${padRight(c.current - c.border, 3)}</span> | ` +
+            `<span class="key">T</span>: <span class="value">${padRight(c.temperature.toFixed(3), 6)}</span> | ` +
+            `<span class="key">step</span>: <span class="value">${padRight(formatStep(c.steps), 6)}</span> | ` +
+            `<span class="key">steps_per_sec</span>: <span class="value">${padRight(formatStepSec(c.steps_per_sec), 6)}</span> | ` +
+            `<span class="key">boosts</span>: <span class="value">${c.boosts}${stale}</span>`;
+        container.appendChild(div);
+    });
 }
 
-setInterval(fetchUpdates, 1000);
+// Flux serveur : nouvelles entrées du journal, télémétrie des chaînes et
+// liste des images
+const events = new EventSource("/events?cursor={{ log_cursor }}");
+events.addEventListener("log", e => {
+    logEntries = logEntries.concat(JSON.parse(e.data)).slice(-12);
+    renderLog(logEntries);
+});
+events.addEventListener("chains", e => renderChains(JSON.parse(e.data)));
+events.addEventListener("files", e => {
+    const newFiles = JSON.parse(e.data);
+    const added = newFiles.filter(f => !currentFiles.includes(f));
+    if (added.length > 0 || newFiles.length !== currentFiles.length) {
+        events.close();
+        window.location.reload();
+    }
+});
 </script>
 </head>
 <body>
@@ -205,6 +242,18 @@ setInterval(fetchUpdates, 1000);
     <div id="log-window"></div>
 </div>
 
+<div id="chains-container" class="window" style="width: calc(280px * 3 + 30px);">
+    <div class="title-bar">
+        <div class="window-buttons">
+            <div class="button close"></div>
+            <div class="button minimize"></div>
+            <div class="button maximize"></div>
+        </div>
+        Chaînes
+    </div>
+    <div id="chains-window"></div>
+</div>
+
 <div class="gallery">
     {% for sol in solutions %}
     <div class="window solution-card" onclick="toggleMarks('img{{ loop.index }}')">
@@ -225,7 +274,8 @@ setInterval(fetchUpdates, 1000);
 </div>
 
 <script>
-renderLog({{ log_entries | safe }});
+renderLog(logEntries);
+renderChains({{ chains | safe }});
 </script>
 
 </body>
@@ -236,66 +286,141 @@ renderLog({{ log_entries | safe }});
 def serve_image(filename):
     return send_from_directory(IMG_FOLDER, filename)
 
-def get_top_solutions(n=3):
-    if not os.path.exists(IMG_FOLDER):
-        return []
-    files = os.listdir(IMG_FOLDER)
-    files_with_marks = [f for f in files if "_with_marks" in f and f.endswith(".jpg")]
-    solutions = []
-    pattern = r"partial_solution_(\d+)_with_marks\.jpg$"
-    for f in files_with_marks:
-        match = re.search(pattern, f)
-        if match:
-            score = int(match.group(1))
-            without_file = f.replace("_with_marks", "_without_marks")
-            if without_file in files:
-                solutions.append({
-                    "score": score,
-                    "with_marks": f,
-                    "without_marks": without_file
-                })
-    solutions.sort(key=lambda x: x["score"], reverse=True)
-    return solutions[:n]
+class SolutionIndex:
+    # Meilleures solutions rendues, lues dans l'index SQLite du solveur et
+    # relues seulement quand la base (ou son journal WAL) change
+    def __init__(self, path, puzzle, limit=100):
+        self.store = SolutionStore(path, readonly=True)
+        self.paths = (path, path + "-wal")
+        self.puzzle = puzzle
+        self.limit = limit
+        self.mtime = None
+        self.files = []
+        self.top = []
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        mtime = []
+        for path in self.paths:
+            try:
+                mtime.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtime.append(None)
+        with self.lock:
+            if mtime != self.mtime:
+                try:
+                    rows = self.store.top(self.limit, puzzle=self.puzzle, rendered=True)
+                except sqlite3.Error:
+                    rows = []
+                # Score affiché hors points de bord ; lignes écrites avant
+                # la colonne border : score brut
+                self.top = [{
+                    "score": row["score"] - (row.get("border") or 0),
+                    "mismatches": row["mismatches"],
+                    "with_marks": os.path.basename(row["image_with"]),
+                    "without_marks": os.path.basename(row["image_without"])
+                } for row in rows]
+                self.files = sorted(f for sol in self.top for f in (sol["with_marks"], sol["without_marks"]))
+                self.mtime = mtime
+            return self.files, self.top
+
+solution_index = SolutionIndex(STORE_FILE, PUZZLE)
+
+def simplify(entries):
+    simplified = []
+    for entry in entries:
+        simplified.append({
+            "best_score": entry.get("best_score"),
+            "seed": entry.get("seed"),
+            "elapsed_time": entry.get("elapsed_time",0),
+            "step": entry.get("step"),
+            "steps_per_sec": entry.get("steps_per_sec",0)
+        })
+    return simplified
 
 def read_log():
-    if not os.path.exists(LOG_FILE):
-        return []
-    try:
-        with open(LOG_FILE, "r", encoding="utf-8") as f:
-            logs = json.load(f)
-            simplified = []
-            for entry in logs:
-                simplified.append({
-                    "best_score": entry.get("best_score"),
-                    "seed": entry.get("seed"),
-                    "elapsed_time": entry.get("elapsed_time",0),
-                    "step": entry.get("step"),
-                    "steps_per_sec": entry.get("steps_per_sec",0)
-                })
-            return simplified
-    except json.JSONDecodeError:
-        return []
+    # Seule la fin du journal est lue
+    return simplify(read_tail(LOG_FILE, LOG_TAIL))
 
 def hash_log(entries):
     return str(hash(json.dumps(entries)))
 
 @app.route("/")
 def index():
-    top_solutions = get_top_solutions()
-    files = []
-    if os.path.isdir(IMG_FOLDER):
-        files = sorted(f for f in os.listdir(IMG_FOLDER) if f.endswith(".jpg"))
-
+    files, top = solution_index.refresh()
+    # Curseur pris avant la lecture : une entrée écrite entre les deux
+    # apparaît deux fois plutôt que pas du tout
+    log_cursor = LogTail(LOG_FILE).cursor
     log_entries = read_log()
-    return render_template_string(HTML_TEMPLATE, solutions=top_solutions, current_files=files, log_entries=log_entries)
+    return render_template_string(HTML_TEMPLATE, solutions=top[:3], current_files=files,
+                                  log_entries=log_entries, log_cursor=log_cursor,
+                                  chains=json.dumps(read_telemetry(TELEMETRY)))
 
 @app.route("/file_list")
 def file_list():
-    files = []
-    if os.path.isdir(IMG_FOLDER):
-        files = sorted(f for f in os.listdir(IMG_FOLDER) if f.endswith(".jpg"))
+    return jsonify({"files": solution_index.refresh()[0]})
+
+@app.route("/events")
+def events():
+    # Server-sent events : "log" (nouvelles entrées depuis le curseur),
+    # "chains" (télémétrie, lue en mémoire partagée, à chaque changement) et
+    # "files" (liste des images, à la connexion puis à chaque changement).
+    # Chaque client ne lit que les octets ajoutés au journal.
+    cursor = request.headers.get("Last-Event-ID") or request.args.get("cursor")
+    tail = LogTail(LOG_FILE, cursor)
+
+    def stream():
+        files = None
+        chains = None
+        last_sent = time.time()
+        while True:
+            entries = tail.poll()
+            if entries:
+                yield f"id: {tail.cursor}\nevent: log\ndata: {json.dumps(simplify(entries))}\n\n"
+                last_sent = time.time()
+            telemetry = read_telemetry(TELEMETRY)
+            if telemetry != chains:
+                chains = telemetry
+                yield f"event: chains\ndata: {json.dumps(chains)}\n\n"
+                last_sent = time.time()
+            current = solution_index.refresh()[0]
+            if current is not files:
+                files = current
+                yield f"event: files\ndata: {json.dumps(files)}\n\n"
+                last_sent = time.time()
+            if time.time() - last_sent > HEARTBEAT:
+                yield ": heartbeat\n\n"
+                last_sent = time.time()
+            time.sleep(EVENT_INTERVAL)
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Métriques au format texte de Prometheus : (nom, type, aide, champ)
+METRICS = [
+    ("edge_chain_steps_total", "counter", "Pas effectués par la chaîne", "steps"),
+    ("edge_chain_accepts_total", "counter", "Mouvements acceptés", "accepts"),
+    ("edge_chain_boosts_total", "counter", "Boosts ou réchauffages", "boosts"),
+    ("edge_chain_temperature", "gauge", "Température courante", "temperature"),
+    ("edge_chain_current_score", "gauge", "Score du plateau courant", "current"),
+    ("edge_chain_best_score", "gauge", "Meilleur score de la chaîne", "best"),
+    ("edge_chain_steps_per_second", "gauge", "Débit entre les deux dernières publications", "steps_per_sec"),
+    ("edge_chain_last_update_timestamp_seconds", "gauge", "Date de la dernière publication", "updated"),
+]
 
-    return jsonify({"files": files})
+@app.route("/metrics")
+def metrics():
+    chains = read_telemetry(TELEMETRY)
+    lines = []
+    for name, kind, help_text, field in METRICS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for c in chains:
+            lines.append(f'{name}{{chain="{c["chain"]}",seed="{c["seed"]}"}} {c[field]}')
+    lines.append("# HELP edge_chains Chaînes publiant leur télémétrie")
+    lines.append("# TYPE edge_chains gauge")
+    lines.append(f"edge_chains {len(chains)}")
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
 
 @app.route("/log_data")
 def log_data():
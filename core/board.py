@@ -1,21 +1,182 @@
 import random
-from core.defs import PieceRef, N, E, S, W
+from collections import deque
+from collections.abc import Mapping
+import numpy as np
+from core.defs import N, E, S, W
+
+NO_COLOR = -2  # never equal to a piece color
+# (di, dj) of the neighbour at side E, S, W, N
+OFFSETS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+# The board is stored as arrays: piece id per cell (0 = empty), direction
+# per cell and the (i, j) cell of each piece id (-1 when not placed).
+# colors[id, dir, pos] is the color shown at side pos by piece id placed
+# with direction dir, so matching edges are array lookups.
+# board.board[i][j] and board.board_by_id[id] return BoardPiece views that
+# follow their piece like the former PieceRef objects.
+# matches[i, j, pos] tells whether the side pos of (i, j) matches its
+# neighbour and score counts the matching edges (= evaluate()); both are
+# kept up to date by the methods changing the board, only the cells
+# around a change are re-evaluated.
+
+
+def color_table(puzzle_def):
+    max_id = max(puzzle_def.all, default=0)
+    colors = np.full((max_id + 1, 4, 4), -1, dtype=np.int16)
+    for piece_id, piece in puzzle_def.all.items():
+        for dir in range(4):
+            for pos in range(4):
+                colors[piece_id, dir, pos] = piece.get_color((pos - dir) % 4)
+    return colors
+
+
+class BoardPiece:
+    __slots__ = ("board", "id")
+
+    def __init__(self, board, id):
+        self.board = board
+        self.id = id
+
+    @property
+    def piece_def(self):
+        return self.board.puzzle_def.all[self.id]
+
+    @property
+    def i(self):
+        return int(self.board.position[self.id, 0])
+
+    @property
+    def j(self):
+        return int(self.board.position[self.id, 1])
+
+    @property
+    def dir(self):
+        return int(self.board.dirs[self.i, self.j])
+
+    @dir.setter
+    def dir(self, value):
+        self.board.set_dir(self.i, self.j, value)
+
+    def get_color(self, pos):
+        return int(self.board.colors[self.id, self.dir, pos])
+
+    def set_color(self, pos, color):
+        self.piece_def.set_color((pos - self.dir) % 4, color)
+        self.board.colors[self.id] = color_table_row(self.piece_def)
+        self.board.update_matches(self.i, self.j)
+
+
+def color_table_row(piece_def):
+    return [[piece_def.get_color((pos - dir) % 4) for pos in range(4)] for dir in range(4)]
+
+
+class BoardRow:
+    __slots__ = ("board", "i")
+
+    def __init__(self, board, i):
+        self.board = board
+        self.i = i
+
+    def __getitem__(self, j):
+        piece_id = self.board.pieces[self.i, j]
+        return BoardPiece(self.board, int(piece_id)) if piece_id else None
+
+    def __len__(self):
+        return self.board.width
+
+    def __iter__(self):
+        return (self[j] for j in range(self.board.width))
+
+
+class BoardGrid:
+    __slots__ = ("board",)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, i):
+        if not -self.board.height <= i < self.board.height:
+            raise IndexError(i)
+        return BoardRow(self.board, i % self.board.height)
+
+    def __len__(self):
+        return self.board.height
+
+    def __iter__(self):
+        return (self[i] for i in range(self.board.height))
+
+
+class PiecesById(Mapping):
+    __slots__ = ("board",)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __getitem__(self, piece_id):
+        if piece_id not in self:
+            raise KeyError(piece_id)
+        return BoardPiece(self.board, piece_id)
+
+    def __contains__(self, piece_id):
+        return 0 < piece_id < len(self.board.position) and self.board.position[piece_id, 0] >= 0
+
+    def __iter__(self):
+        return (int(x) for x in np.flatnonzero(self.board.position[:, 0] >= 0))
+
+    def __len__(self):
+        return int(np.count_nonzero(self.board.position[:, 0] >= 0))
+
 
 class Board:
+    __slots__ = ("puzzle_def", "height", "width", "pieces", "dirs", "position", "colors",
+                 "matches", "score", "marks", "hints", "hint_mask")
+
     def __init__(self, puzzle_def):
         self.puzzle_def = puzzle_def
-        self.board = [self.puzzle_def.width*[None] for _ in range(self.puzzle_def.height)]
-        self.board_by_id = {}
-        self.marks = [self.puzzle_def.width * [None] for _ in range(self.puzzle_def.height)]
-        self.hints = [self.puzzle_def.width*[None] for _ in range(self.puzzle_def.height)]
+        self.height = puzzle_def.height
+        self.width = puzzle_def.width
+        self.colors = color_table(puzzle_def)
+        self.pieces = np.zeros((self.height, self.width), dtype=np.int16)
+        self.dirs = np.zeros((self.height, self.width), dtype=np.int8)
+        self.position = np.full((len(self.colors), 2), -1, dtype=np.int16)
+        self.matches = np.zeros((self.height, self.width, 4), dtype=bool)
+        self.score = 0
+        self.marks = [self.width * [None] for _ in range(self.height)]
+        self.hints = [self.width*[None] for _ in range(self.height)]
+        self.hint_mask = np.zeros((self.height, self.width), dtype=bool)
         # place the hints
         for i, j, hint_id, hint_orientation in puzzle_def.hints:
             self.hints[i][j] = puzzle_def.all[hint_id]
             self.hints[i][j].dir = hint_orientation
+            self.hint_mask[i, j] = True
+
+    @property
+    def board(self):
+        return BoardGrid(self)
+
+    @property
+    def board_by_id(self):
+        return PiecesById(self)
 
     def clear(self):
-        self.board = [self.puzzle_def.width * [None] for i in range(self.puzzle_def.height)]
-        self.board_by_id = {}
+        self.pieces[:] = 0
+        self.dirs[:] = 0
+        self.position[:] = -1
+        self.matches[:] = False
+        self.score = 0
+
+    def set_arrays(self, pieces, dirs):
+        # Whole board at once: piece ids (0 = empty) and directions
+        pieces = np.asarray(pieces, dtype=np.int16)
+        placed = pieces[pieces > 0]
+        if len(np.unique(placed)) != len(placed):
+            raise Exception("a piece ID is placed more than once")
+        self.clear()
+        self.pieces[:] = pieces
+        self.dirs[:] = np.asarray(dirs) % 4
+        ii, jj = np.nonzero(pieces)
+        self.position[pieces[ii, jj]] = np.stack([ii, jj], axis=1)
+        self.refresh_matches()
 
     def load(self, filename):
         with open(filename, "r") as f:
@@ -30,14 +191,11 @@ class Board:
 
     def save(self, filename):
         with open(filename, "w") as f:
-            for i in range(self.puzzle_def.height):
-                for j in range(self.puzzle_def.width):
-                    if self.board[i][j]:
-                        f.write(f"{i},{j},{self.board[i][j].piece_def.id},{self.board[i][j].dir}\n")
+            for i, j in zip(*np.nonzero(self.pieces)):
+                f.write(f"{i},{j},{self.pieces[i, j]},{self.dirs[i, j]}\n")
 
     def max_score(self):
-        return self.puzzle_def.width*(self.puzzle_def.height - 1) \
-               + self.puzzle_def.height*(self.puzzle_def.width-1)
+        return self.width*(self.height - 1) + self.height*(self.width-1)
 
     def neighbours_count(self, i, j):
         count = 0
@@ -47,56 +205,49 @@ class Board:
         return count
 
     def enumerate_neigbours(self, i, j, diagonal=False):
-        if j < self.puzzle_def.width - 1 and self.board[i][j + 1]:
-            yield self.board[i][j + 1]
-        if j > 0 and self.board[i][j - 1]:
-            yield self.board[i][j - 1]
-        if i < self.puzzle_def.height - 1 and self.board[i + 1][j]:
-            yield self.board[i + 1][j]
-        if i > 0 and self.board[i - 1][j]:
-            yield self.board[i - 1][j]
+        board = self.board
+        if j < self.width - 1 and self.pieces[i, j + 1]:
+            yield board[i][j + 1]
+        if j > 0 and self.pieces[i, j - 1]:
+            yield board[i][j - 1]
+        if i < self.height - 1 and self.pieces[i + 1, j]:
+            yield board[i + 1][j]
+        if i > 0 and self.pieces[i - 1, j]:
+            yield board[i - 1][j]
 
         if diagonal:
-            if j < self.puzzle_def.width - 1:
-                if i < self.puzzle_def.height - 1 and self.board[i + 1][j + 1]:
-                   yield self.board[i + 1][j + 1]
-                if i > 0 and self.board[i - 1][j + 1]:
-                   yield self.board[i - 1][j + 1]
-            if i < self.puzzle_def.height - 1:
-                if j < self.puzzle_def.width - 1 and self.board[i + 1][j + 1]:
-                    yield self.board[i + 1][j + 1]
-                if j > 0 and self.board[i + 1][j - 1]:
-                    yield self.board[i + 1][j - 1]
+            if j < self.width - 1:
+                if i < self.height - 1 and self.pieces[i + 1, j + 1]:
+                   yield board[i + 1][j + 1]
+                if i > 0 and self.pieces[i - 1, j + 1]:
+                   yield board[i - 1][j + 1]
+            if i < self.height - 1:
+                if j < self.width - 1 and self.pieces[i + 1, j + 1]:
+                    yield board[i + 1][j + 1]
+                if j > 0 and self.pieces[i + 1, j - 1]:
+                    yield board[i + 1][j - 1]
 
 
     def enumerate_corners(self):
-        height = self.puzzle_def.height
-        width = self.puzzle_def.width
         yield 0,0
-        yield 0,width - 1
-        yield height - 1,0
-        yield height - 1,width - 1
+        yield 0,self.width - 1
+        yield self.height - 1,0
+        yield self.height - 1,self.width - 1
 
     def enumerate_top_edges(self):
-        width = self.puzzle_def.width
-        for k in range(1, width-1):
+        for k in range(1, self.width-1):
             yield 0, k
 
     def enumerate_right_edges(self):
-        height = self.puzzle_def.height
-        width = self.puzzle_def.width
-        for k in range(1, height-1):
-            yield k, width-1
+        for k in range(1, self.height-1):
+            yield k, self.width-1
 
     def enumerate_bottom_edges(self):
-        height = self.puzzle_def.height
-        width = self.puzzle_def.width
-        for k in range(1, width-1):
-            yield height-1, k
+        for k in range(1, self.width-1):
+            yield self.height-1, k
 
     def enumerate_left_edges(self):
-        height = self.puzzle_def.height
-        for k in range(1, height-1):
+        for k in range(1, self.height-1):
             yield k, 0
 
     def enumerate_edges(self):
@@ -111,20 +262,19 @@ class Board:
 
 
     def enumerate_inner(self):
-        height = self.puzzle_def.height
-        width = self.puzzle_def.width
-
-        for i in range(1, height-1):
-            for j in range(1, width-1):
+        for i in range(1, self.height-1):
+            for j in range(1, self.width-1):
                 yield i, j
 
     def put_piece(self, i, j, piece_def, dir):
-        # TODO remove currently placed piece in given position
-        ref = PieceRef(piece_def, dir, i, j)
-        self.board[i][j] = ref
         if piece_def.id in self.board_by_id:
             raise Exception(f"ID {piece_def.id} to be placed already on the board!")
-        self.board_by_id[piece_def.id] = ref
+        # a piece already at (i, j) leaves the board
+        self.position[self.pieces[i, j]] = -1
+        self.pieces[i, j] = piece_def.id
+        self.dirs[i, j] = dir % 4
+        self.position[piece_def.id] = i, j
+        self.update_matches(i, j)
 
 
     def randomize(self):
@@ -137,8 +287,8 @@ class Board:
         random.shuffle(edges_idxs)
         random.shuffle(inners_idxs)
 
-        height = self.puzzle_def.height
-        width = self.puzzle_def.width
+        height = self.height
+        width = self.width
         self.put_piece(0, 0, self.puzzle_def.corners[corner_idxs[0]], E)
         self.put_piece(0, width-1, self.puzzle_def.corners[corner_idxs[1]], S)
         self.put_piece(height-1, 0, self.puzzle_def.corners[corner_idxs[2]], N)
@@ -162,133 +312,206 @@ class Board:
             self.put_piece(x, y, self.puzzle_def.inner[inners_idxs[idx]], E)
             idx += 1
 
-        # place the hints to their corresponding locations - inefficient atm
-        for i in range(height):
-            for j in range(width):
-                if self.hints[i][j]:
-                    hint_id = self.hints[i][j].id
-                    curr_i = self.board_by_id[hint_id].i
-                    curr_j = self.board_by_id[hint_id].j
-                    self.exchange(curr_i, curr_j, i, j)
-                    if self.hints[i][j].dir != -1:
-                        self.board[i][j].dir = self.hints[i][j].dir
+        # place the hints to their corresponding locations
+        for i, j in zip(*np.nonzero(self.hint_mask)):
+            hint = self.hints[i][j]
+            curr_i, curr_j = self.position[hint.id]
+            self.exchange(curr_i, curr_j, i, j)
+            if hint.dir != -1:
+                self.set_dir(i, j, hint.dir)
 
         self.fix_orientation()
 
 
-    def fix_orientation(self):
-        height = self.puzzle_def.height
-        width = self.puzzle_def.width
-        if self.board[0][0]:
-            self.board[0][0].dir = E
-        if self.board[0][width-1]:
-            self.board[0][width-1].dir = S
-        if self.board[height-1][0]:
-            self.board[height-1][0].dir = N
-        if self.board[height-1][width-1]:
-            self.board[height-1][width-1].dir = W
-
-        for x, y in self.enumerate_top_edges():
-            if self.board[x][y]:
-                self.board[x][y].dir = E
-        for x, y in self.enumerate_right_edges():
-            if self.board[x][y]:
-                self.board[x][y].dir = S
-        for x, y in self.enumerate_bottom_edges():
-            if self.board[x][y]:
-                self.board[x][y].dir = W
-        for x, y in self.enumerate_left_edges():
-            if self.board[x][y]:
-                self.board[x][y].dir = N
-
-    def heuristic_orientation(self):
-        # try to fix the inner pieces orientation by trying various rotations
-        did_change = True
-        k = 0
-        while did_change:
-            k=+1
-            did_change = False
-            for i, j in self.enumerate_inner():
-                if self.board[i][j]:
-                    if not self.hints[i][j]:
-                        best_dir = 0
-                        best_score = 0
-                        orig_dir = self.board[i][j].dir
-                        for dir in range(4):
-                            self.board[i][j].dir = dir
-                            score = self.evaluate_piece(i,j)
-                            if score > best_score:
-                                best_score = score
-                                best_dir = dir
-                        if best_dir != orig_dir:
-                            did_change = True
-                        self.board[i][j].dir = best_dir
-        if k > 1:
-            print(f"heuristic required {k} iterations")
+    def border_dir(self, i, j):
+        # direction of a corner or edge piece at (i, j), None for inner cells
+        last_i, last_j = self.height - 1, self.width - 1
+        if (i, j) == (0, 0):
+            return E
+        if (i, j) == (0, last_j):
+            return S
+        if (i, j) == (last_i, 0):
+            return N
+        if (i, j) == (last_i, last_j):
+            return W
+        if i == 0:
+            return E
+        if j == last_j:
+            return S
+        if i == last_i:
+            return W
+        if j == 0:
+            return N
+        return None
+
+    def fix_orientation(self, cells=None):
+        # cells: only fix these (i, j) cells, the whole border otherwise
+        if cells is not None:
+            for i, j in cells:
+                dir = self.border_dir(i, j)
+                if dir is not None and self.pieces[i, j]:
+                    self.set_dir(i, j, dir)
+            return
+        height = self.height
+        width = self.width
+        # edges, then corners
+        sides = ((slice(0, 1), slice(1, width - 1), E),
+                 (slice(1, height - 1), slice(width - 1, width), S),
+                 (slice(height - 1, height), slice(1, width - 1), W),
+                 (slice(1, height - 1), slice(0, 1), N),
+                 (0, 0, E), (0, width - 1, S), (height - 1, 0, N), (height - 1, width - 1, W))
+        for rows, cols, dir in sides:
+            dirs = self.dirs[rows, cols]
+            self.dirs[rows, cols] = np.where(self.pieces[rows, cols] > 0, dir, dirs)
+        self.refresh_matches()
+
+    def heuristic_orientation(self, cells=None):
+        # try to fix the inner pieces orientation by trying various rotations;
+        # a cell is visited again only when one of its neighbours turned.
+        # cells: start from the neighbourhood of these cells (e.g. the two
+        # cells of an exchange), from all the inner cells otherwise
+        # (on list copies of the arrays: faster for cell by cell updates)
+        pieces, dirs = self.pieces.tolist(), self.dirs.tolist()
+        table, hints = self.colors.tolist(), self.hint_mask.tolist()
+
+        def movable(i, j):
+            return self.is_inner(i, j) and pieces[i][j] and not hints[i][j]
+
+        if cells is None:
+            todo = deque(self.enumerate_inner())
+        else:
+            todo = deque()
+            for i, j in cells:
+                todo.append((i, j))
+                todo.extend((i + di, j + dj) for di, dj in OFFSETS)
+        todo = deque(dict.fromkeys(cell for cell in todo if movable(*cell)))
+        queued = set(todo)
+        changed = set()
+        while todo:
+            i, j = todo.popleft()
+            queued.discard((i, j))
+            # colors shown towards (i, j) by its 4 neighbours
+            facing = (table[pieces[i][j + 1]][dirs[i][j + 1]][W] if pieces[i][j + 1] else NO_COLOR,
+                      table[pieces[i + 1][j]][dirs[i + 1][j]][N] if pieces[i + 1][j] else NO_COLOR,
+                      table[pieces[i][j - 1]][dirs[i][j - 1]][E] if pieces[i][j - 1] else NO_COLOR,
+                      table[pieces[i - 1][j]][dirs[i - 1][j]][S] if pieces[i - 1][j] else NO_COLOR)
+            best_dir = 0
+            best_score = 0
+            for dir, colors in enumerate(table[pieces[i][j]]):
+                score = sum(c == f for c, f in zip(colors, facing))
+                if score > best_score:
+                    best_score = score
+                    best_dir = dir
+            if best_dir != dirs[i][j]:
+                dirs[i][j] = best_dir
+                changed.add((i, j))
+                for di, dj in OFFSETS:
+                    cell = (i + di, j + dj)
+                    if cell not in queued and movable(*cell):
+                        todo.append(cell)
+                        queued.add(cell)
+        for i, j in changed:
+            self.dirs[i, j] = dirs[i][j]
+        for i, j in changed:
+            self.update_matches(i, j)
+        return changed
 
     def exchange(self, i1, j1, i2, j2):
         # TODO - check we are not mixing corners, edges and inners
-        self.board[i1][j1], self.board[i2][j2] = self.board[i2][j2], self.board[i1][j1]
-        if self.board[i1][j1]:
-            self.board[i1][j1].i = i1
-            self.board[i1][j1].j = j1
-        if self.board[i2][j2]:
-            self.board[i2][j2].i = i2
-            self.board[i2][j2].j = j2
+        p1, p2 = self.pieces[i1, j1], self.pieces[i2, j2]
+        self.pieces[i1, j1], self.pieces[i2, j2] = p2, p1
+        self.dirs[i1, j1], self.dirs[i2, j2] = self.dirs[i2, j2], self.dirs[i1, j1]
+        if p2:
+            self.position[p2] = i1, j1
+        if p1:
+            self.position[p1] = i2, j2
+        self.update_matches(i1, j1)
+        self.update_matches(i2, j2)
+
+    def set_dir(self, i, j, dir):
+        self.dirs[i, j] = dir % 4
+        self.update_matches(i, j)
+
+    def rotate(self, i, j, turns=1):
+        self.set_dir(i, j, self.dirs[i, j] + turns)
+
+    def update_matches(self, i, j):
+        # re-evaluate the 4 edges of (i, j) after a change of this cell
+        pieces, dirs, table = self.pieces, self.dirs, self.colors
+        piece_id = pieces[i, j]
+        for pos, (di, dj) in enumerate(OFFSETS):
+            ni, nj = i + di, j + dj
+            if not (0 <= ni < self.height and 0 <= nj < self.width):
+                continue
+            other = pieces[ni, nj]
+            match = bool(piece_id and other and
+                         table[piece_id, dirs[i, j], pos] == table[other, dirs[ni, nj], (pos + 2) % 4])
+            if match != self.matches[i, j, pos]:
+                self.score += 1 if match else -1
+                self.matches[i, j, pos] = self.matches[ni, nj, (pos + 2) % 4] = match
+
+    def refresh_matches(self):
+        # whole board at once, after bulk changes of the arrays
+        horizontal, vertical = self.edge_matches()
+        self.matches[:] = False
+        self.matches[:, :-1, E] = self.matches[:, 1:, W] = horizontal
+        self.matches[:-1, :, S] = self.matches[1:, :, N] = vertical
+        self.score = int(np.count_nonzero(horizontal) + np.count_nonzero(vertical))
 
     def evaluate_piece(self, i, j):
-        if self.board[i][j]:
+        if self.pieces[i, j]:
             return self.evaluate_at(self.board[i][j], i, j)
         return 0
 
     def evaluate_at(self, piece, i, j):
-        matching = 0
-        if piece:
-            if j < self.puzzle_def.width - 1 and self.board[i][j + 1]:
-                if piece.get_color(E) == self.board[i][j + 1].get_color(W):
-                    matching += 1
-            if j > 0 and self.board[i][j - 1]:
-                if piece.get_color(W) == self.board[i][j - 1].get_color(E):
-                    matching += 1
-
-            if i < self.puzzle_def.height - 1 and self.board[i + 1][j]:
-                if piece.get_color(S) == self.board[i + 1][j].get_color(N):
-                    matching += 1
-            if i > 0 and self.board[i - 1][j]:
-                if piece.get_color(N) == self.board[i - 1][j].get_color(S):
-                    matching += 1
-        return matching
-
+        # piece: any object with piece_def and dir, evaluated as if at (i, j)
+        if not piece:
+            return 0
+        colors = self.colors[piece.piece_def.id, piece.dir]
+        return int(np.count_nonzero(colors == self.facing_colors(i, j)))
+
+    def facing_colors(self, i, j):
+        # colors the neighbours of (i, j) show towards it, indexed by E, S,
+        # W, N (NO_COLOR without a neighbour)
+        facing = np.full(4, NO_COLOR, dtype=np.int16)
+        pieces, dirs, table = self.pieces, self.dirs, self.colors
+        if j < self.width - 1 and pieces[i, j + 1]:
+            facing[E] = table[pieces[i, j + 1], dirs[i, j + 1], W]
+        if i < self.height - 1 and pieces[i + 1, j]:
+            facing[S] = table[pieces[i + 1, j], dirs[i + 1, j], N]
+        if j > 0 and pieces[i, j - 1]:
+            facing[W] = table[pieces[i, j - 1], dirs[i, j - 1], E]
+        if i > 0 and pieces[i - 1, j]:
+            facing[N] = table[pieces[i - 1, j], dirs[i - 1, j], S]
+        return facing
+
+    def side_colors(self):
+        # (height, width, 4) colors shown at each side, indexed by E, S, W, N
+        return self.colors[self.pieces, self.dirs]
+
+    def edge_matches(self):
+        # matching edges between placed pieces: (height, width - 1) between
+        # (i, j) and (i, j + 1), (height - 1, width) between (i, j) and (i + 1, j)
+        colors = self.side_colors()
+        placed = self.pieces > 0
+        horizontal = (colors[:, :-1, E] == colors[:, 1:, W]) & placed[:, :-1] & placed[:, 1:]
+        vertical = (colors[:-1, :, S] == colors[1:, :, N]) & placed[:-1, :] & placed[1:, :]
+        return horizontal, vertical
 
     def evaluate(self):
-        height = self.puzzle_def.height
-        width = self.puzzle_def.width
-        matching = 0
-
-        # number of matching edges
-        for a in range(0, height):
-            for b in range(0, width - 1):
-                if self.board[a][b] and self.board[a][b + 1]:
-                    if self.board[a][b].get_color(E) == self.board[a][b + 1].get_color(W):
-                        matching += 1
-
-        for a in range(0, width):
-            for b in range(0, height - 1):
-                if self.board[b][a] and self.board[b+1][a]:
-                    if self.board[b][a].get_color(S) == self.board[b+1][a].get_color(N):
-                        matching += 1
-
-        return matching
+        # number of matching edges between placed pieces, recomputed (see
+        # score for the running value)
+        horizontal, vertical = self.edge_matches()
+        return int(np.count_nonzero(horizontal) + np.count_nonzero(vertical))
 
     def is_corner(self, i, j):
         return (i==0 and j==0) or \
-               (i==0 and j==self.puzzle_def.width-1)or \
-               (i==self.puzzle_def.height-1 and j==0)or \
-               (i==self.puzzle_def.height-1 and j==self.puzzle_def.width-1)
+               (i==0 and j==self.width-1)or \
+               (i==self.height-1 and j==0)or \
+               (i==self.height-1 and j==self.width-1)
 
     def is_inner(self, i, j):
-        return (0 < i < self.puzzle_def.height-1) and (0 < j < self.puzzle_def.width-1)
+        return (0 < i < self.height-1) and (0 < j < self.width-1)
 
     def is_edge(self, i, j):
         return not self.is_inner(i,j) and not self.is_corner(i,j)
-
@@ -57,7 +57,7 @@ if __name__ == '__main__':
 
     ui = ui.BoardUi(board)
     ui.init()
-    pygame.display.set_caption(f'Puzzle (score {board.evaluate()})')
+    pygame.display.set_caption(f'Puzzle (score {board.score})')
 
     selected_from = None
     selected_to = None
@@ -94,10 +94,11 @@ if __name__ == '__main__':
 
                             board.marks[from_i][from_j], board.marks[to_i][to_j] = \
                                 board.marks[to_i][to_j], board.marks[from_i][from_j]
-                            board.fix_orientation()
+                            # only the two cells and their neighbours are revisited
+                            board.fix_orientation([selected_from, selected_to])
                             # experimental feature
-                            board.heuristic_orientation()
-                            pygame.display.set_caption(f'Puzzle (score {board.evaluate()})')
+                            board.heuristic_orientation([selected_from, selected_to])
+                            pygame.display.set_caption(f'Puzzle (score {board.score})')
                             ui.update()
 
                         selected_from = selected_to = None
@@ -105,9 +106,8 @@ if __name__ == '__main__':
                 else:
                     # rotate
                     if (i > 0) and (i < height - 1) and (j > 0) and (j < width - 1):
-                        board.board[i][j].dir += 1
-                        board.board[i][j].dir %= 4
-                        pygame.display.set_caption(f'Puzzle (score {board.evaluate()})')
+                        board.rotate(i, j)
+                        pygame.display.set_caption(f'Puzzle (score {board.score})')
                         ui.update()
 
 
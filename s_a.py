@@ -1,11 +1,37 @@
-import json
 import os
 import numpy as np
 import pandas as pd
 import multiprocessing
-from numba import njit
+import multiprocessing.connection
+import argparse
+import threading
+import signal
+import glob
+from multiprocessing import shared_memory
+from numba import njit, prange
 import time
 import subprocess
+from core.defs import TYPE_CORNER, TYPE_EDGE, TYPE_INNER
+from solver.puzzle import Puzzle
+from solver.shared_best import GlobalBest
+from solver.checkpoint import (checkpoint_path, save_checkpoint, load_checkpoint,
+                               save_population, load_population,
+                               get_numba_rng_state, set_numba_rng_state)
+from solver.index import (build_color_index, build_side_lists, build_equiv_class,
+                          best_rotation_from_masks)
+from solver.procstats import process_memory, format_memory, process_cpu_seconds, children_cpu_seconds
+from solver.schedule import AdaptiveSchedule, acceptance, calibrate_temperature
+from solver.portfolio import (PortfolioArena, DecisionLog, board_distance, rank_chains,
+                              pick_laggards)
+from solver.runlog import RunLog, append_entry
+from solver.telemetry import Telemetry, telemetry_name
+from solver.store import SolutionStore, canonical_hash, count_mismatches
+from solver.boardfile import (BoardFile, read_csv_board, write_csv_board, append_board,
+                              encode_boards, MAX_PIECES)
+from ui.render_worker import RenderQueue
+
+# Démarrage de l'interpréteur (hérité par les chaînes forkées)
+LAUNCH_TIME = time.time()
 
 # ==============================
 # Classe couleurs ANSI
@@ -16,6 +42,7 @@ class C:
     GREEN   = "\033[32m"
     YELLOW  = "\033[33m"
     BLUE    = "\033[34m"
+    MAGENTA = "\033[35m"
     CYAN    = "\033[36m"
     GRAY    = "\033[90m"
     BOLD    = "\033[1m"
@@ -23,20 +50,102 @@ class C:
 # ==============================
 # Paramètres globaux
 # ==============================
-SIZE = 16
 ROT = 4
-FIX_I, FIX_J = 8, 7
-FIX_PIECE = 138
-FIX_ROT = 0
 NUM_CHAINS = 3
+MODE = "sa"  # "sa" : chaînes indépendantes, "pt" : parallel tempering, "tabu" : recherche tabou,
+             # "memetic" : population croisée + recherche locale,
+             # "portfolio" : chaînes sa remplacées par le planificateur
 T0 = 20.0
 T_MIN = 0.01
 ALPHA = 0.99995
 MAX_STEPS_WITHOUT_IMPROV = 30 * 10000
 BOOST_MAX = 0.55
 BOOST_MIN = 0.15
+SCHEDULE = "fixed"  # "fixed" : T0 / ALPHA / boosts ; "adaptive" : T0 calibrée, acceptation pilotée
+SCHED_ACC_START = 0.2  # part des mouvements dégradants acceptés en début de cycle
+SCHED_ACC_END = 1e-4
+SCHED_ACC_REHEAT = 0.01  # départ des cycles après un réchauffage (et des démarrages à chaud)
+SCHED_CYCLE_STEPS = 5000000  # pas pour parcourir la courbe cible
+SCHED_WINDOW = 20000  # pas entre deux corrections de température
+SCHED_STALL_FACTOR = 8.0  # stagnation, en écarts moyens entre améliorations
+SCHED_SAMPLES = 2000  # variations tirées pour une calibration
 BORDER_PENALTY_WEIGHT = 1
-LOG_FILE = "log.json"
+PT_T_MIN = 0.15
+PT_T_MAX = 0.35
+PT_EXCHANGE_STEPS = 50000
+BATCH_STEPS = 200000
+UNDO_CAP = 32
+IMPROV_CAP = 64
+BLOCK_MAX = 3
+SHIFT_MAX = 8
+POLISH = True  # descente sur les échanges avant chaque boost
+POLISH_TOP_K = 8
+SCAN_CHUNKS = 64
+TABU_TENURE = 64  # entrées (pièce, cellule) interdites, au plus la moitié des cellules mobiles
+TABU_CANDIDATES = 48  # échanges évalués par itération
+TABU_GUIDED = 16  # dont échanges guidés par les couleurs des voisins
+TABU_STALL = 20000  # itérations sans amélioration avant perturbation
+TABU_KICK = 8  # échanges aléatoires de la perturbation
+TABU_BATCH = 5000
+MEMETIC_POP = 16  # plateaux dans l'arène partagée
+MEMETIC_TOURNAMENT = 3
+MEMETIC_LS_STEPS = 300000  # pas de recuit court par enfant
+MEMETIC_T_START = 0.5
+MEMETIC_T_END = 0.05
+PORTFOLIO_INTERVAL = 120  # secondes entre deux tours du planificateur
+PORTFOLIO_MIN_AGE = 600  # secondes de vie avant qu'une chaîne puisse être arrêtée
+PORTFOLIO_REPLACE = 1  # chaînes remplacées par tour
+PORTFOLIO_FRESH = 0.2  # probabilité de repartir d'une graine neuve plutôt que du meneur
+PORTFOLIO_DIVERSITY = 0.1  # part minimale de cellules différentes avec toute autre chaîne
+PORTFOLIO_KICK_MAX = 64  # échanges aléatoires au plus pour atteindre ce plancher
+PORTFOLIO_LOG = "portfolio.jsonl"
+# Probabilités de sélection des mouvements (normalisées au démarrage)
+MOVE_PROBS = {
+    "swap": 0.60,
+    "rotate": 0.15,
+    "cycle3": 0.15,
+    "block": 0.05,
+    "shift": 0.05,
+}
+LOG_FILE = "log.jsonl"  # une entrée JSON par ligne
+LOG_MAX_BYTES = 16 * 1024 * 1024  # rotation vers log.jsonl.1, .2...
+LOG_BACKUPS = 3
+IMG_DIR = "img"
+RENDER_BUCKET = 1  # points par seau de rendu (la demande la plus récente du seau est rendue)
+RENDER_KEEP = 12  # plateaux dont les images sont gardées dans img/ (les meilleurs)
+STORE_FILE = "solutions/index.sqlite"  # index des solutions, tous puzzles confondus
+BOARDS_FILE = "boards.e2b"  # plateaux sauvegardés (format binaire), dans le dossier des solutions
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_INTERVAL = 300  # secondes
+WARM_START = []  # motifs glob de CSV ou .e2b de départ, ex. "solutions/boards.e2b"
+WARM_T0 = 0.2
+PUZZLE_CONF = "data/eternity2/eternity2_256_1.csv"
+PUZZLE_HINTS = "data/eternity2/eternity2_256_hints.csv"  # cellules fixées (pièce centrale)
+
+# Compteurs d'une chaîne (tableau partagé avec run_batch)
+CNT_STEP = 0
+CNT_ACCEPT = 1
+CNT_BOOST = 2
+CNT_STALL = 3
+CNT_POLISH = 4
+CNT_UPHILL = 5  # mouvements dégradants proposés
+CNT_UPHILL_ACCEPT = 6  # mouvements dégradants acceptés
+N_COUNTERS = 7
+
+# Catalogue de mouvements (indices de MOVE_PROBS / move_stats)
+MOVE_SWAP = 0
+MOVE_ROTATE = 1
+MOVE_CYCLE3 = 2
+MOVE_BLOCK = 3
+MOVE_SHIFT = 4
+MOVE_NAMES = ("swap", "rotate", "cycle3", "block", "shift")
+# Colonnes de move_stats
+MS_PROPOSED = 0
+MS_ACCEPTED = 1
+MS_IMPROVED = 2
+
+# Bit de cell_mask marquant une cellule fixée (les bits 0-3 sont les côtés extérieurs)
+CELL_FIXED = 16
 
 DIRS = np.array([[-1,0],[0,1],[1,0],[0,-1]], dtype=np.int64)
 OPP = np.array([2,3,0,1], dtype=np.int64)
@@ -56,28 +165,128 @@ def precompute_rotations(tiles):
             t_rot[p*ROT+r] = np.roll(tiles[p], -r)
     return t_rot, N, S
 
+def load_puzzle(conf=PUZZLE_CONF, hints=PUZZLE_HINTS):
+    return Puzzle.load(conf, hints)
+
+def class_slot_counts(puzzle):
+    # Cellules mobiles (non fixées) de chaque classe : coins, bords, intérieur
+    fixed = {(i, j) for i, j, _, _ in puzzle.fixed}
+    counts = np.zeros(3, dtype=np.int64)
+    for i in range(puzzle.height):
+        for j in range(puzzle.width):
+            if (i, j) not in fixed:
+                counts[puzzle.cell_type(i, j)] += 1
+    return counts
+
+def build_move_tables(puzzle):
+    # slots : cellules mobiles regroupées par classe, slots[class_start[c]:class_start[c+1]]
+    # (class_start[c+1] - class_start[c] : nombre de cellules mobiles de la classe c)
+    # cell_mask : côtés de la cellule tournés vers l'extérieur (bit d = direction d),
+    # plus CELL_FIXED pour les cellules fixées
+    # border_rot : rotation qui place exactement les côtés gris vers l'extérieur
+    H, W = puzzle.shape
+    t_rot, N = puzzle.t_rot, puzzle.N
+    fixed = {(i, j) for i, j, _, _ in puzzle.fixed}
+    class_start = np.zeros(4, dtype=np.int64)
+    class_start[1:] = np.cumsum(class_slot_counts(puzzle))
+    slots = np.zeros((class_start[3],2), dtype=np.int64)
+    k = 0
+    for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER):
+        for i in range(H):
+            for j in range(W):
+                if puzzle.cell_type(i, j)==c and (i,j) not in fixed:
+                    slots[k] = i, j
+                    k += 1
+
+    cell_mask = np.zeros((H,W), dtype=np.int64)
+    for i in range(H):
+        for j in range(W):
+            cell_mask[i,j] = (i==0)*1 | (j==W-1)*2 | (i==H-1)*4 | (j==0)*8
+    for i, j in fixed:
+        cell_mask[i,j] |= CELL_FIXED
+
+    border_rot = np.full((N,16), -1, dtype=np.int64)
+    for p in range(N):
+        for mask in range(16):
+            for r in range(ROT):
+                t = t_rot[p*ROT+r]
+                if all((t[d]==-1)==bool(mask>>d & 1) for d in range(4)):
+                    border_rot[p,mask] = r
+                    break
+    return slots, class_start, cell_mask, border_rot
+
+def build_swap_pairs(class_start):
+    # Toutes les paires de slots de même classe (k1 < k2)
+    pairs = []
+    for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER):
+        for k1 in range(class_start[c], class_start[c+1]):
+            for k2 in range(k1+1, class_start[c+1]):
+                pairs.append((k1, k2))
+    return np.array(pairs, dtype=np.int64)
+
+def applicable_moves(puzzle):
+    # Mouvements qui trouvent toujours des cellules sur cette instance
+    # (petits plateaux, classes réduites par les cellules fixées) ; les
+    # noyaux tirent leurs cellules jusqu'à en trouver et bouclent sinon
+    H, W = puzzle.shape
+    counts = class_slot_counts(puzzle)
+    fixed = {(i, j) for i, j, _, _ in puzzle.fixed}
+    fixed_pieces = {p for _, _, p, _ in puzzle.fixed}
+    equiv_class = build_equiv_class(puzzle.t_rot)
+    ok = np.zeros(len(MOVE_NAMES), dtype=bool)
+    # Échange : deux pièces mobiles non équivalentes dans une même classe
+    for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER):
+        movable = {equiv_class[p] for p in range(puzzle.N)
+                   if puzzle.piece_types[p] == c and p not in fixed_pieces}
+        ok[MOVE_SWAP] |= len(movable) >= 2
+    ok[MOVE_ROTATE] = counts[TYPE_INNER] >= 1
+    ok[MOVE_CYCLE3] = counts.max() >= 3
+    # Blocs : deux blocs 2x2 intérieurs disjoints sans cellule fixée
+    hin, win = H - 2, W - 2
+    if min(hin, win) >= 2 and max(hin, win) >= 4:
+        free = [(a, b) for a in range(1, H-2) for b in range(1, W-2)
+                if not fixed & {(a, b), (a+1, b), (a, b+1), (a+1, b+1)}]
+        ok[MOVE_BLOCK] = any(abs(a1-a2) >= 2 or abs(b1-b2) >= 2
+                             for a1, b1 in free for a2, b2 in free)
+    # Décalage : un segment de 3 cases de bord, hors coins, sans cellule fixée
+    if min(hin, win) >= 3:
+        sides = ([(0, x) for x in range(1, W-1)], [(x, W-1) for x in range(1, H-1)],
+                 [(H-1, x) for x in range(1, W-1)], [(x, 0) for x in range(1, H-1)])
+        ok[MOVE_SHIFT] = any(not fixed & set(side[m:m+3])
+                             for side in sides for m in range(len(side) - 2))
+    return ok
+
+def build_move_cdf(move_probs=MOVE_PROBS, puzzle=None):
+    probs = np.array([move_probs.get(name, 0.0) for name in MOVE_NAMES], dtype=np.float64)
+    if puzzle is not None:
+        probs[~applicable_moves(puzzle)] = 0.0
+    if probs.sum() <= 0:
+        raise ValueError("MOVE_PROBS must select at least one move applicable to the puzzle")
+    return np.cumsum(probs / probs.sum())
+
 # ==============================
 # Score compilé
 # ==============================
-@njit
+@njit(cache=True)
 def score_numba(board_p, board_r, t_rot):
+    H, W = board_p.shape
     total = 0
-    for i in range(SIZE):
-        for j in range(SIZE):
+    for i in range(H):
+        for j in range(W):
             p = board_p[i,j]
             r = board_r[i,j]
             s = p*ROT+r
             t = t_rot[s]
             if i==0 and t[0]==-1: total += BORDER_PENALTY_WEIGHT
-            if j==SIZE-1 and t[1]==-1: total += BORDER_PENALTY_WEIGHT
-            if i==SIZE-1 and t[2]==-1: total += BORDER_PENALTY_WEIGHT
+            if j==W-1 and t[1]==-1: total += BORDER_PENALTY_WEIGHT
+            if i==H-1 and t[2]==-1: total += BORDER_PENALTY_WEIGHT
             if j==0 and t[3]==-1: total += BORDER_PENALTY_WEIGHT
-            if i+1<SIZE:
+            if i+1<H:
                 p2 = board_p[i+1,j]
                 r2 = board_r[i+1,j]
                 s2 = p2*ROT+r2
                 if t[2]==t_rot[s2][0]: total += 1
-            if j+1<SIZE:
+            if j+1<W:
                 p2 = board_p[i,j+1]
                 r2 = board_r[i,j+1]
                 s2 = p2*ROT+r2
@@ -85,81 +294,511 @@ def score_numba(board_p, board_r, t_rot):
     return total
 
 # ==============================
-# Optimisation locale compilée
+# Score local / delta compilé
 # ==============================
-@njit
-def optimize_local(board_p, board_r, t_rot, positions):
+@njit(cache=True)
+def local_score_numba(board_p, board_r, t_rot, positions):
+    # Contribution des cellules `positions` au score global : bords de ces
+    # cellules + arêtes qui les touchent (une arête partagée entre deux
+    # cellules de `positions` n'est comptée qu'une fois).
+    H, W = board_p.shape
+    total = 0
     for idx in range(positions.shape[0]):
-        i,j = positions[idx]
-        if i==FIX_I and j==FIX_J:
+        i = positions[idx,0]
+        j = positions[idx,1]
+        t = t_rot[board_p[i,j]*ROT+board_r[i,j]]
+        if i==0 and t[0]==-1: total += BORDER_PENALTY_WEIGHT
+        if j==W-1 and t[1]==-1: total += BORDER_PENALTY_WEIGHT
+        if i==H-1 and t[2]==-1: total += BORDER_PENALTY_WEIGHT
+        if j==0 and t[3]==-1: total += BORDER_PENALTY_WEIGHT
+        for d in range(4):
+            ni = i + DIRS[d,0]
+            nj = j + DIRS[d,1]
+            if 0<=ni<H and 0<=nj<W:
+                counted = False
+                for k in range(idx):
+                    if positions[k,0]==ni and positions[k,1]==nj:
+                        counted = True
+                        break
+                if counted:
+                    continue
+                t2 = t_rot[board_p[ni,nj]*ROT+board_r[ni,nj]]
+                if t[d]==t2[OPP[d]]:
+                    total += 1
+    return total
+
+# ==============================
+# Orientation compilée
+# ==============================
+@njit(cache=True)
+def orient_inner_numba(board_p, board_r, t_rot, rot_mask, i, j):
+    # Rotation d'une cellule intérieure qui accorde le plus de côtés avec
+    # ses voisins (la plus petite à égalité), à partir des masques de
+    # rotations compatibles avec chaque voisin ; utilisée par orient_cells
+    H, W = board_p.shape
+    p = board_p[i,j]
+    m0 = m1 = m2 = m3 = 0
+    for d in range(4):
+        ni = i + DIRS[d,0]
+        nj = j + DIRS[d,1]
+        if 0<=ni<H and 0<=nj<W:
+            c = t_rot[board_p[ni,nj]*ROT+board_r[ni,nj], OPP[d]]
+        else:
+            c = -1
+        m = rot_mask[p*ROT+d, c+1]
+        if d == 0:
+            m0 = m
+        elif d == 1:
+            m1 = m
+        elif d == 2:
+            m2 = m
+        else:
+            m3 = m
+    board_r[i,j] = best_rotation_from_masks(m0, m1, m2, m3)
+
+# ==============================
+# Journal d'annulation compilé
+# ==============================
+@njit(cache=True)
+def record_undo_numba(board_p, board_r, positions, undo):
+    # Sauvegarde (i, j, pièce, rotation) des cellules avant modification
+    for k in range(positions.shape[0]):
+        i = positions[k,0]
+        j = positions[k,1]
+        undo[k,0] = i
+        undo[k,1] = j
+        undo[k,2] = board_p[i,j]
+        undo[k,3] = board_r[i,j]
+
+@njit(cache=True)
+def undo_move_numba(board_p, board_r, undo, n):
+    for k in range(n-1, -1, -1):
+        i = undo[k,0]
+        j = undo[k,1]
+        board_p[i,j] = undo[k,2]
+        board_r[i,j] = undo[k,3]
+
+# ==============================
+# Catalogue de mouvements compilé
+# ==============================
+# Chaque mouvement choisit ses cellules dans `affected`, journalise leur
+# état dans `undo`, modifie le plateau en place et renvoie le nombre de
+# cellules journalisées ainsi que la variation de score.
+
+@njit(cache=True)
+def orient_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask, positions):
+    # Pièces du cadre : orientation imposée par les côtés extérieurs ;
+    # pièces intérieures : meilleure rotation vis-à-vis des voisins
+    for k in range(positions.shape[0]):
+        i = positions[k,0]
+        j = positions[k,1]
+        if cell_mask[i,j] != 0:
+            board_r[i,j] = border_rot[board_p[i,j], cell_mask[i,j]]
+        else:
+            orient_inner_numba(board_p, board_r, t_rot, rot_mask, i, j)
+
+@njit(cache=True)
+def random_slot_class(class_start, min_slots):
+    # Slot tiré uniformément parmi les classes d'au moins min_slots slots
+    # (il doit en exister une : voir applicable_moves)
+    total = 0
+    for c in range(3):
+        if class_start[c+1] - class_start[c] >= min_slots:
+            total += class_start[c+1] - class_start[c]
+    k = np.random.randint(0, total)
+    c = 0
+    while True:
+        n = class_start[c+1] - class_start[c]
+        if n >= min_slots:
+            if k < n:
+                return class_start[c] + k, c
+            k -= n
+        c += 1
+
+@njit(cache=True)
+def random_swap_pair(class_start):
+    # Deux slots distincts de même classe
+    k1, c = random_slot_class(class_start, 2)
+    k2 = np.random.randint(class_start[c], class_start[c+1]-1)
+    if k2 >= k1:
+        k2 += 1
+    return k1, k2
+
+@njit(cache=True)
+def swap_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask,
+               i1, j1, i2, j2, affected, undo):
+    # Échange (i1,j1) et (i2,j2) puis réoriente les deux pièces ;
+    # journalise 2 cellules et renvoie la variation de score
+    affected[0,0], affected[0,1] = i1, j1
+    affected[1,0], affected[1,1] = i2, j2
+    positions = affected[:2]
+    record_undo_numba(board_p, board_r, positions, undo)
+    before = local_score_numba(board_p, board_r, t_rot, positions)
+    board_p[i1,j1], board_p[i2,j2] = board_p[i2,j2], board_p[i1,j1]
+    board_r[i1,j1], board_r[i2,j2] = board_r[i2,j2], board_r[i1,j1]
+    orient_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask, positions)
+    return local_score_numba(board_p, board_r, t_rot, positions) - before
+
+@njit(cache=True)
+def move_swap(board_p, board_r, t_rot, slots, class_start, cell_mask,
+              border_rot, rot_mask, equiv_class, affected, undo):
+    # Échange deux cellules de même classe (coin, bord, intérieur) ; les
+    # paires de pièces identiques à une rotation près sont retirées (la
+    # classe est tirée de nouveau à chaque essai)
+    while True:
+        k1, k2 = random_swap_pair(class_start)
+        i1, j1 = slots[k1,0], slots[k1,1]
+        i2, j2 = slots[k2,0], slots[k2,1]
+        if equiv_class[board_p[i1,j1]] != equiv_class[board_p[i2,j2]]:
+            break
+    return 2, swap_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask,
+                         i1, j1, i2, j2, affected, undo)
+
+@njit(cache=True)
+def move_rotate(board_p, board_r, t_rot, slots, class_start, affected, undo):
+    # Tourne une pièce intérieure d'un quart, d'un demi ou de trois quarts de tour
+    k = np.random.randint(class_start[TYPE_INNER], class_start[3])
+    i, j = slots[k,0], slots[k,1]
+    affected[0,0], affected[0,1] = i, j
+    positions = affected[:1]
+    record_undo_numba(board_p, board_r, positions, undo)
+    before = local_score_numba(board_p, board_r, t_rot, positions)
+    board_r[i,j] = (board_r[i,j] + np.random.randint(1,ROT)) % ROT
+    return 1, local_score_numba(board_p, board_r, t_rot, positions) - before
+
+@njit(cache=True)
+def move_cycle3(board_p, board_r, t_rot, slots, class_start, cell_mask,
+                border_rot, rot_mask, affected, undo):
+    # Permutation circulaire de trois pièces de même classe
+    k1, c = random_slot_class(class_start, 3)
+    while True:
+        k2 = np.random.randint(class_start[c], class_start[c+1])
+        k3 = np.random.randint(class_start[c], class_start[c+1])
+        if k2 != k1 and k3 != k1 and k3 != k2:
+            break
+    for m, k in enumerate((k1, k2, k3)):
+        affected[m,0], affected[m,1] = slots[k,0], slots[k,1]
+    positions = affected[:3]
+    record_undo_numba(board_p, board_r, positions, undo)
+    before = local_score_numba(board_p, board_r, t_rot, positions)
+    for m in range(3):
+        src_m = (m + 2) % 3
+        board_p[positions[m,0],positions[m,1]] = undo[src_m,2]
+        board_r[positions[m,0],positions[m,1]] = undo[src_m,3]
+    orient_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask, positions)
+    return 3, local_score_numba(board_p, board_r, t_rot, positions) - before
+
+@njit(cache=True)
+def move_block(board_p, board_r, t_rot, cell_mask, affected, undo):
+    # Échange deux blocs k×k intérieurs disjoints, sans cellule fixée ;
+    # chaque bloc est tourné de q quarts de tour (q=0 : orientation conservée)
+    H, W = board_p.shape
+    k_max = BLOCK_MAX
+    while k_max > 2 and (k_max > min(H, W)-2 or max(H, W)-2 < 2*k_max):
+        k_max -= 1
+    while True:
+        # k tiré à chaque essai : seuls des blocs 2x2 libres peuvent exister
+        k = np.random.randint(2, k_max+1)
+        a1 = np.random.randint(1, H-k)
+        b1 = np.random.randint(1, W-k)
+        a2 = np.random.randint(1, H-k)
+        b2 = np.random.randint(1, W-k)
+        if abs(a1-a2) < k and abs(b1-b2) < k:
             continue
-        p = board_p[i,j]
-        best_score = -1
-        best_r = 0
-        for r in range(ROT):
-            board_r[i,j] = r
-            s = p*ROT + r
-            local = 0
-            for d in range(4):
-                di = DIRS[d,0]
-                dj = DIRS[d,1]
-                ni = i + di
-                nj = j + dj
-                if 0<=ni<SIZE and 0<=nj<SIZE:
-                    p2 = board_p[ni,nj]
-                    r2 = board_r[ni,nj]
-                    s2 = p2*ROT+r2
-                    if t_rot[s][d]==t_rot[s2][OPP[d]]:
-                        local +=1
-            t = t_rot[s]
-            if i==0 and t[0]==-1: local += BORDER_PENALTY_WEIGHT
-            if j==SIZE-1 and t[1]==-1: local += BORDER_PENALTY_WEIGHT
-            if i==SIZE-1 and t[2]==-1: local += BORDER_PENALTY_WEIGHT
-            if j==0 and t[3]==-1: local += BORDER_PENALTY_WEIGHT
-            if local>best_score:
-                best_score = local
-                best_r = r
-        board_r[i,j] = best_r
+        has_fixed = False
+        for a in range(k):
+            for b in range(k):
+                if (cell_mask[a1+a,b1+b] | cell_mask[a2+a,b2+b]) & CELL_FIXED:
+                    has_fixed = True
+        if not has_fixed:
+            break
+    q = np.random.randint(0, ROT)
+    kk = k*k
+    for a in range(k):
+        for b in range(k):
+            affected[a*k+b,0], affected[a*k+b,1] = a1+a, b1+b
+            affected[kk+a*k+b,0], affected[kk+a*k+b,1] = a2+a, b2+b
+    positions = affected[:2*kk]
+    record_undo_numba(board_p, board_r, positions, undo)
+    before = local_score_numba(board_p, board_r, t_rot, positions)
+    for a in range(k):
+        for b in range(k):
+            # Rotation horaire de q quarts de tour : (a, b) -> (b, k-1-a)
+            na, nb = a, b
+            for _ in range(q):
+                na, nb = nb, k-1-na
+            src1 = a*k+b
+            src2 = kk+a*k+b
+            board_p[a2+na,b2+nb] = undo[src1,2]
+            board_r[a2+na,b2+nb] = (undo[src1,3] - q) % ROT
+            board_p[a1+na,b1+nb] = undo[src2,2]
+            board_r[a1+na,b1+nb] = (undo[src2,3] - q) % ROT
+    return 2*kk, local_score_numba(board_p, board_r, t_rot, positions) - before
+
+@njit(cache=True)
+def move_shift(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask, affected, undo):
+    # Décalage circulaire d'un segment de bord (hors coins et cellules
+    # fixées) d'une case
+    H, W = board_p.shape
+    while True:
+        side = np.random.randint(0, 4)
+        n = W if side % 2 == 0 else H
+        L = np.random.randint(3, min(SHIFT_MAX, n-2)+1)
+        start = np.random.randint(1, n-L)
+        has_fixed = False
+        for m in range(L):
+            x = start + m
+            if side == 0:
+                affected[m,0], affected[m,1] = 0, x
+            elif side == 1:
+                affected[m,0], affected[m,1] = x, W-1
+            elif side == 2:
+                affected[m,0], affected[m,1] = H-1, x
+            else:
+                affected[m,0], affected[m,1] = x, 0
+            if cell_mask[affected[m,0],affected[m,1]] & CELL_FIXED:
+                has_fixed = True
+        if not has_fixed:
+            break
+    positions = affected[:L]
+    record_undo_numba(board_p, board_r, positions, undo)
+    before = local_score_numba(board_p, board_r, t_rot, positions)
+    s = 1 if np.random.rand() < 0.5 else L-1
+    for m in range(L):
+        src_m = (m + s) % L
+        board_p[positions[m,0],positions[m,1]] = undo[src_m,2]
+    orient_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask, positions)
+    return L, local_score_numba(board_p, board_r, t_rot, positions) - before
+
+@njit(cache=True)
+def propose_move_numba(board_p, board_r, t_rot, slots, class_start, cell_mask,
+                       border_rot, rot_mask, equiv_class, move_cdf, affected, undo):
+    # Tire un mouvement selon move_cdf et l'applique en place ;
+    # renvoie (type de mouvement, cellules journalisées, variation de score)
+    u = np.random.rand()
+    move = 0
+    while move < move_cdf.shape[0]-1 and u >= move_cdf[move]:
+        move += 1
+    if move == MOVE_ROTATE:
+        n, dS = move_rotate(board_p, board_r, t_rot, slots, class_start, affected, undo)
+    elif move == MOVE_CYCLE3:
+        n, dS = move_cycle3(board_p, board_r, t_rot, slots, class_start, cell_mask,
+                            border_rot, rot_mask, affected, undo)
+    elif move == MOVE_BLOCK:
+        n, dS = move_block(board_p, board_r, t_rot, cell_mask, affected, undo)
+    elif move == MOVE_SHIFT:
+        n, dS = move_shift(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask,
+                           affected, undo)
+    else:
+        n, dS = move_swap(board_p, board_r, t_rot, slots, class_start, cell_mask,
+                          border_rot, rot_mask, equiv_class, affected, undo)
+    return move, n, dS
 
 # ==============================
-# Propose move compilé
+# Voisinage complet des échanges (polissage)
 # ==============================
-@njit
-def propose_move_numba(board_p, board_r):
+# scan_swaps_numba évalue tous les échanges légaux (pairs, même classe)
+# avec réorientation, répartis en SCAN_CHUNKS blocs traités en parallèle
+# sur une copie du plateau par bloc ; le résultat ne dépend pas du nombre
+# de threads. polish_numba en fait une descente de plus forte pente.
+
+@njit(parallel=True, cache=True)
+def scan_swaps_numba(board_p, board_r, t_rot, slots, pairs, cell_mask, border_rot,
+                     rot_mask, equiv_class, top_k):
+    # Renvoie les top_k meilleurs échanges (indices dans pairs) et leurs
+    # variations de score, par variation décroissante
+    n_pairs = pairs.shape[0]
+    n_chunks = min(SCAN_CHUNKS, n_pairs)
+    chunk_q = np.full((n_chunks, top_k), -1, dtype=np.int64)
+    chunk_dS = np.full((n_chunks, top_k), -(1 << 62), dtype=np.int64)
+    for c in prange(n_chunks):
+        bp = board_p.copy()
+        br = board_r.copy()
+        affected = np.zeros((2,2), dtype=np.int64)
+        undo = np.zeros((2,4), dtype=np.int64)
+        for q in range(c*n_pairs//n_chunks, (c+1)*n_pairs//n_chunks):
+            i1, j1 = slots[pairs[q,0],0], slots[pairs[q,0],1]
+            i2, j2 = slots[pairs[q,1],0], slots[pairs[q,1],1]
+            if equiv_class[bp[i1,j1]] == equiv_class[bp[i2,j2]]:
+                continue
+            dS = swap_cells(bp, br, t_rot, cell_mask, border_rot, rot_mask,
+                            i1, j1, i2, j2, affected, undo)
+            undo_move_numba(bp, br, undo, 2)
+            if dS <= chunk_dS[c,top_k-1]:
+                continue
+            m = top_k-1
+            while m > 0 and dS > chunk_dS[c,m-1]:
+                chunk_q[c,m] = chunk_q[c,m-1]
+                chunk_dS[c,m] = chunk_dS[c,m-1]
+                m -= 1
+            chunk_q[c,m] = q
+            chunk_dS[c,m] = dS
+
+    flat_q = chunk_q.ravel()
+    flat_dS = chunk_dS.ravel()
+    order = np.argsort(-flat_dS, kind="mergesort")[:top_k]
+    return flat_q[order], flat_dS[order]
+
+@njit(cache=True)
+def polish_numba(board_p, board_r, t_rot, slots, pairs, cell_mask, border_rot,
+                 rot_mask, equiv_class, affected, undo, top_k):
+    # Applique les meilleurs échanges améliorants jusqu'à ce qu'aucun
+    # échange ne fasse monter le score. Après le premier, chaque candidat
+    # du lot est réévalué sur le plateau modifié et annulé s'il ne gagne plus.
+    gain = 0
+    n_moves = 0
     while True:
-        i1,j1 = np.random.randint(0,SIZE), np.random.randint(0,SIZE)
-        i2,j2 = np.random.randint(0,SIZE), np.random.randint(0,SIZE)
-        if (i1,j1)!=(i2,j2) and (i1,j1)!=(FIX_I,FIX_J) and (i2,j2)!=(FIX_I,FIX_J):
+        top_q, top_dS = scan_swaps_numba(board_p, board_r, t_rot, slots, pairs, cell_mask,
+                                         border_rot, rot_mask, equiv_class, top_k)
+        if top_dS[0] <= 0:
             break
-    new_p = board_p.copy()
-    new_r = board_r.copy()
-    new_p[i1,j1], new_p[i2,j2] = new_p[i2,j2], new_p[i1,j1]
-    new_r[i1,j1], new_r[i2,j2] = new_r[i2,j2], new_r[i1,j1]
-    affected = np.array([[i1,j1],[i2,j2]], dtype=np.int64)
-    return new_p, new_r, affected
+        for m in range(top_k):
+            q = top_q[m]
+            if q < 0 or top_dS[m] <= 0:
+                break
+            i1, j1 = slots[pairs[q,0],0], slots[pairs[q,0],1]
+            i2, j2 = slots[pairs[q,1],0], slots[pairs[q,1],1]
+            if equiv_class[board_p[i1,j1]] == equiv_class[board_p[i2,j2]]:
+                continue
+            dS = swap_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask,
+                            i1, j1, i2, j2, affected, undo)
+            if dS > 0:
+                gain += dS
+                n_moves += 1
+            else:
+                undo_move_numba(board_p, board_r, undo, 2)
+    return gain, n_moves
+
+# ==============================
+# Boucle de recuit compilée
+# ==============================
+@njit(cache=True)
+def seed_numba(seed):
+    # Le générateur de numba est distinct de celui de numpy côté Python
+    np.random.seed(seed)
+
+@njit(cache=True)
+def boost_numba(counters):
+    rand_factor = np.random.rand() # uniforme entre 0 et 1
+    counters[CNT_STALL] = 0
+    counters[CNT_BOOST] += 1
+    return max(BOOST_MAX * rand_factor, BOOST_MIN)
+
+@njit(cache=True)
+def run_batch(board_p, board_r, best_p, best_r, t_rot, slots, class_start,
+              cell_mask, border_rot, rot_mask, equiv_class, move_cdf, affected, undo, counters,
+              move_stats, improv, T, current_score, best_score, n_steps, max_score,
+              alpha, stall_limit, stop_on_stall=False):
+    # Exécute `n_steps` pas de recuit (proposition, acceptation,
+    # refroidissement, boost). Les améliorations (pas, score) sont écrites
+    # dans `improv` ; le meilleur plateau est maintenu dans best_p/best_r.
+    # alpha=1 et stall_limit infini donnent une chaîne à température fixe.
+    # stop_on_stall : rend la main au lieu de booster (polissage côté appelant).
+    n_improv = 0
+    for _ in range(n_steps):
+        move, n_undo, dS = propose_move_numba(board_p, board_r, t_rot, slots, class_start,
+                                              cell_mask, border_rot, rot_mask, equiv_class,
+                                              move_cdf, affected, undo)
+        move_stats[move,MS_PROPOSED] += 1
+        if dS < 0:
+            counters[CNT_UPHILL] += 1
+
+        if dS > 0 or np.random.rand() < np.exp(dS / T):
+            current_score += dS
+            counters[CNT_ACCEPT] += 1
+            if dS < 0:
+                counters[CNT_UPHILL_ACCEPT] += 1
+            move_stats[move,MS_ACCEPTED] += 1
+            if dS > 0:
+                move_stats[move,MS_IMPROVED] += 1
+
+            if current_score > best_score:
+                best_p[:, :] = board_p
+                best_r[:, :] = board_r
+                best_score = current_score
+                counters[CNT_STALL] = 0
+                k = min(n_improv, improv.shape[0]-1)
+                improv[k,0] = counters[CNT_STEP]
+                improv[k,1] = best_score
+                n_improv = k + 1
+        else:
+            undo_move_numba(board_p, board_r, undo, n_undo)
+            counters[CNT_STALL] += 1
+
+        T = max(T*alpha, T_MIN)
+        counters[CNT_STEP] += 1
+
+        if counters[CNT_STALL] > stall_limit:
+            if stop_on_stall:
+                break
+            T = boost_numba(counters)
+
+        if best_score == max_score:
+            break
+    return T, current_score, best_score, n_improv
+
+@njit(cache=True)
+def sample_deltas_numba(board_p, board_r, t_rot, slots, class_start, cell_mask,
+                        border_rot, rot_mask, equiv_class, move_cdf, affected, undo, n):
+    # Variations de score de n mouvements proposés puis annulés (calibration)
+    deltas = np.zeros(n, dtype=np.int64)
+    for k in range(n):
+        _, n_undo, dS = propose_move_numba(board_p, board_r, t_rot, slots, class_start,
+                                           cell_mask, border_rot, rot_mask, equiv_class,
+                                           move_cdf, affected, undo)
+        undo_move_numba(board_p, board_r, undo, n_undo)
+        deltas[k] = dS
+    return deltas
 
 # ==============================
 # Sauvegarde CSV
 # ==============================
-def save_board_csv(board_p, board_r, score):
-    os.makedirs("solutions", exist_ok=True)
-    filename = f"solutions/partial_solution_{score}.csv"
+# File de rendu du lanceur, héritée par les chaînes forkées
+_render_queue = None
+# Rendus generate.py lancés sans file de rendu, attendus au fil des appels
+_render_children = []
+# Index des solutions ; chaque processus ouvre sa connexion au premier ajout
+_solution_store = SolutionStore(STORE_FILE)
+
+def puzzle_dir(base, puzzle):
+    # Les autres puzzles que celui par défaut écrivent dans un sous-dossier
+    if puzzle is None or puzzle.conf == PUZZLE_CONF:
+        return base
+    return os.path.join(base, puzzle.name)
 
-    if os.path.exists(filename) or score < 480:
+def save_board_csv(board_p, board_r, score, puzzle, seed=-1, chain=-1):
+    # Puzzle par défaut : solutions partielles à partir de 480 ;
+    # autres puzzles : solutions complètes uniquement. Un plateau déjà
+    # indexé (à une rotation près) n'est ni réécrit ni re-rendu. Chaque
+    # plateau est aussi ajouté, avec son score, à boards.e2b du dossier.
+    directory = puzzle_dir("solutions", puzzle)
+    min_score = 480 if directory == "solutions" else puzzle.max_score(BORDER_PENALTY_WEIGHT)
+    if score < min_score:
         return
 
-    with open(filename, 'w') as f:
-        for i in range(SIZE):
-            for j in range(SIZE):
-                p = board_p[i, j]
-                r = board_r[i, j]
-                orientation = ((4 - r) % 4 + 3) % 4
-                f.write(f"{i},{j},{p + 1},{orientation}\n")
+    key = canonical_hash(board_p, board_r)
+    os.makedirs(directory, exist_ok=True)
+    filename = f"{directory}/partial_solution_{score}_{key[:12]}.csv"
+    mismatches = count_mismatches(board_p, board_r, puzzle.t_rot)
+    border = puzzle.max_score(BORDER_PENALTY_WEIGHT) - puzzle.max_score(0)
+    if not _solution_store.add(puzzle.name, key, score, mismatches, seed, chain, filename, border):
+        return
+
+    write_csv_board(filename, board_p, board_r)
+    if puzzle.N <= MAX_PIECES:
+        append_board(f"{directory}/{BOARDS_FILE}", board_p, board_r, score)
 
+    if puzzle.conf is None:
+        return
+    if _render_queue is not None and puzzle.N <= MAX_PIECES:
+        # Rendu par le processus du lanceur, sans attente
+        _render_queue.submit(score, encode_boards(board_p[None], board_r[None]).tobytes(),
+                             puzzle.name, key)
+        return
     cmd = [
         "python",
         "generate.py",
-        "-conf", "data/eternity2/eternity2_256_1.csv",
+        "-conf", puzzle.conf,
         "-hints", filename
     ]
 
@@ -167,14 +806,43 @@ def save_board_csv(board_p, board_r, score):
     if os.name != "nt":  # Linux headless / Docker
         env["SDL_VIDEODRIVER"] = "dummy"
 
-    # NE PAS REDIRIGER LES ERREURS pendant le debug
-    subprocess.run(cmd, check=True, env=env, cwd=os.getcwd())
+    # Chaîne lancée sans file de rendu : generate.py en arrière-plan (images
+    # hors index, non soumises à la rétention). Les rendus terminés sont
+    # attendus à l'appel suivant pour ne pas laisser de processus zombies
+    _render_children[:] = [p for p in _render_children if p.poll() is None]
+    _render_children.append(subprocess.Popen(cmd, env=env, cwd=os.getcwd()))
+
+def load_boards(filename, shape=(16, 16)):
+    # Plateaux d'un CSV (un plateau) ou d'un fichier .e2b (plusieurs) :
+    # liste de (nom, board_p, board_r)
+    if filename.endswith(".e2b"):
+        boards = BoardFile(filename)
+        if boards.shape != tuple(shape):
+            return []
+        boards_p, boards_r = boards.boards()
+        return [(f"{filename}[{k}]", boards_p[k], boards_r[k]) for k in range(len(boards_p))]
+    return [(filename, *read_csv_board(filename, shape))]
 
 
 # ==============================
 # Json log
 # ==============================
-def log(seed, current_score, step, start_time, global_best):
+def move_stats_dict(move_stats):
+    return {
+        name: {
+            "proposed": int(move_stats[m,MS_PROPOSED]),
+            "accepted": int(move_stats[m,MS_ACCEPTED]),
+            "improved": int(move_stats[m,MS_IMPROVED]),
+        }
+        for m, name in enumerate(MOVE_NAMES)
+    }
+
+# Écrivain du lanceur, hérité par les chaînes forkées ; sans lui (chaînes
+# lancées autrement), chaque entrée est ajoutée directement au fichier
+_run_log = None
+
+def log(seed, current_score, step, start_time, best_score, best_seed, move_stats=None,
+        extra=None):
 
     elapsed = time.time() - start_time
     steps_per_sec = step / elapsed if elapsed > 0 else 0
@@ -182,125 +850,1242 @@ def log(seed, current_score, step, start_time, global_best):
     entry = {
         "seed": seed,
         "current_score": current_score,
-        "best_score": global_best['score'],
-        "best_seed": global_best['seed'],
+        "best_score": best_score,
+        "best_seed": best_seed,
         "step": step,
         "steps_per_sec": steps_per_sec,
         "elapsed_time": elapsed
     }
+    if move_stats is not None:
+        entry["moves"] = move_stats_dict(move_stats)
+    if extra:
+        entry.update(extra)
 
-    # Crée le fichier si nécessaire et ajoute l'entrée
-    if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, "r+", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                data = []
-            data.append(entry)
-            f.seek(0)
-            json.dump(data, f, indent=2)
-            f.truncate()
+    if _run_log is not None:
+        _run_log.write(entry)
     else:
-        with open(LOG_FILE, "w", encoding="utf-8") as f:
-            json.dump([entry], f, indent=2)
+        append_entry(LOG_FILE, entry)
+
+# Télémétrie en mémoire partagée (solver/telemetry.py), créée par le lanceur
+# et héritée par les chaînes forkées ; publiée après chaque lot
+_telemetry = None
 
+def publish_telemetry(chain, seed, counters, current_score, best_score, T):
+    if _telemetry is not None:
+        _telemetry.publish(chain, seed, int(counters[CNT_STEP]), int(counters[CNT_ACCEPT]),
+                           int(counters[CNT_BOOST]), int(current_score), int(best_score), float(T))
+
+
+# ==============================
+# Initialisation / meilleur global
+# ==============================
+def init_board(puzzle, slots, class_start, cell_mask, border_rot):
+    board_p = np.zeros(puzzle.shape, dtype=np.int16)
+    board_r = np.zeros(puzzle.shape, dtype=np.int16)
+    for i, j, p, r in puzzle.fixed:
+        board_p[i,j] = p
+        board_r[i,j] = r
+    fixed_pieces = {p for _, _, p, _ in puzzle.fixed}
+
+    # Remplissage séquentiel, chaque pièce dans une case de sa classe
+    for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER):
+        available = [p for p in range(puzzle.N)
+                     if puzzle.piece_types[p]==c and p not in fixed_pieces]
+        for k, (i, j) in enumerate(slots[class_start[c]:class_start[c+1]]):
+            board_p[i,j] = available[k]
+            if c == TYPE_INNER:
+                board_r[i,j] = np.random.randint(0,ROT)
+            else:
+                board_r[i,j] = border_rot[available[k], cell_mask[i,j]]
+    return board_p, board_r
+
+def repair_board(board_p, board_r, puzzle, slots, class_start, cell_mask, border_rot):
+    # Remet les pièces fixes en place, replace chaque pièce dans une case de
+    # sa classe (les pièces bien placées ne bougent pas) et impose
+    # l'orientation du cadre
+    piece_types = puzzle.piece_types
+    for i, j, p, r in puzzle.fixed:
+        fi, fj = np.argwhere(board_p == p)[0]
+        board_p[fi,fj], board_p[i,j] = board_p[i,j], p
+        board_r[fi,fj], board_r[i,j] = board_r[i,j], r
+
+    wrong_cells = {c: [] for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER)}
+    misplaced = {c: [] for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER)}
+    for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER):
+        for i, j in slots[class_start[c]:class_start[c+1]]:
+            piece_class = piece_types[board_p[i,j]]
+            if piece_class != c:
+                wrong_cells[c].append((i, j))
+                misplaced[piece_class].append(board_p[i,j])
+    for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER):
+        for (i, j), p in zip(wrong_cells[c], misplaced[c]):
+            board_p[i,j] = p
+
+    for i, j in slots[:class_start[TYPE_INNER]]:
+        board_r[i,j] = border_rot[board_p[i,j], cell_mask[i,j]]
+
+def pick_warm_start(seed, patterns, puzzle, tables):
+    # Plateaux complets trouvés par les motifs, du meilleur au moins bon ;
+    # la chaîne `seed` prend le plateau seed % nombre
+    boards = []
+    for path in sorted({f for pattern in patterns for f in glob.glob(pattern)}):
+        for filename, board_p, board_r in load_boards(path, puzzle.shape):
+            if not np.array_equal(np.sort(board_p.ravel()), np.arange(puzzle.N)):
+                print(f"{C.BOLD}{C.YELLOW}| SEED {seed:<2} | SKIPPING INCOMPLETE BOARD {filename} |{C.RESET}")
+                continue
+            repair_board(board_p, board_r, puzzle, *tables)
+            boards.append((score_numba(board_p, board_r, puzzle.t_rot), filename, board_p, board_r))
+    if not boards:
+        return None
+    boards.sort(key=lambda b: -b[0])
+    score, filename, board_p, board_r = boards[seed % len(boards)]
+    print(f"{C.BOLD}{C.CYAN}| SEED {seed:<2} | WARM START FROM {filename} (SCORE {score}) |{C.RESET}")
+    return board_p, board_r
+
+def start_chain(seed, mode, puzzle, tables, warm_patterns, T_start, start=None, index=None):
+    # Reprise depuis le point de reprise de la chaîne s'il existe, sinon
+    # démarrage à chaud depuis `start` ou un CSV, sinon remplissage séquentiel.
+    # index : numéro du point de reprise s'il diffère de la graine
+    index = seed if index is None else index
+    ckpt = load_checkpoint(checkpoint_path(puzzle_dir(CHECKPOINT_DIR, puzzle), mode, index))
+    if ckpt is not None:
+        # Points de reprise écrits avant l'ajout de compteurs
+        ckpt["counters"] = np.concatenate(
+            (ckpt["counters"], np.zeros(N_COUNTERS - len(ckpt["counters"]), dtype=np.int64)))
+        print(f"{C.BOLD}{C.CYAN}| SEED {seed:<2} | RESUMED AT STEP {ckpt['counters'][CNT_STEP]} "
+              f"(BEST {ckpt['best_score']}) |{C.RESET}")
+        ckpt["origin"] = "checkpoint"
+        return ckpt
+
+    board = start
+    if board is None and warm_patterns:
+        board = pick_warm_start(seed, warm_patterns, puzzle, tables)
+    T = T_start
+    origin = "warm"
+    if board is None:
+        board = init_board(puzzle, *tables)
+        origin = "init"
+    else:
+        T = min(T_start, WARM_T0)
+    board_p, board_r = board
+    current_score = score_numba(board_p, board_r, puzzle.t_rot)
+    return {
+        "board_p": board_p,
+        "board_r": board_r,
+        "best_p": board_p.copy(),
+        "best_r": board_r.copy(),
+        "T": T,
+        "elapsed": 0.0,
+        "current_score": current_score,
+        "best_score": current_score,
+        "counters": np.zeros(N_COUNTERS, dtype=np.int64),
+        "move_stats": np.zeros((len(MOVE_NAMES),3), dtype=np.int64),
+        "origin": origin,
+    }
+
+_stop_requested = False
+
+def request_stop(signum, frame):
+    # SIGTERM (arrêt supervisord / docker) : la chaîne termine son lot,
+    # écrit son point de reprise et s'arrête
+    global _stop_requested
+    _stop_requested = True
+
+def update_global_best(seed, improv, n_improv, start_time, global_best, best_p, best_r,
+                       move_stats, extra=None):
+    # Le bloc partagé reçoit le meilleur plateau du lot ; chaque amélioration
+    # du lot qui bat l'ancien meilleur global est journalisée, hors verrou.
+    previous = global_best.score
+    elapsed = time.time() - start_time
+    if not global_best.try_update(int(improv[n_improv-1,1]), seed, elapsed, best_p, best_r):
+        return
+    for k in range(n_improv):
+        step, score = int(improv[k,0]), int(improv[k,1])
+        if score > previous:
+            # Cette amélioration était alors le meilleur global
+            log(seed, score, step, start_time, score, seed, move_stats, extra)
+
+def record_improvement(improv, n_improv, step, score):
+    k = min(n_improv, improv.shape[0]-1)
+    improv[k] = step, score
+    return k + 1
+
+def max_possible_score(puzzle):
+    return puzzle.max_score(BORDER_PENALTY_WEIGHT)
+
+def calibrate_chain(seed, board_p, board_r, t_rot, tables, move_cdf, affected, undo, acc):
+    # Température donnant l'acceptation acc des mouvements dégradants depuis
+    # le plateau courant (laissé inchangé)
+    deltas = sample_deltas_numba(board_p, board_r, t_rot, *tables, move_cdf, affected, undo,
+                                 SCHED_SAMPLES)
+    T = calibrate_temperature(deltas, acc, T_MIN)
+    print(f"{C.BOLD}{C.CYAN}| SEED {seed:<2} | T CALIBRATED TO {T:.4f} "
+          f"(ACCEPTANCE {acc:g}) |{C.RESET}")
+    return T, deltas
 
 # ==============================
 # Simulated Annealing
 # ==============================
-def simulated_annealing_csv(seed, t_rot, N, global_best, global_lock):
+def simulated_annealing_csv(seed, puzzle, global_best, warm_patterns=(), schedule=SCHEDULE,
+                            arena=None, slot=None, start=None):
+    # arena/slot : chaîne du portefeuille, qui publie sa progression dans
+    # l'emplacement `slot` et démarre de `start` (plateau) à défaut de reprise
+    signal.signal(signal.SIGTERM, request_stop)
     np.random.seed(seed)
-    board_p = np.zeros((SIZE,SIZE), dtype=np.int16)
-    board_r = np.zeros((SIZE,SIZE), dtype=np.int16)
-    board_p[FIX_I,FIX_J] = FIX_PIECE
-    board_r[FIX_I,FIX_J] = FIX_ROT
-
-    available = [p for p in range(N) if p!=FIX_PIECE]
-    idx = 0
-    for i in range(SIZE):
-        for j in range(SIZE):
-            if (i,j)!=(FIX_I,FIX_J):
-                board_p[i,j] = available[idx % len(available)]
-                board_r[i,j] = np.random.randint(0,ROT)
-                idx += 1
+    seed_numba(seed)
+    t_rot = puzzle.t_rot
+    slots, class_start, cell_mask, border_rot = build_move_tables(puzzle)
+    move_cdf = build_move_cdf(MOVE_PROBS, puzzle)
+    rot_mask, _, _, equiv_class = build_color_index(t_rot)
+    pairs = build_swap_pairs(class_start)
+    report_startup(seed, puzzle, (slots, class_start, cell_mask, border_rot, rot_mask, equiv_class))
+    mode, index = ("sa", seed) if arena is None else ("portfolio", slot)
+    state = start_chain(seed, mode, puzzle, (slots, class_start, cell_mask, border_rot),
+                        warm_patterns, T0, start, index)
+    board_p, board_r = state["board_p"], state["board_r"]
+    best_p, best_r = state["best_p"], state["best_r"]
+    current_score, best_score = state["current_score"], state["best_score"]
+    counters, move_stats = state["counters"], state["move_stats"]
+    T = state["T"]
+    affected = np.zeros((UNDO_CAP,2), dtype=np.int64)
+    undo = np.zeros((UNDO_CAP,4), dtype=np.int64)
+    improv = np.zeros((IMPROV_CAP,2), dtype=np.int64)
+    max_score = max_possible_score(puzzle)
+    start_time = time.time() - state["elapsed"]
+    ckpt_file = checkpoint_path(puzzle_dir(CHECKPOINT_DIR, puzzle), mode, index)
+    last_checkpoint = time.time()
+    global_best.try_update(best_score, seed, state["elapsed"], best_p, best_r)
+    if arena is not None:
+        arena.publish(slot, seed, counters[CNT_STEP], current_score, best_score, best_p, best_r)
 
-    current_score = score_numba(board_p, board_r, t_rot)
-    best_p, best_r = board_p.copy(), board_r.copy()
-    best_score = current_score
-    T = T0
-    steps_without_improv = 0
-    max_possible_score = (SIZE*(SIZE-1)*2)+(4*SIZE-4)*BORDER_PENALTY_WEIGHT
-    step = 0
-    start_time = time.time()
+    # Mode adaptatif : fenêtres de SCHED_WINDOW pas à température fixe,
+    # corrigée entre deux fenêtres ; pas de boost sur compteur
+    adaptive = None
+    batch_steps, alpha, stall_limit = BATCH_STEPS, ALPHA, MAX_STEPS_WITHOUT_IMPROV
+    if schedule == "adaptive":
+        batch_steps, alpha, stall_limit = SCHED_WINDOW, 1.0, np.iinfo(np.int64).max
+        adaptive = AdaptiveSchedule(SCHED_ACC_START, SCHED_ACC_END, SCHED_CYCLE_STEPS,
+                                    SCHED_STALL_FACTOR, T_MIN)
+        calib_tables = (slots, class_start, cell_mask, border_rot, rot_mask, equiv_class)
+        step = int(counters[CNT_STEP])
+        if state["origin"] == "checkpoint":
+            # Reprise à la température sauvegardée, la courbe cible étant
+            # placée à l'acceptation qu'elle donne
+            deltas = sample_deltas_numba(board_p, board_r, t_rot, *calib_tables, move_cdf,
+                                         affected, undo, SCHED_SAMPLES)
+            adaptive.resume(step, current_score, acceptance(deltas, T))
+        else:
+            acc = SCHED_ACC_START if state["origin"] == "init" else SCHED_ACC_REHEAT
+            T, _ = calibrate_chain(seed, board_p, board_r, t_rot, calib_tables, move_cdf,
+                                   affected, undo, acc)
+            adaptive.start_cycle(step, current_score, acc)
 
     while True:
-        new_p, new_r, affected = propose_move_numba(board_p, board_r)
-        optimize_local(new_p, new_r, t_rot, affected)
-        new_score = score_numba(new_p, new_r, t_rot)
-        dS = new_score - current_score
+        boosts = counters[CNT_BOOST]
+        uphill = counters[CNT_UPHILL], counters[CNT_UPHILL_ACCEPT]
+        T, current_score, best_score, n_improv = run_batch(
+            board_p, board_r, best_p, best_r, t_rot, slots, class_start,
+            cell_mask, border_rot, rot_mask, equiv_class, move_cdf, affected, undo, counters,
+            move_stats, improv, T, current_score, best_score,
+            batch_steps, max_score, alpha, stall_limit, POLISH)
 
-        if dS > 0 or np.random.rand() < np.exp(dS / T):
-            board_p, board_r = new_p, new_r
-            current_score = new_score
+        reheat = False
+        if adaptive is not None:
+            T, reheat = adaptive.update(T, int(counters[CNT_STEP]), current_score,
+                                        counters[CNT_UPHILL] - uphill[0],
+                                        counters[CNT_UPHILL_ACCEPT] - uphill[1])
 
+        if reheat or counters[CNT_STALL] > stall_limit:
+            # Polissage avant le boost : descente sur les échanges jusqu'à un
+            # optimum local, pour le plateau courant puis, s'il reste en
+            # dessous, pour le meilleur plateau
+            gain, n_moves = polish_numba(board_p, board_r, t_rot, slots, pairs, cell_mask,
+                                         border_rot, rot_mask, equiv_class, affected, undo,
+                                         POLISH_TOP_K)
+            current_score += gain
+            counters[CNT_POLISH] += n_moves
             if current_score > best_score:
-                best_p, best_r = board_p.copy(), board_r.copy()
+                best_p[:, :] = board_p
+                best_r[:, :] = board_r
                 best_score = current_score
-                steps_without_improv = 0
-                save_board_csv(best_p, best_r, current_score)
-
-                # Mise à jour du meilleur global
-                with global_lock:
-                    if current_score > global_best['score']:
-                        global_best['score'] = current_score
-                        global_best['seed'] = seed
-                        global_best['time'] = time.time() - start_time
-                        elapsed = global_best['time']
-                        steps_per_sec = step / elapsed
-                        console_log = (
-                            f"{C.BOLD}{C.GREEN}| SEED {seed:<2} | SCORE {current_score:<5} | "
-                            f"BEST SEED {seed:<2} | STEP {step:<7} | {steps_per_sec:>7.2f} steps/sec | "
-                            f"TIME {elapsed:>7.1f}s |{C.RESET}"
-                        )
-                        log(seed, current_score, step, start_time, global_best)
-                        # print(console_log)
+                n_improv = record_improvement(improv, n_improv, counters[CNT_STEP], best_score)
+            else:
+                gain, n_moves = polish_numba(best_p, best_r, t_rot, slots, pairs, cell_mask,
+                                             border_rot, rot_mask, equiv_class, affected, undo,
+                                             POLISH_TOP_K)
+                counters[CNT_POLISH] += n_moves
+                if gain > 0:
+                    best_score += gain
+                    n_improv = record_improvement(improv, n_improv, counters[CNT_STEP], best_score)
+            if adaptive is None:
+                T = boost_numba(counters)
+            else:
+                # Réchauffage calibré sur le plateau poli
+                counters[CNT_STALL] = 0
+                counters[CNT_BOOST] += 1
+                T, _ = calibrate_chain(seed, board_p, board_r, t_rot, calib_tables, move_cdf,
+                                       affected, undo, SCHED_ACC_REHEAT)
+                adaptive.start_cycle(int(counters[CNT_STEP]), current_score, SCHED_ACC_REHEAT)
 
-        else:
-            steps_without_improv += 1
+        # Contrôle périodique du score incrémental
+        full_score = score_numba(board_p, board_r, t_rot)
+        if full_score != current_score:
+            print(f"{C.BOLD}{C.RED}| SEED {seed:<2} | SCORE DRIFT {current_score} != {full_score} |{C.RESET}")
+            current_score = full_score
 
-        T = max(T*ALPHA, T_MIN)
-        step += 1
+        if n_improv > 0:
+            save_board_csv(best_p, best_r, best_score, puzzle, seed, index)
+            extra = {"polish_moves": int(counters[CNT_POLISH])}
+            if adaptive is not None:
+                extra.update({
+                    "temperature": float(T),
+                    "target_acceptance": adaptive.target(int(counters[CNT_STEP])),
+                    "reheats": int(counters[CNT_BOOST]),
+                })
+            update_global_best(seed, improv, n_improv, start_time, global_best, best_p, best_r,
+                               move_stats, extra)
+        if arena is not None:
+            published = (best_score, best_p, best_r) if n_improv > 0 else ()
+            arena.publish(slot, seed, counters[CNT_STEP], current_score, *published)
+        publish_telemetry(index, seed, counters, current_score, best_score, T)
 
-        if steps_without_improv > MAX_STEPS_WITHOUT_IMPROV:
-            rand_factor = np.random.rand() # uniforme entre 0 et 1
-            T = max(BOOST_MAX * rand_factor, BOOST_MIN)
-            steps_without_improv = 0
+        if counters[CNT_BOOST] != boosts:
             # print(f"{C.BOLD}{C.YELLOW}| SEED {seed:<2} | TEMPERATURE BOOSTED TO {T:.4f} |{C.RESET}")
-            save_board_csv(best_p, best_r, seed)
+            save_board_csv(best_p, best_r, best_score, puzzle, seed, index)
+
+        if _stop_requested or time.time() - last_checkpoint > CHECKPOINT_INTERVAL:
+            save_checkpoint(ckpt_file, board_p, board_r, best_p, best_r, T, current_score,
+                            best_score, counters, move_stats, time.time() - start_time)
+            last_checkpoint = time.time()
+            if _stop_requested:
+                break
+
+        if best_score == max_score:
+            print(f"{C.BOLD}{C.GREEN}| SEED {seed:<2} | SOLUTION FOUND! SCORE={best_score} |{C.RESET}")
+            save_board_csv(best_p, best_r, best_score, puzzle, seed, index)
+            break
+
+# ==============================
+# Portefeuille de chaînes
+# ==============================
+# Le lanceur garde NUM_CHAINS chaînes sa (un cœur chacune). Tous les
+# PORTFOLIO_INTERVAL secondes, il classe les chaînes par meilleur score et
+# par taux d'amélioration depuis le tour précédent, arrête les
+# PORTFOLIO_REPLACE dernières (assez âgées) et les remplace, sur le même
+# emplacement, par une copie du meneur perturbée juste assez pour rester à
+# PORTFOLIO_DIVERSITY des autres chaînes, ou par une graine neuve. Chaque
+# tour et chaque décision sont écrits dans PORTFOLIO_LOG avec le temps CPU
+# réellement consommé par les chaînes (arrêtées comprises), pour juger du
+# score obtenu par heure CPU.
+
+class PortfolioScheduler:
+    def __init__(self, ctx, puzzle, global_best, arena, warm_patterns, schedule):
+        self.ctx = ctx
+        self.puzzle = puzzle
+        self.global_best = global_best
+        self.arena = arena
+        self.warm_patterns = warm_patterns
+        self.schedule = schedule
+        self.children_cpu = children_cpu_seconds()
+        slots, class_start, cell_mask, border_rot = build_move_tables(puzzle)
+        rot_mask, _, _, equiv_class = build_color_index(puzzle.t_rot)
+        self.tables = (slots, class_start, cell_mask, border_rot, rot_mask, equiv_class)
+        self.can_swap = applicable_moves(puzzle)[MOVE_SWAP]
+        self.log = DecisionLog(PORTFOLIO_LOG)
+        self.processes = []
+        self.chains = {}
+        self.next_seed = NUM_CHAINS
+        self.round = 0
+        self.last_round = time.time()
+        np.random.seed(NUM_CHAINS)
+        seed_numba(NUM_CHAINS)
+
+    def start(self, slot, seed, board=None):
+        p = self.ctx.Process(target=simulated_annealing_csv,
+                             args=(seed, self.puzzle, self.global_best, self.warm_patterns),
+                             kwargs={"schedule": self.schedule, "arena": self.arena,
+                                     "slot": slot, "start": board})
+        p.start()
+        now = time.time()
+        self.chains[slot] = {"seed": seed, "started": now, "last_best": -1, "last_time": now}
+        if slot < len(self.processes):
+            self.processes[slot] = p
+        else:
+            self.processes.append(p)
+
+    def launch(self):
+        for slot in range(NUM_CHAINS):
+            self.start(slot, slot)
+
+    def perturb(self, board_p, board_r, kick):
+        slots, class_start, cell_mask, border_rot, rot_mask, equiv_class = self.tables
+        board_p, board_r = board_p.copy(), board_r.copy()
+        affected = np.zeros((UNDO_CAP,2), dtype=np.int64)
+        undo = np.zeros((UNDO_CAP,4), dtype=np.int64)
+        for _ in range(kick if self.can_swap else 0):
+            move_swap(board_p, board_r, self.puzzle.t_rot, slots, class_start, cell_mask,
+                      border_rot, rot_mask, equiv_class, affected, undo)
+        return board_p, board_r
+
+    def restart_board(self, leader, others):
+        # Copie du meneur, perturbée par 0, 1, 2, 4... échanges jusqu'à être
+        # à PORTFOLIO_DIVERSITY de toutes les autres chaînes ; None si le
+        # plancher n'est pas atteignable dans PORTFOLIO_KICK_MAX échanges
+        kick = 0
+        while kick <= PORTFOLIO_KICK_MAX:
+            board_p, board_r = self.perturb(leader["board_p"], leader["board_r"], kick)
+            distance = min((board_distance(board_p, o["board_p"]) for o in others), default=1.0)
+            if distance >= PORTFOLIO_DIVERSITY:
+                return board_p, board_r, kick, distance
+            kick = max(1, 2*kick)
+        return None
+
+    def cpu_hours(self):
+        # Temps CPU réel des chaînes : chaînes terminées et attendues (arrêtées
+        # par le planificateur ou sorties d'elles-mêmes) d'après os.times, plus
+        # chaînes en cours d'après /proc ; None si /proc est indisponible.
+        # exitcode attend au passage une chaîne sortie, qui passe alors dans
+        # os.times avant la lecture.
+        seconds = 0.0
+        for p in self.processes:
+            if p.exitcode is None:
+                cpu = process_cpu_seconds(p.pid)
+                if cpu is None:
+                    return None
+                seconds += cpu
+        return (seconds + children_cpu_seconds() - self.children_cpu) / 3600
+
+    def step(self):
+        # Un tour du planificateur si l'intervalle est écoulé
+        now = time.time()
+        if now - self.last_round < PORTFOLIO_INTERVAL:
+            return
+        self.last_round = now
+        self.round += 1
+        # Une chaîne dont l'emplacement reste illisible (arrêtée en pleine
+        # publication) n'est ni classée ni remplacée à ce tour
+        infos = {slot: self.arena.read(slot) for slot in self.chains}
+        infos = {slot: info for slot, info in infos.items() if info is not None}
+        if not infos:
+            return
+        ranking = {}
+        for slot in infos:
+            chain = self.chains[slot]
+            best = infos[slot]["best"]
+            last_best = chain["last_best"] if chain["last_best"] >= 0 else best
+            hours = max(now - chain["last_time"], 1e-9) / 3600
+            ranking[slot] = {"best": best, "rate": (best - last_best) / hours,
+                             "age": now - chain["started"]}
+            chain["last_best"], chain["last_time"] = best, now
+        order, rank, eligible = rank_chains(ranking, PORTFOLIO_MIN_AGE)
+        cpu_hours = self.cpu_hours()
+        self.log.write({
+            "event": "round", "round": self.round, "cpu_hours": cpu_hours,
+            "global_best": self.global_best.score,
+            "chains": [dict(slot=slot, seed=self.chains[slot]["seed"], rank=rank[slot],
+                            step=infos[slot]["step"], **ranking[slot]) for slot in order],
+        })
+
+        leader = order[0]
+        for slot in pick_laggards(order, eligible, PORTFOLIO_REPLACE):
+            if _stop_requested:
+                return
+            others = [infos[o] for o in infos if o != slot]
+            choice = None
+            if np.random.rand() >= PORTFOLIO_FRESH:
+                choice = self.restart_board(infos[leader], others)
+            if choice is None:
+                action, board, kick, distance = "fresh", None, 0, None
+            else:
+                board_p, board_r, kick, distance = choice
+                action, board = ("clone" if kick == 0 else "perturb"), (board_p, board_r)
+
+            # Arrêt (point de reprise écrit puis supprimé) et remplacement
+            old_seed = self.chains[slot]["seed"]
+            self.processes[slot].terminate()
+            self.processes[slot].join()
+            ckpt_file = checkpoint_path(puzzle_dir(CHECKPOINT_DIR, self.puzzle), "portfolio", slot)
+            if os.path.exists(ckpt_file):
+                os.remove(ckpt_file)
+            self.arena.reset(slot)
+            seed = self.next_seed
+            self.next_seed += 1
+            self.start(slot, seed, board)
+            self.log.write({
+                "event": "restart", "round": self.round, "slot": slot, "action": action,
+                "stopped_seed": old_seed, "stopped_best": ranking[slot]["best"],
+                "stopped_rate": ranking[slot]["rate"], "seed": seed,
+                "source_seed": None if board is None else self.chains[leader]["seed"],
+                "source_best": None if board is None else ranking[leader]["best"],
+                "kick": kick, "distance": distance, "cpu_hours": self.cpu_hours(),
+            })
+            print(f"{C.BOLD}{C.YELLOW}| PORTFOLIO | SLOT {slot} | SEED {old_seed} "
+                  f"(BEST {ranking[slot]['best']}) -> SEED {seed} ({action.upper()}) |{C.RESET}")
+        self.last_round = time.time()
+
+# ==============================
+# Parallel tempering
+# ==============================
+# Chaque réplique garde une température fixe de l'échelle ; tous les
+# PT_EXCHANGE_STEPS pas, les répliques publient leur plateau et leur score
+# dans un bloc de mémoire partagée, la réplique 0 tire les échanges entre
+# températures voisines, et chaque réplique concernée recopie l'état de sa
+# partenaire.
+
+def pt_ladder(n):
+    if n == 1:
+        return np.array([PT_T_MIN])
+    return PT_T_MIN * (PT_T_MAX / PT_T_MIN) ** (np.arange(n) / (n - 1))
+
+def pt_shared_size(n, shape):
+    return 8 * (2*n + 2*(n-1)) + 2 * 2*n*shape[0]*shape[1]
+
+def pt_shared_arrays(buf, n, shape):
+    # scores (n), partner (n), stats d'échange par paire (n-1, 2), plateaux (n, H, W)
+    H, W = shape
+    scores = np.ndarray((n,), dtype=np.int64, buffer=buf, offset=0)
+    partner = np.ndarray((n,), dtype=np.int64, buffer=buf, offset=8*n)
+    stats = np.ndarray((max(n-1, 0),2), dtype=np.int64, buffer=buf, offset=8*2*n)
+    offset = 8 * (2*n + 2*(n-1))
+    boards_p = np.ndarray((n,H,W), dtype=np.int16, buffer=buf, offset=offset)
+    boards_r = np.ndarray((n,H,W), dtype=np.int16, buffer=buf, offset=offset + 2*n*H*W)
+    return scores, partner, stats, boards_p, boards_r
+
+def pt_choose_exchanges(ladder, scores, partner, stats, parity):
+    # Paires (k, k+1) de même parité ; acceptation de Metropolis sur
+    # exp((1/T_k - 1/T_k+1) * (S_k+1 - S_k)), le score étant maximisé
+    n = len(ladder)
+    partner[:] = np.arange(n)
+    for k in range(parity, n-1, 2):
+        x = (1.0/ladder[k] - 1.0/ladder[k+1]) * (scores[k+1] - scores[k])
+        stats[k,0] += 1
+        if x >= 0 or np.random.rand() < np.exp(x):
+            partner[k], partner[k+1] = k+1, k
+            stats[k,1] += 1
+
+def parallel_tempering_csv(replica, puzzle, global_best, shm_name, barrier, warm_patterns=()):
+    signal.signal(signal.SIGTERM, request_stop)
+    np.random.seed(replica)
+    seed_numba(replica)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    scores, partner, stats, boards_p, boards_r = pt_shared_arrays(shm.buf, NUM_CHAINS, puzzle.shape)
+    ladder = pt_ladder(NUM_CHAINS)
+    T = ladder[replica]
+
+    t_rot = puzzle.t_rot
+    slots, class_start, cell_mask, border_rot = build_move_tables(puzzle)
+    move_cdf = build_move_cdf(MOVE_PROBS, puzzle)
+    rot_mask, _, _, equiv_class = build_color_index(t_rot)
+    report_startup(replica, puzzle, (slots, class_start, cell_mask, border_rot, rot_mask, equiv_class))
+    state = start_chain(replica, "pt", puzzle, (slots, class_start, cell_mask, border_rot),
+                        warm_patterns, T)
+    board_p, board_r = state["board_p"], state["board_r"]
+    best_p, best_r = state["best_p"], state["best_r"]
+    current_score, best_score = state["current_score"], state["best_score"]
+    counters, move_stats = state["counters"], state["move_stats"]
+    affected = np.zeros((UNDO_CAP,2), dtype=np.int64)
+    undo = np.zeros((UNDO_CAP,4), dtype=np.int64)
+    improv = np.zeros((IMPROV_CAP,2), dtype=np.int64)
+    max_score = max_possible_score(puzzle)
+    no_boost = np.iinfo(np.int64).max
+    start_time = time.time() - state["elapsed"]
+    ckpt_file = checkpoint_path(puzzle_dir(CHECKPOINT_DIR, puzzle), "pt", replica)
+    last_checkpoint = time.time()
+    global_best.try_update(best_score, replica, state["elapsed"], best_p, best_r)
+    exchange_round = 0
+
+    try:
+        while True:
+            _, current_score, best_score, n_improv = run_batch(
+                board_p, board_r, best_p, best_r, t_rot, slots, class_start,
+                cell_mask, border_rot, rot_mask, equiv_class, move_cdf, affected, undo, counters,
+                move_stats, improv, T, current_score, best_score,
+                PT_EXCHANGE_STEPS, max_score, 1.0, no_boost)
+            publish_telemetry(replica, replica, counters, current_score, best_score, T)
+
+            if n_improv > 0:
+                save_board_csv(best_p, best_r, best_score, puzzle, replica, replica)
+                extra = {
+                    "temperature": float(T),
+                    "exchange_rates": [float(a) / t if t else 0.0 for t, a in stats],
+                }
+                update_global_best(replica, improv, n_improv, start_time, global_best, best_p, best_r,
+                                   move_stats, extra)
+
+            if best_score == max_score:
+                print(f"{C.BOLD}{C.GREEN}| SEED {replica:<2} | SOLUTION FOUND! SCORE={best_score} |{C.RESET}")
+                save_board_csv(best_p, best_r, best_score, puzzle, replica, replica)
+                barrier.abort()
+                break
+
+            if _stop_requested:
+                barrier.abort()
+                break
+            if time.time() - last_checkpoint > CHECKPOINT_INTERVAL:
+                save_checkpoint(ckpt_file, board_p, board_r, best_p, best_r, T, current_score,
+                                best_score, counters, move_stats, time.time() - start_time)
+                last_checkpoint = time.time()
+
+            # Publication de l'état, tirage des échanges, recopie
+            boards_p[replica] = board_p
+            boards_r[replica] = board_r
+            scores[replica] = current_score
+            barrier.wait()
+            if replica == 0:
+                pt_choose_exchanges(ladder, scores, partner, stats, exchange_round % 2)
+            barrier.wait()
+            other = partner[replica]
+            if other != replica:
+                board_p[:] = boards_p[other]
+                board_r[:] = boards_r[other]
+                current_score = int(scores[other])
+            barrier.wait()
+            exchange_round += 1
+    except threading.BrokenBarrierError:
+        pass
+    finally:
+        save_checkpoint(ckpt_file, board_p, board_r, best_p, best_r, T, current_score,
+                        best_score, counters, move_stats, time.time() - start_time)
+        del scores, partner, stats, boards_p, boards_r
+        shm.close()
+
+# ==============================
+# Recherche tabou
+# ==============================
+# Chaque itération évalue TABU_CANDIDATES échanges et applique le meilleur
+# non tabou, même s'il dégrade le score. Les TABU_GUIDED premiers sont
+# guidés par les listes par côté de solver/index.py : une cellule mobile,
+# un de ses voisins, et une pièce de même classe capable de montrer la
+# couleur que ce voisin lui présente ; les autres sont tirés au hasard.
+# La mémoire est un anneau de TABU_TENURE couples (pièce, cellule) quittés
+# récemment : un échange qui ramène une pièce sur une de ces cellules est
+# tabou, sauf s'il donne un nouveau meilleur score (aspiration). tabu_count
+# compte les occurrences de chaque couple dans l'anneau pour un test en O(1).
+
+@njit(cache=True)
+def tabu_push(tabu_ring, tabu_count, tabu_pos, p, cell):
+    old_p = tabu_ring[tabu_pos,0]
+    if old_p >= 0:
+        tabu_count[old_p, tabu_ring[tabu_pos,1]] -= 1
+    tabu_ring[tabu_pos,0] = p
+    tabu_ring[tabu_pos,1] = cell
+    tabu_count[p, cell] += 1
+    return (tabu_pos + 1) % tabu_ring.shape[0]
+
+@njit(cache=True)
+def locate_pieces(board_p, piece_cell):
+    # piece_cell[p] : cellule i*W+j occupée par la pièce p
+    W = board_p.shape[1]
+    for i in range(board_p.shape[0]):
+        for j in range(W):
+            piece_cell[board_p[i,j]] = i*W + j
+
+@njit(cache=True)
+def guided_swap_cell(board_p, board_r, t_rot, cell_mask, side_start, side_items,
+                     piece_cell, i1, j1):
+    # Cellule i2*W+j2 d'une pièce capable de montrer, du côté d'un voisin
+    # tiré au hasard, la couleur que ce voisin présente à (i1, j1) ; -1 si
+    # elle est fixée, d'une autre classe ou déjà en (i1, j1)
+    H, W = board_p.shape
+    n_colors = (side_start.shape[0] - 1) // 4
+    d = np.random.randint(0, 4)
+    ni = i1 + DIRS[d,0]
+    nj = j1 + DIRS[d,1]
+    if not (0<=ni<H and 0<=nj<W):
+        return -1
+    c = t_rot[board_p[ni,nj]*ROT+board_r[ni,nj], OPP[d]]
+    key = d*n_colors + c+1
+    n = side_start[key+1] - side_start[key]
+    if n == 0:
+        return -1
+    cell = piece_cell[side_items[side_start[key] + np.random.randint(0, n)] // ROT]
+    i2 = cell // W
+    j2 = cell % W
+    # Même classe : même nombre de côtés tournés vers l'extérieur
+    m1 = cell_mask[i1,j1]
+    m2 = cell_mask[i2,j2]
+    if m2 & CELL_FIXED or cell == i1*W+j1:
+        return -1
+    if (m1&1) + (m1>>1&1) + (m1>>2&1) + (m1>>3&1) != (m2&1) + (m2>>1&1) + (m2>>2&1) + (m2>>3&1):
+        return -1
+    return cell
 
-        if best_score == max_possible_score:
+@njit(cache=True)
+def run_tabu_batch(board_p, board_r, best_p, best_r, t_rot, slots, class_start,
+                   cell_mask, border_rot, rot_mask, side_start, side_items, equiv_class,
+                   affected, undo, tabu_ring, tabu_count, tabu_pos, counters, move_stats,
+                   improv, current_score, best_score, n_iter, max_score, n_candidates,
+                   stall_limit):
+    # Exécute `n_iter` itérations tabou ; après stall_limit itérations sans
+    # nouveau meilleur, repart du meilleur plateau perturbé par TABU_KICK
+    # échanges aléatoires (compté comme un boost)
+    W = board_p.shape[1]
+    n_improv = 0
+    piece_cell = np.empty(t_rot.shape[0] // ROT, dtype=np.int64)
+    locate_pieces(board_p, piece_cell)
+    for _ in range(n_iter):
+        move_c1 = -1
+        move_c2 = -1
+        move_dS = 0
+        for n_c in range(n_candidates):
+            if n_c < TABU_GUIDED:
+                k1, _c = random_slot_class(class_start, 2)
+                i1, j1 = slots[k1,0], slots[k1,1]
+                cell = guided_swap_cell(board_p, board_r, t_rot, cell_mask, side_start,
+                                        side_items, piece_cell, i1, j1)
+                if cell < 0:
+                    continue
+                i2, j2 = cell // W, cell % W
+            else:
+                k1, k2 = random_swap_pair(class_start)
+                i1, j1 = slots[k1,0], slots[k1,1]
+                i2, j2 = slots[k2,0], slots[k2,1]
+            p1, p2 = board_p[i1,j1], board_p[i2,j2]
+            if equiv_class[p1] == equiv_class[p2]:
+                continue
+            dS = swap_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask,
+                            i1, j1, i2, j2, affected, undo)
+            undo_move_numba(board_p, board_r, undo, 2)
+            tabu = tabu_count[p2, i1*W+j1] > 0 or tabu_count[p1, i2*W+j2] > 0
+            if tabu and current_score + dS <= best_score:
+                continue
+            if move_c1 < 0 or dS > move_dS:
+                move_c1, move_c2, move_dS = i1*W+j1, i2*W+j2, dS
+        move_stats[MOVE_SWAP,MS_PROPOSED] += n_candidates
+        counters[CNT_STEP] += 1
+
+        if move_c1 >= 0:
+            i1, j1 = move_c1 // W, move_c1 % W
+            i2, j2 = move_c2 // W, move_c2 % W
+            tabu_pos = tabu_push(tabu_ring, tabu_count, tabu_pos, board_p[i1,j1], move_c1)
+            tabu_pos = tabu_push(tabu_ring, tabu_count, tabu_pos, board_p[i2,j2], move_c2)
+            swap_cells(board_p, board_r, t_rot, cell_mask, border_rot, rot_mask,
+                       i1, j1, i2, j2, affected, undo)
+            piece_cell[board_p[i1,j1]] = move_c1
+            piece_cell[board_p[i2,j2]] = move_c2
+            current_score += move_dS
+            counters[CNT_ACCEPT] += 1
+            move_stats[MOVE_SWAP,MS_ACCEPTED] += 1
+            if move_dS > 0:
+                move_stats[MOVE_SWAP,MS_IMPROVED] += 1
+
+        if current_score > best_score:
+            best_p[:, :] = board_p
+            best_r[:, :] = board_r
+            best_score = current_score
+            counters[CNT_STALL] = 0
+            k = min(n_improv, improv.shape[0]-1)
+            improv[k,0] = counters[CNT_STEP]
+            improv[k,1] = best_score
+            n_improv = k + 1
+        else:
+            counters[CNT_STALL] += 1
+
+        if counters[CNT_STALL] > stall_limit:
+            board_p[:, :] = best_p
+            board_r[:, :] = best_r
+            current_score = best_score
+            for _k in range(TABU_KICK):
+                _, dS = move_swap(board_p, board_r, t_rot, slots, class_start, cell_mask,
+                                  border_rot, rot_mask, equiv_class, affected, undo)
+                current_score += dS
+            locate_pieces(board_p, piece_cell)
+            counters[CNT_STALL] = 0
+            counters[CNT_BOOST] += 1
+
+        if best_score == max_score:
+            break
+    return current_score, best_score, n_improv, tabu_pos
+
+def tabu_search_csv(seed, puzzle, global_best, warm_patterns=()):
+    signal.signal(signal.SIGTERM, request_stop)
+    np.random.seed(seed)
+    seed_numba(seed)
+    t_rot = puzzle.t_rot
+    if not applicable_moves(puzzle)[MOVE_SWAP]:
+        raise ValueError(f"{puzzle.name}: no legal swap, tabu search cannot move")
+    slots, class_start, cell_mask, border_rot = build_move_tables(puzzle)
+    rot_mask, side_start, side_items, equiv_class = build_color_index(t_rot)
+    report_startup(seed, puzzle, (slots, class_start, cell_mask, border_rot, rot_mask, equiv_class))
+    state = start_chain(seed, "tabu", puzzle, (slots, class_start, cell_mask, border_rot),
+                        warm_patterns, 0.0)
+    board_p, board_r = state["board_p"], state["board_r"]
+    best_p, best_r = state["best_p"], state["best_r"]
+    current_score, best_score = state["current_score"], state["best_score"]
+    counters, move_stats = state["counters"], state["move_stats"]
+    affected = np.zeros((UNDO_CAP,2), dtype=np.int64)
+    undo = np.zeros((UNDO_CAP,4), dtype=np.int64)
+    improv = np.zeros((IMPROV_CAP,2), dtype=np.int64)
+    # La mémoire tabou n'est pas sauvegardée : elle repart vide à la reprise.
+    # Sur un petit plateau, TABU_TENURE couples rendraient presque tous les
+    # échanges tabous : la durée suit le nombre de cellules mobiles
+    tenure = max(1, min(TABU_TENURE, int(class_start[3]) // 2))
+    tabu_ring = np.full((tenure,2), -1, dtype=np.int64)
+    tabu_count = np.zeros((puzzle.N,puzzle.height*puzzle.width), dtype=np.int32)
+    tabu_pos = 0
+    max_score = max_possible_score(puzzle)
+    start_time = time.time() - state["elapsed"]
+    ckpt_file = checkpoint_path(puzzle_dir(CHECKPOINT_DIR, puzzle), "tabu", seed)
+    last_checkpoint = time.time()
+    global_best.try_update(best_score, seed, state["elapsed"], best_p, best_r)
+
+    while True:
+        current_score, best_score, n_improv, tabu_pos = run_tabu_batch(
+            board_p, board_r, best_p, best_r, t_rot, slots, class_start,
+            cell_mask, border_rot, rot_mask, side_start, side_items, equiv_class,
+            affected, undo, tabu_ring, tabu_count, tabu_pos, counters, move_stats,
+            improv, current_score, best_score, TABU_BATCH, max_score, TABU_CANDIDATES,
+            TABU_STALL)
+
+        full_score = score_numba(board_p, board_r, t_rot)
+        if full_score != current_score:
+            print(f"{C.BOLD}{C.RED}| SEED {seed:<2} | SCORE DRIFT {current_score} != {full_score} |{C.RESET}")
+            current_score = full_score
+        publish_telemetry(seed, seed, counters, current_score, best_score, 0.0)
+
+        if n_improv > 0:
+            save_board_csv(best_p, best_r, best_score, puzzle, seed, seed)
+            update_global_best(seed, improv, n_improv, start_time, global_best, best_p, best_r,
+                               move_stats, {"engine": "tabu", "kicks": int(counters[CNT_BOOST])})
+
+        if _stop_requested or time.time() - last_checkpoint > CHECKPOINT_INTERVAL:
+            save_checkpoint(ckpt_file, board_p, board_r, best_p, best_r, 0.0, current_score,
+                            best_score, counters, move_stats, time.time() - start_time)
+            last_checkpoint = time.time()
+            if _stop_requested:
+                break
+
+        if best_score == max_score:
             print(f"{C.BOLD}{C.GREEN}| SEED {seed:<2} | SOLUTION FOUND! SCORE={best_score} |{C.RESET}")
-            save_board_csv(best_p, best_r, seed)
+            save_board_csv(best_p, best_r, best_score, puzzle, seed, seed)
             break
 
+# ==============================
+# Algorithme mémétique
+# ==============================
+# La population vit dans un bloc de mémoire partagée (scores et plateaux
+# (MEMETIC_POP, H, W)) : les workers y lisent leurs parents et y
+# insèrent leurs enfants sous verrou, sans jamais sérialiser de plateau.
+# Chaque enfant hérite d'un rectangle du parent A, du reste du parent B là
+# où ses pièces ne sont pas déjà posées, les trous étant comblés par les
+# pièces manquantes de même classe ; un recuit court suivi du polissage sert
+# de recherche locale. L'enfant remplace le pire individu s'il le bat et
+# n'est pas déjà dans la population.
+
+def memetic_shared_size(n, shape):
+    return 8 * (2 + n) + 2 * 2*n*shape[0]*shape[1]
+
+def memetic_shared_arrays(buf, n, shape):
+    # compteurs [enfants, insertions], scores (n, -1 = libre, -2 = en cours), plateaux (n, H, W)
+    H, W = shape
+    header = np.ndarray((2,), dtype=np.int64, buffer=buf, offset=0)
+    scores = np.ndarray((n,), dtype=np.int64, buffer=buf, offset=16)
+    offset = 8 * (2 + n)
+    boards_p = np.ndarray((n,H,W), dtype=np.int16, buffer=buf, offset=offset)
+    boards_r = np.ndarray((n,H,W), dtype=np.int16, buffer=buf, offset=offset + 2*n*H*W)
+    return header, scores, boards_p, boards_r
+
+def memetic_random_board(puzzle, slots, class_start, cell_mask, border_rot):
+    # Plateau initial mélangé dans chaque classe
+    board_p, board_r = init_board(puzzle, slots, class_start, cell_mask, border_rot)
+    for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER):
+        cells = slots[class_start[c]:class_start[c+1]]
+        board_p[cells[:,0], cells[:,1]] = np.random.permutation(board_p[cells[:,0], cells[:,1]])
+    for i, j in slots[:class_start[TYPE_INNER]]:
+        board_r[i,j] = border_rot[board_p[i,j], cell_mask[i,j]]
+    return board_p, board_r
+
+@njit(cache=True)
+def crossover_numba(pa_p, pa_r, pb_p, pb_r, child_p, child_r, t_rot, piece_types, slots,
+                    class_start, cell_mask, border_rot, rot_mask, holes):
+    # Héritage d'un rectangle de A (cellules fixées comprises), puis de B
+    # sans doublon, puis réparation ; renvoie le nombre de cellules réparées
+    H, W = pa_p.shape
+    N = piece_types.shape[0]
+    used = np.zeros(N, dtype=np.bool_)
+    taken = np.zeros((H,W), dtype=np.bool_)
+    h = np.random.randint(max(H//4, 1), 3*H//4 + 1)
+    w = np.random.randint(max(W//4, 1), 3*W//4 + 1)
+    i0 = np.random.randint(0, H-h+1)
+    j0 = np.random.randint(0, W-w+1)
+    for i in range(H):
+        for j in range(W):
+            if (i0 <= i < i0+h and j0 <= j < j0+w) or cell_mask[i,j] & CELL_FIXED:
+                child_p[i,j] = pa_p[i,j]
+                child_r[i,j] = pa_r[i,j]
+                used[pa_p[i,j]] = True
+                taken[i,j] = True
+    for i in range(H):
+        for j in range(W):
+            if not taken[i,j] and not used[pb_p[i,j]]:
+                child_p[i,j] = pb_p[i,j]
+                child_r[i,j] = pb_r[i,j]
+                used[pb_p[i,j]] = True
+                taken[i,j] = True
+
+    n_holes = 0
+    for c in (TYPE_CORNER, TYPE_EDGE, TYPE_INNER):
+        missing = np.empty(class_start[c+1] - class_start[c], dtype=np.int64)
+        n_missing = 0
+        for p in range(N):
+            if piece_types[p] == c and not used[p]:
+                missing[n_missing] = p
+                n_missing += 1
+        np.random.shuffle(missing[:n_missing])
+        k = 0
+        for s in range(class_start[c], class_start[c+1]):
+            i, j = slots[s,0], slots[s,1]
+            if not taken[i,j]:
+                child_p[i,j] = missing[k]
+                child_r[i,j] = 0
+                holes[n_holes,0] = i
+                holes[n_holes,1] = j
+                n_holes += 1
+                k += 1
+    orient_cells(child_p, child_r, t_rot, cell_mask, border_rot, rot_mask, holes[:n_holes])
+    return n_holes
+
+def memetic_improve(board_p, board_r, puzzle, tables, move_cdf, work):
+    # Recherche locale : recuit court de MEMETIC_T_START à MEMETIC_T_END,
+    # puis descente sur les échanges ; le plateau reçoit le meilleur état
+    slots, class_start, cell_mask, border_rot, rot_mask, equiv_class, pairs = tables
+    best_p, best_r, affected, undo, counters, move_stats, improv = work
+    best_p[:] = board_p
+    best_r[:] = board_r
+    t_rot = puzzle.t_rot
+    score = score_numba(board_p, board_r, t_rot)
+    alpha = (MEMETIC_T_END / MEMETIC_T_START) ** (1.0 / MEMETIC_LS_STEPS)
+    _, _, best_score, _ = run_batch(
+        board_p, board_r, best_p, best_r, t_rot, slots, class_start,
+        cell_mask, border_rot, rot_mask, equiv_class, move_cdf, affected, undo, counters,
+        move_stats, improv, MEMETIC_T_START, score, score,
+        MEMETIC_LS_STEPS, max_possible_score(puzzle), alpha, np.iinfo(np.int64).max)
+    board_p[:] = best_p
+    board_r[:] = best_r
+    gain, n_moves = polish_numba(board_p, board_r, t_rot, slots, pairs, cell_mask, border_rot,
+                                 rot_mask, equiv_class, affected, undo, POLISH_TOP_K)
+    counters[CNT_POLISH] += n_moves
+    return best_score + gain
+
+def memetic_tournament(scores):
+    candidates = np.random.choice(np.flatnonzero(scores >= 0), MEMETIC_TOURNAMENT)
+    return candidates[np.argmax(scores[candidates])]
+
+def memetic_worker(worker, puzzle, global_best, shm_name, lock, warm_patterns=()):
+    signal.signal(signal.SIGTERM, request_stop)
+    np.random.seed(worker)
+    seed_numba(worker)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    header, scores, boards_p, boards_r = memetic_shared_arrays(shm.buf, MEMETIC_POP, puzzle.shape)
+
+    t_rot, N, piece_types = puzzle.t_rot, puzzle.N, puzzle.piece_types
+    slots, class_start, cell_mask, border_rot = build_move_tables(puzzle)
+    rot_mask, _, _, equiv_class = build_color_index(t_rot)
+    tables = (slots, class_start, cell_mask, border_rot, rot_mask, equiv_class,
+              build_swap_pairs(class_start))
+    report_startup(worker, puzzle, tables)
+    move_cdf = build_move_cdf(MOVE_PROBS, puzzle)
+    warm = [board for path in sorted({f for pattern in warm_patterns for f in glob.glob(pattern)})
+            for board in load_boards(path, puzzle.shape)]
+    counters = np.zeros(N_COUNTERS, dtype=np.int64)
+    move_stats = np.zeros((len(MOVE_NAMES),3), dtype=np.int64)
+    work = (np.zeros(puzzle.shape, dtype=np.int16), np.zeros(puzzle.shape, dtype=np.int16),
+            np.zeros((UNDO_CAP,2), dtype=np.int64), np.zeros((UNDO_CAP,4), dtype=np.int64),
+            counters, move_stats, np.zeros((IMPROV_CAP,2), dtype=np.int64))
+    holes = np.zeros((N,2), dtype=np.int64)
+    child_p = np.zeros(puzzle.shape, dtype=np.int16)
+    child_r = np.zeros(puzzle.shape, dtype=np.int16)
+    improv = np.zeros((1,2), dtype=np.int64)
+    start_time = time.time()
+    slot = -1
+    worker_best = -1
+
+    try:
+        while not _stop_requested:
+            # Remplissage des places libres, puis génération d'enfants
+            with lock:
+                free = np.flatnonzero(scores == -1)
+                slot = int(free[0]) if len(free) else -1
+                if slot >= 0:
+                    scores[slot] = -2
+                elif np.count_nonzero(scores >= 0) >= 2:
+                    a, b = memetic_tournament(scores), memetic_tournament(scores)
+                    pa_p, pa_r = boards_p[a].copy(), boards_r[a].copy()
+                    pb_p, pb_r = boards_p[b].copy(), boards_r[b].copy()
+                else:
+                    a = -1
+
+            if slot >= 0:
+                board = None
+                if slot < len(warm):
+                    board = warm[slot][1:]
+                    if np.array_equal(np.sort(board[0].ravel()), np.arange(N)):
+                        repair_board(*board, puzzle, slots, class_start, cell_mask, border_rot)
+                    else:
+                        board = None
+                if board is None:
+                    board = memetic_random_board(puzzle, slots, class_start, cell_mask, border_rot)
+                child_p[:], child_r[:] = board
+            elif a < 0:
+                time.sleep(0.1)
+                continue
+            else:
+                crossover_numba(pa_p, pa_r, pb_p, pb_r, child_p, child_r, t_rot, piece_types,
+                                slots, class_start, cell_mask, border_rot, rot_mask, holes)
+
+            score = memetic_improve(child_p, child_r, puzzle, tables, move_cdf, work)
+            worker_best = max(worker_best, score)
+            publish_telemetry(worker, worker, counters, score, worker_best, MEMETIC_T_END)
+
+            with lock:
+                header[0] += 1
+                if slot < 0:
+                    duplicate = any(scores[k] == score and np.array_equal(boards_p[k], child_p)
+                                    and np.array_equal(boards_r[k], child_r)
+                                    for k in range(MEMETIC_POP))
+                    worst = int(np.argmin(scores))
+                    slot = worst if not duplicate and score > scores[worst] else -1
+                if slot >= 0:
+                    boards_p[slot] = child_p
+                    boards_r[slot] = child_r
+                    scores[slot] = score
+                    header[1] += 1
+                children = int(header[0])
+
+            if slot >= 0 and score > global_best.score:
+                improv[0] = children, score
+                save_board_csv(child_p, child_r, score, puzzle, worker, worker)
+                update_global_best(worker, improv, 1, start_time, global_best, child_p, child_r,
+                                   move_stats, {"engine": "memetic", "children": children,
+                                                "population": [int(x) for x in np.sort(scores)[::-1]]})
+
+            if score == max_possible_score(puzzle):
+                print(f"{C.BOLD}{C.GREEN}| SEED {worker:<2} | SOLUTION FOUND! SCORE={score} |{C.RESET}")
+                break
+    finally:
+        with lock:
+            # Une place réservée et non remplie redevient libre
+            if slot >= 0 and scores[slot] == -2:
+                scores[slot] = -1
+        del header, scores, boards_p, boards_r
+        shm.close()
+
+# ==============================
+# Précompilation des noyaux
+# ==============================
+# Les noyaux sont compilés avec cache=True : le code machine est écrit sur
+# disque (NUMBA_CACHE_DIR, sinon __pycache__) et rechargé aux lancements
+# suivants tant que le fichier source ne change pas. Le lanceur appelle une
+# fois chaque noyau séquentiel avant de forker les chaînes, qui héritent alors
+# des pages de code compilé au lieu d'avoir chacune leur état LLVM.
+# Les noyaux parallèles (polissage) sont exclus dans ce cas : lancer le pool
+# de threads de numba avant fork bloque le parent à la sortie avec TBB ;
+# les chaînes les rechargent du cache à leur premier polissage.
+# Le cache de numba ne suit que le fichier du noyau : après une modification
+# de solver/index.py, supprimer le cache.
+
+def warm_up_kernels(puzzle, tables=None, parallel=False):
+    # Appelle chaque noyau des moteurs sur un plateau jetable ; l'état des
+    # générateurs (numba et numpy) est conservé
+    if tables is None:
+        slots, class_start, cell_mask, border_rot = build_move_tables(puzzle)
+        rot_mask, _, _, equiv_class = build_color_index(puzzle.t_rot)
+    else:
+        slots, class_start, cell_mask, border_rot, rot_mask, equiv_class = tables[:6]
+    rng_state = get_numba_rng_state(), np.random.get_state()
+    t_rot = puzzle.t_rot
+    board_p, board_r = init_board(puzzle, slots, class_start, cell_mask, border_rot)
+    best_p, best_r = board_p.copy(), board_r.copy()
+    affected = np.zeros((UNDO_CAP,2), dtype=np.int64)
+    undo = np.zeros((UNDO_CAP,4), dtype=np.int64)
+    improv = np.zeros((IMPROV_CAP,2), dtype=np.int64)
+    counters = np.zeros(N_COUNTERS, dtype=np.int64)
+    move_stats = np.zeros((len(MOVE_NAMES),3), dtype=np.int64)
+    move_cdf = build_move_cdf(MOVE_PROBS, puzzle)
+    score = score_numba(board_p, board_r, t_rot)
+    max_score = max_possible_score(puzzle)
+    # Mêmes types d'arguments que les appels des moteurs (stop_on_stall
+    # donné ou omis : deux compilations distinctes)
+    run_batch(board_p, board_r, best_p, best_r, t_rot, slots, class_start, cell_mask,
+              border_rot, rot_mask, equiv_class, move_cdf, affected, undo, counters,
+              move_stats, improv, T0, score, score, 1, max_score, ALPHA,
+              MAX_STEPS_WITHOUT_IMPROV, POLISH)
+    run_batch(board_p, board_r, best_p, best_r, t_rot, slots, class_start, cell_mask,
+              border_rot, rot_mask, equiv_class, move_cdf, affected, undo, counters,
+              move_stats, improv, T0, score, score, 1, max_score, 1.0,
+              np.iinfo(np.int64).max)
+    boost_numba(counters)
+    sample_deltas_numba(board_p, board_r, t_rot, slots, class_start, cell_mask, border_rot,
+                        rot_mask, equiv_class, move_cdf, affected, undo, 1)
+    tabu_ring = np.full((1,2), -1, dtype=np.int64)
+    tabu_count = np.zeros((puzzle.N,puzzle.height*puzzle.width), dtype=np.int32)
+    # Aucun candidat tiré si l'instance n'admet pas d'échange
+    n_candidates = int(applicable_moves(puzzle)[MOVE_SWAP])
+    side_start, side_items = build_side_lists(t_rot)
+    run_tabu_batch(board_p, board_r, best_p, best_r, t_rot, slots, class_start,
+                   cell_mask, border_rot, rot_mask, side_start, side_items, equiv_class,
+                   affected, undo, tabu_ring, tabu_count, 0, counters, move_stats,
+                   improv, score, score, 1, max_score, n_candidates, TABU_STALL)
+    holes = np.zeros((puzzle.N,2), dtype=np.int64)
+    crossover_numba(board_p, board_r, best_p, best_r, board_p.copy(), board_r.copy(), t_rot,
+                    puzzle.piece_types, slots, class_start, cell_mask, border_rot, rot_mask,
+                    holes)
+    if parallel:
+        polish_numba(board_p, board_r, t_rot, slots, build_swap_pairs(class_start), cell_mask,
+                     border_rot, rot_mask, equiv_class, affected, undo, POLISH_TOP_K)
+    set_numba_rng_state(rng_state[0])
+    np.random.set_state(rng_state[1])
+
+def report_startup(seed, puzzle, tables):
+    # Temps depuis le lancement jusqu'à des noyaux prêts (compilation
+    # comprise si le lanceur ne l'a pas faite) et mémoire de la chaîne
+    warm_up_kernels(puzzle, tables)
+    print(f"{C.BOLD}{C.CYAN}| SEED {seed:<2} | READY IN {time.time() - LAUNCH_TIME:.2f}s | "
+          f"{format_memory(process_memory())} |{C.RESET}")
+
 # ==============================
 # Main parallèle
 # ==============================
 if __name__ == "__main__":
-    tiles = load_tiles()
-    t_rot, N, S = precompute_rotations(tiles)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-mode", choices=["sa", "pt", "tabu", "memetic", "portfolio"],
+                        default=MODE)
+    parser.add_argument("-schedule", choices=["fixed", "adaptive"], default=SCHEDULE,
+                        help="refroidissement du mode sa")
+    parser.add_argument("-warm", nargs="*", default=WARM_START,
+                        help="CSV (motifs glob) servant de point de départ aux chaînes sans point de reprise")
+    parser.add_argument("-conf", default=PUZZLE_CONF)
+    parser.add_argument("-hints", default=None,
+                        help="cellules fixées (i,j,id,orientation) ; par défaut celles d'Eternity II")
+    parser.add_argument("-synthetic", default=None, metavar="HxW",
+                        help="instance aléatoire soluble de taille HxW (tests de non-régression)")
+    parser.add_argument("-compile-only", action="store_true",
+                        help="compile tous les noyaux dans le cache disque puis s'arrête (image Docker)")
+    parser.add_argument("-no-prefork", action="store_true",
+                        help="chaque chaîne compile ou charge ses noyaux elle-même (mesure de référence)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        height, width = (int(x) for x in args.synthetic.lower().split("x"))
+        puzzle = Puzzle.synthetic(height, width)
+    elif args.conf == PUZZLE_CONF and args.hints is None:
+        puzzle = load_puzzle()
+    else:
+        puzzle = load_puzzle(args.conf, args.hints)
+    print(f"{C.BOLD}{C.CYAN}| PUZZLE {puzzle.name} {puzzle.height}x{puzzle.width} | "
+          f"MAX SCORE {max_possible_score(puzzle)} |{C.RESET}")
+
+    if args.compile_only:
+        warm_up_kernels(puzzle, parallel=True)
+        print(f"{C.BOLD}{C.CYAN}| KERNELS COMPILED IN {time.time() - LAUNCH_TIME:.2f}s |{C.RESET}")
+        raise SystemExit
 
-    manager = multiprocessing.Manager()
-    global_best = manager.dict({'score': -1, 'seed': -1, 'time': 0})
-    global_lock = multiprocessing.Lock()
+    # Les chaînes sont forkées après la compilation pour partager le code
+    # compilé ; sans fork (Windows), chacune le charge depuis le cache
+    if "fork" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("fork")
+    else:
+        ctx = multiprocessing.get_context()
+    if not args.no_prefork and ctx.get_start_method() == "fork":
+        warm_up_kernels(puzzle)
+        print(f"{C.BOLD}{C.CYAN}| KERNELS READY IN {time.time() - LAUNCH_TIME:.2f}s | "
+              f"{format_memory(process_memory())} |{C.RESET}")
+
+    global_best = GlobalBest(ctx.Lock(), puzzle.shape)
+    # Points de bord inclus dans les scores publiés
+    border = puzzle.max_score(BORDER_PENALTY_WEIGHT) - puzzle.max_score(0)
+    _telemetry = Telemetry(NUM_CHAINS, telemetry_name(puzzle.name), border)
+    _run_log = RunLog(LOG_FILE, LOG_MAX_BYTES, LOG_BACKUPS, ctx=ctx)
+    _run_log.start()
+    if puzzle.conf is not None:
+        _render_queue = RenderQueue(puzzle.conf, IMG_DIR, RENDER_BUCKET, ctx=ctx,
+                                    store=_solution_store, keep=RENDER_KEEP)
+        _render_queue.start()
+    start_time = time.time()
 
+    shm = None
     processes = []
-    for seed in range(NUM_CHAINS):
-        p = multiprocessing.Process(target=simulated_annealing_csv,
-                                    args=(seed, t_rot, N, global_best, global_lock))
-        p.start()
-        processes.append(p)
+    scheduler = None
+    if args.mode == "portfolio":
+        arena = PortfolioArena(NUM_CHAINS, puzzle.shape)
+        scheduler = PortfolioScheduler(ctx, puzzle, global_best, arena, args.warm, args.schedule)
+        scheduler.launch()
+        processes = scheduler.processes
+    elif args.mode == "pt":
+        shm = shared_memory.SharedMemory(create=True, size=pt_shared_size(NUM_CHAINS, puzzle.shape))
+        pt_shared_arrays(shm.buf, NUM_CHAINS, puzzle.shape)[2][:] = 0
+        barrier = ctx.Barrier(NUM_CHAINS)
+        for replica in range(NUM_CHAINS):
+            p = ctx.Process(target=parallel_tempering_csv,
+                            args=(replica, puzzle, global_best, shm.name, barrier,
+                                  args.warm))
+            p.start()
+            processes.append(p)
+    elif args.mode == "memetic":
+        # La population est reprise depuis checkpoints/ si elle existe
+        population_file = os.path.join(puzzle_dir(CHECKPOINT_DIR, puzzle), "memetic_population.e2b")
+        shm = shared_memory.SharedMemory(create=True, size=memetic_shared_size(MEMETIC_POP, puzzle.shape))
+        header, scores, boards_p, boards_r = memetic_shared_arrays(shm.buf, MEMETIC_POP, puzzle.shape)
+        header[:] = 0
+        scores[:] = -1
+        population = load_population(population_file)
+        if population is not None:
+            n = min(MEMETIC_POP, len(population[0]))
+            scores[:n], boards_p[:n], boards_r[:n] = (x[:n] for x in population)
+        lock = ctx.Lock()
+        for worker in range(NUM_CHAINS):
+            p = ctx.Process(target=memetic_worker,
+                            args=(worker, puzzle, global_best, shm.name, lock,
+                                  args.warm))
+            p.start()
+            processes.append(p)
+    else:
+        engine = tabu_search_csv if args.mode == "tabu" else simulated_annealing_csv
+        kwargs = {} if args.mode == "tabu" else {"schedule": args.schedule}
+        for seed in range(NUM_CHAINS):
+            p = ctx.Process(target=engine,
+                            args=(seed, puzzle, global_best, args.warm), kwargs=kwargs)
+            p.start()
+            processes.append(p)
+
+    # SIGTERM est relayé aux chaînes pour qu'elles écrivent leur point de reprise
+    def stop_chains(signum, frame):
+        request_stop(signum, frame)
+        for p in processes:
+            p.terminate()
+    signal.signal(signal.SIGTERM, stop_chains)
+    # Dès qu'une chaîne a résolu le puzzle, les autres sont arrêtées
+    max_score = max_possible_score(puzzle)
+    while any(p.is_alive() for p in processes):
+        multiprocessing.connection.wait([p.sentinel for p in processes], timeout=1.0)
+        if scheduler is not None and not _stop_requested and global_best.score < max_score:
+            scheduler.step()
+        if global_best.score == max_score:
+            for p in processes:
+                p.terminate()
+            for p in processes:
+                p.join()
+            print(f"{C.BOLD}{C.GREEN}| SOLVED {puzzle.name} IN {time.time() - start_time:.1f}s |{C.RESET}")
     for p in processes:
         p.join()
+    if args.mode == "memetic":
+        filled = scores >= 0
+        save_population(population_file, scores[filled], boards_p[filled], boards_r[filled])
+        del header, scores, boards_p, boards_r
+    if shm is not None:
+        shm.close()
+        shm.unlink()
+    if scheduler is not None:
+        arena.close(unlink=True)
+    _run_log.close()
+    if _render_queue is not None:
+        _render_queue.close()
+    _telemetry.close(unlink=True)
 
-    print(f"{C.BOLD}{C.MAGENTA}| FINAL BEST SCORE {global_best['score']} by SEED {global_best['seed']} |{C.RESET}")
\ No newline at end of file
+    print(f"{C.BOLD}{C.MAGENTA}| FINAL BEST SCORE {global_best.score} by SEED {global_best.seed} |{C.RESET}")
+    final_score = global_best.score
+    global_best.close(unlink=True)
+    # Aucune chaîne n'a produit de score : elles ont toutes échoué
+    if final_score < 0:
+        print(f"{C.BOLD}{C.RED}| NO CHAIN PRODUCED A SCORE |{C.RESET}")
+        raise SystemExit(1)
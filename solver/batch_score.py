@@ -0,0 +1,73 @@
+import sys
+import numpy as np
+
+# ==============================
+# Score vectorisé de lots de plateaux
+# ==============================
+# Les plateaux (B, H, W) de pièces / rotations sont convertis en plans de
+# couleurs (B, H, W, 4) (côtés N, E, S, O, via t_rot) ; les correspondances
+# se réduisent alors à des comparaisons de tableaux entiers.
+# Avec border_weight=BORDER_PENALTY_WEIGHT le résultat est celui de
+# s_a.score_numba ; avec border_weight=0 celui de core.board.Board.evaluate.
+
+ROT = 4
+
+
+def color_planes(boards_p, boards_r, t_rot):
+    return t_rot[boards_p.astype(np.int64) * ROT + boards_r]
+
+
+def score_boards(boards_p, boards_r, t_rot, border_weight=1, mismatch=False):
+    # mismatch=True renvoie aussi, par cellule, le nombre de côtés en défaut :
+    # côtés intérieurs ne correspondant pas au voisin et côtés extérieurs non gris
+    boards_p = np.asarray(boards_p)
+    boards_r = np.asarray(boards_r)
+    single = boards_p.ndim == 2
+    if single:
+        boards_p = boards_p[None]
+        boards_r = boards_r[None]
+
+    planes = color_planes(boards_p, boards_r, t_rot)
+    north, east, south, west = planes[..., 0], planes[..., 1], planes[..., 2], planes[..., 3]
+    horiz = east[:, :, :-1] == west[:, :, 1:]
+    vert = south[:, :-1, :] == north[:, 1:, :]
+    scores = horiz.sum(axis=(1, 2), dtype=np.int64) + vert.sum(axis=(1, 2), dtype=np.int64)
+
+    top = north[:, 0, :] == -1
+    bottom = south[:, -1, :] == -1
+    left = west[:, :, 0] == -1
+    right = east[:, :, -1] == -1
+    if border_weight:
+        scores += border_weight * (top.sum(axis=1) + bottom.sum(axis=1)
+                                   + left.sum(axis=1) + right.sum(axis=1))
+
+    if not mismatch:
+        return scores[0] if single else scores
+
+    cells = np.zeros(boards_p.shape, dtype=np.int8)
+    cells[:, :, :-1] += ~horiz
+    cells[:, :, 1:] += ~horiz
+    cells[:, :-1, :] += ~vert
+    cells[:, 1:, :] += ~vert
+    cells[:, 0, :] += ~top
+    cells[:, -1, :] += ~bottom
+    cells[:, :, 0] += ~left
+    cells[:, :, -1] += ~right
+    if single:
+        return scores[0], cells[0]
+    return scores, cells
+
+
+# Validation d'archives : python -m solver.batch_score solutions/*.csv
+# solutions/boards.e2b (plateau, score, nombre de cellules en défaut)
+if __name__ == "__main__":
+    import s_a
+
+    t_rot, N, S = s_a.precompute_rotations(s_a.load_tiles())
+    boards = [b for f in sys.argv[1:] for b in s_a.load_boards(f)]
+    if boards:
+        scores, cells = score_boards(np.stack([b[1] for b in boards]),
+                                     np.stack([b[2] for b in boards]),
+                                     t_rot, s_a.BORDER_PENALTY_WEIGHT, mismatch=True)
+        for b, score, c in zip(boards, scores, cells):
+            print(f"{b[0]},{score},{np.count_nonzero(c)}")
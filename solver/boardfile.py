@@ -0,0 +1,238 @@
+import argparse
+import glob
+import os
+import numpy as np
+
+# ==============================
+# Format binaire des plateaux (.e2b)
+# ==============================
+# En-tête de 16 octets : magic "E2BD", version, hauteur, largeur, options,
+# taille d'un enregistrement (uint32), 4 octets réservés. Suivent des
+# enregistrements de taille fixe, sans séparateur :
+# - score int32 (option SCORES) ;
+# - pièces : un octet par cellule (indice de pièce à partir de 0) ;
+# - rotations : deux bits par cellule (cellule c : octet c // 4, bits
+#   2 * (c % 4)), dans la convention du solveur (board_r) ;
+# - cellules occupées : un bit par cellule (option MASK, indices partiels).
+# Le nombre de plateaux se déduit de la taille du fichier : un
+# enregistrement s'ajoute en fin de fichier sans réécrire l'en-tête, et un
+# fichier se projette en mémoire (np.memmap) sans analyse.
+# Les CSV (solutions et indices) ont une ligne i,j,id,orientation avec id à
+# partir de 1 et orientation = (3 - rotation) % 4.
+
+MAGIC = b"E2BD"
+VERSION = 1
+HEADER_BYTES = 16
+MAX_PIECES = 256  # un octet par pièce
+SCORES = 1
+MASK = 2
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "u1"), ("height", "u1"), ("width", "u1"),
+                         ("flags", "u1"), ("record_bytes", "<u4"), ("reserved", "<u4")])
+
+
+def record_dtype(shape, flags=0):
+    H, W = shape
+    n = H * W
+    fields = []
+    if flags & SCORES:
+        fields.append(("score", "<i4"))
+    fields.append(("pieces", "u1", (H, W)))
+    fields.append(("rotations", "u1", ((n + 3) // 4,)))
+    if flags & MASK:
+        fields.append(("mask", "u1", ((n + 7) // 8,)))
+    return np.dtype(fields)
+
+
+def pack_rotations(board_r):
+    r = np.asarray(board_r, dtype=np.uint8).reshape(len(board_r), -1) & 3
+    pad = -r.shape[1] % 4
+    r = np.pad(r, ((0, 0), (0, pad))).reshape(len(r), -1, 4)
+    return r[..., 0] | r[..., 1] << 2 | r[..., 2] << 4 | r[..., 3] << 6
+
+
+def unpack_rotations(packed, shape):
+    packed = np.asarray(packed, dtype=np.uint8)
+    r = np.stack([packed >> s & 3 for s in (0, 2, 4, 6)], axis=-1)
+    n = shape[0] * shape[1]
+    return r.reshape(len(packed), -1)[:, :n].reshape(len(packed), *shape)
+
+
+def encode_boards(boards_p, boards_r, scores=None):
+    # (n, H, W) -> enregistrements ; pièce < 0 = cellule vide (option MASK)
+    boards_p = np.asarray(boards_p)
+    n, H, W = boards_p.shape
+    if H > 255 or W > 255 or boards_p.max(initial=-1) >= MAX_PIECES:
+        raise ValueError("plateau trop grand pour le format e2b")
+    empty = boards_p < 0
+    flags = (SCORES if scores is not None else 0) | (MASK if empty.any() else 0)
+    records = np.zeros(n, dtype=record_dtype((H, W), flags))
+    if scores is not None:
+        records["score"] = scores
+    records["pieces"] = np.where(empty, 0, boards_p)
+    records["rotations"] = pack_rotations(np.where(empty, 0, boards_r))
+    if flags & MASK:
+        records["mask"] = np.packbits(~empty.reshape(n, -1), axis=1, bitorder="little")
+    return records
+
+
+def make_header(shape, flags):
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (MAGIC, VERSION, shape[0], shape[1], flags,
+                 record_dtype(shape, flags).itemsize, 0)
+    return header.tobytes()
+
+
+def write_boards(path, boards_p, boards_r, scores=None):
+    # Écrit un fichier complet (remplacement atomique)
+    records = encode_boards(boards_p, boards_r, scores)
+    flags = (SCORES if "score" in records.dtype.names else 0) | \
+            (MASK if "mask" in records.dtype.names else 0)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(make_header(np.shape(boards_p)[1:], flags))
+        f.write(records.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def append_board(path, board_p, board_r, score):
+    # Ajoute un plateau complet avec son score (fichier créé au besoin) ;
+    # une seule écriture en mode ajout par plateau
+    record = encode_boards(board_p[None], board_r[None], [score])
+    if record.dtype.names != ("score", "pieces", "rotations"):
+        raise ValueError("append_board attend un plateau complet")
+    with open(path, "ab") as f:
+        if f.tell() == 0:
+            f.write(make_header(np.shape(board_p), SCORES))
+        f.write(record.tobytes())
+
+
+class BoardFile:
+    # Plateaux d'un fichier .e2b projetés en mémoire (lecture seule)
+    def __init__(self, path):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header["magic"][0] != MAGIC or header["version"][0] != VERSION:
+            raise ValueError(f"{path} : pas un fichier e2b")
+        self.shape = (int(header["height"][0]), int(header["width"][0]))
+        self.flags = int(header["flags"][0])
+        self.dtype = record_dtype(self.shape, self.flags)
+        if int(header["record_bytes"][0]) != self.dtype.itemsize:
+            raise ValueError(f"{path} : taille d'enregistrement incohérente")
+        # Un enregistrement en cours d'ajout (incomplet) est ignoré
+        n = (os.path.getsize(path) - HEADER_BYTES) // self.dtype.itemsize
+        if n > 0:
+            self.records = np.memmap(path, dtype=self.dtype, mode="r",
+                                     offset=HEADER_BYTES, shape=(n,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def pieces(self):
+        # (n, H, W) uint8, vue sur le fichier
+        return self.records["pieces"]
+
+    @property
+    def scores(self):
+        return self.records["score"] if self.flags & SCORES else None
+
+    def rotations(self, index=slice(None)):
+        return unpack_rotations(np.atleast_2d(self.records["rotations"][index]), self.shape)
+
+    def boards(self, index=slice(None)):
+        # (boards_p, boards_r) int16 (n, H, W) ; cellules vides : pièce -1
+        records = np.atleast_1d(self.records[index])
+        boards_p = records["pieces"].astype(np.int16)
+        boards_r = unpack_rotations(records["rotations"], self.shape).astype(np.int16)
+        if self.flags & MASK:
+            n = self.shape[0] * self.shape[1]
+            filled = np.unpackbits(records["mask"], axis=1, count=n, bitorder="little")
+            boards_p[filled.reshape(boards_p.shape) == 0] = -1
+        return boards_p, boards_r
+
+    def board(self, k):
+        boards_p, boards_r = self.boards(slice(k, k + 1))
+        return boards_p[0], boards_r[0]
+
+    def close(self):
+        # La projection est libérée avec la dernière vue sur le fichier
+        self.records = None
+
+
+# ==============================
+# Conversions CSV / indices
+# ==============================
+def read_csv_board(filename, shape=(16, 16)):
+    # CSV i,j,id,orientation -> (board_p, board_r) ; cellules absentes : -1
+    board_p = np.full(shape, -1, dtype=np.int16)
+    board_r = np.zeros(shape, dtype=np.int16)
+    data = np.loadtxt(filename, delimiter=",", dtype=np.int64, ndmin=2)
+    if len(data):
+        i, j, piece_id, orientation = data.T
+        board_p[i, j] = piece_id - 1
+        board_r[i, j] = (3 - orientation) % 4
+    return board_p, board_r
+
+
+def csv_rows(board_p, board_r):
+    # Lignes [i, j, id, orientation] des cellules occupées
+    H, W = board_p.shape
+    ii, jj = np.indices((H, W))
+    rows = np.stack([ii.ravel(), jj.ravel(), board_p.ravel().astype(np.int64) + 1,
+                     (3 - board_r.ravel().astype(np.int64)) % 4], axis=1)
+    return rows[board_p.ravel() >= 0].tolist()
+
+
+def write_csv_board(filename, board_p, board_r):
+    with open(filename, "w") as f:
+        for i, j, piece_id, orientation in csv_rows(board_p, board_r):
+            f.write(f"{i},{j},{piece_id},{orientation}\n")
+
+
+def csv_to_boards(filenames, path, shape=(16, 16)):
+    # Plusieurs CSV (solutions ou indices) -> un fichier .e2b
+    boards = [read_csv_board(f, shape) for f in filenames]
+    write_boards(path, [b[0] for b in boards], [b[1] for b in boards])
+
+
+def boards_to_csv(path, directory, prefix="board"):
+    # Un fichier .e2b -> un CSV par plateau ; renvoie les noms écrits
+    boards = BoardFile(path)
+    os.makedirs(directory, exist_ok=True)
+    boards_p, boards_r = boards.boards()
+    scores = boards.scores
+    names = []
+    for k in range(len(boards_p)):
+        suffix = f"{int(scores[k])}_{k}" if scores is not None else f"{k}"
+        names.append(os.path.join(directory, f"{prefix}_{suffix}.csv"))
+        write_csv_board(names[-1], boards_p[k], boards_r[k])
+    boards.close()
+    return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="conversions CSV <-> e2b")
+    sub = parser.add_subparsers(dest="command", required=True)
+    to_bin = sub.add_parser("to-e2b", help="CSV (motifs glob) vers un fichier e2b")
+    to_bin.add_argument("output")
+    to_bin.add_argument("csv", nargs="+")
+    to_bin.add_argument("-shape", default="16x16", metavar="HxW")
+    to_csv = sub.add_parser("to-csv", help="fichier e2b vers un CSV par plateau")
+    to_csv.add_argument("input")
+    to_csv.add_argument("directory")
+    to_csv.add_argument("-prefix", default="board")
+    args = parser.parse_args()
+
+    if args.command == "to-e2b":
+        files = sorted({f for pattern in args.csv for f in glob.glob(pattern)})
+        shape = tuple(int(x) for x in args.shape.lower().split("x"))
+        csv_to_boards(files, args.output, shape)
+        print(f"{len(files)} plateaux -> {args.output}")
+    else:
+        names = boards_to_csv(args.input, args.directory, args.prefix)
+        print(f"{len(names)} plateaux -> {args.directory}")
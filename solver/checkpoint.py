@@ -0,0 +1,120 @@
+import os
+import numpy as np
+from numba import _helperlib
+from solver.boardfile import BoardFile, write_boards, MAX_PIECES
+
+# ==============================
+# Points de reprise des chaînes
+# ==============================
+# Un fichier .npz non compressé par chaîne : plateaux courant et meilleur,
+# température, scores, compteurs, statistiques de mouvements et états des
+# générateurs aléatoires (numpy côté Python et numba côté code compilé).
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(directory, mode, seed):
+    return os.path.join(directory, f"{mode}_chain_{seed}.npz")
+
+
+def get_numba_rng_state():
+    ptr = _helperlib.rnd_get_np_state_ptr()
+    index, keys = _helperlib.rnd_get_state(ptr)
+    return np.array([index] + list(keys), dtype=np.int64)
+
+
+def set_numba_rng_state(state):
+    ptr = _helperlib.rnd_get_np_state_ptr()
+    _helperlib.rnd_set_state(ptr, (int(state[0]), [int(k) for k in state[1:]]))
+
+
+def save_checkpoint(path, board_p, board_r, best_p, best_r, T, current_score,
+                    best_score, counters, move_stats, elapsed):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _, np_keys, np_pos, np_has_gauss, np_gauss = np.random.get_state()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f,
+                 version=CHECKPOINT_VERSION,
+                 board_p=board_p, board_r=board_r,
+                 best_p=best_p, best_r=best_r,
+                 scalars=np.array([T, elapsed], dtype=np.float64),
+                 scores=np.array([current_score, best_score], dtype=np.int64),
+                 counters=counters, move_stats=move_stats,
+                 numba_rng=get_numba_rng_state(),
+                 np_rng_keys=np_keys,
+                 np_rng_extra=np.array([np_pos, np_has_gauss, np_gauss], dtype=np.float64))
+        f.flush()
+        os.fsync(f.fileno())
+    # Remplacement atomique : un arrêt pendant l'écriture laisse l'ancien point
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+    # Renvoie None si le point de reprise est absent ou illisible
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            if int(data["version"]) != CHECKPOINT_VERSION:
+                return None
+            ckpt = {key: data[key].copy() for key in data.files}
+    except (OSError, ValueError, KeyError):
+        return None
+    pos, has_gauss, gauss = ckpt["np_rng_extra"]
+    np.random.set_state(("MT19937", ckpt["np_rng_keys"], int(pos), int(has_gauss), float(gauss)))
+    set_numba_rng_state(ckpt["numba_rng"])
+    return {
+        "board_p": ckpt["board_p"],
+        "board_r": ckpt["board_r"],
+        "best_p": ckpt["best_p"],
+        "best_r": ckpt["best_r"],
+        "T": float(ckpt["scalars"][0]),
+        "elapsed": float(ckpt["scalars"][1]),
+        "current_score": int(ckpt["scores"][0]),
+        "best_score": int(ckpt["scores"][1]),
+        "counters": ckpt["counters"],
+        "move_stats": ckpt["move_stats"],
+    }
+
+
+def save_population(path, scores, boards_p, boards_r):
+    # Population du mode mémétique (plateaux remplis uniquement), au format
+    # e2b avec les scores ; .npz pour les puzzles de plus de MAX_PIECES pièces
+    if np.prod(np.shape(boards_p)[1:]) <= MAX_PIECES:
+        write_boards(path, boards_p, boards_r, scores)
+        return
+    path = os.path.splitext(path)[0] + ".npz"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, version=CHECKPOINT_VERSION, scores=scores, boards_p=boards_p, boards_r=boards_r)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_population(path):
+    # (scores, boards_p, boards_r) ou None ; à défaut de fichier .e2b, la
+    # population .npz (grands puzzles ou version précédente) est relue
+    legacy = os.path.splitext(path)[0] + ".npz"
+    if not os.path.exists(path) and os.path.exists(legacy):
+        return load_legacy_population(legacy)
+    try:
+        boards = BoardFile(path)
+    except (OSError, ValueError):
+        return None
+    if boards.scores is None:
+        return None
+    boards_p, boards_r = boards.boards()
+    return boards.scores.astype(np.int64), boards_p, boards_r
+
+
+def load_legacy_population(path):
+    try:
+        with np.load(path) as data:
+            if int(data["version"]) != CHECKPOINT_VERSION:
+                return None
+            return data["scores"].copy(), data["boards_p"].copy(), data["boards_r"].copy()
+    except (OSError, ValueError, KeyError):
+        return None
@@ -0,0 +1,96 @@
+import numpy as np
+from numba import njit
+
+# ==============================
+# Index couleurs / compatibilités
+# ==============================
+# Tables construites une fois à partir de t_rot (précalculé par
+# s_a.precompute_rotations, ligne p*4+r = côtés N, E, S, O de la pièce p
+# tournée de r) ; toutes sont des tableaux numpy plats utilisables
+# directement depuis numba. Les couleurs sont décalées de 1 pour que le
+# gris (-1) ait l'indice 0.
+
+ROT = 4
+
+
+def build_rot_mask(t_rot):
+    # rot_mask[p*4+d, c+1] : bits r des rotations de p montrant la couleur c
+    # sur le côté d
+    S = t_rot.shape[0]
+    n_colors = int(t_rot.max()) + 2
+    rot_mask = np.zeros((S, n_colors), dtype=np.uint8)
+    for p in range(S // ROT):
+        for r in range(ROT):
+            for d in range(4):
+                rot_mask[p*ROT+d, t_rot[p*ROT+r, d]+1] |= 1 << r
+    return rot_mask
+
+
+def build_side_lists(t_rot):
+    # Pour le côté d et la couleur c, les états s = p*4+r montrant c sur d :
+    # side_items[side_start[d*n_colors+c+1]:side_start[d*n_colors+c+2]]
+    n_colors = int(t_rot.max()) + 2
+    counts = np.zeros(4*n_colors, dtype=np.int64)
+    for s in range(t_rot.shape[0]):
+        for d in range(4):
+            counts[d*n_colors + t_rot[s, d]+1] += 1
+    side_start = np.zeros(4*n_colors+1, dtype=np.int64)
+    side_start[1:] = np.cumsum(counts)
+    side_items = np.zeros(side_start[-1], dtype=np.int64)
+    fill = side_start[:-1].copy()
+    for s in range(t_rot.shape[0]):
+        for d in range(4):
+            key = d*n_colors + t_rot[s, d]+1
+            side_items[fill[key]] = s
+            fill[key] += 1
+    return side_start, side_items
+
+
+def build_equiv_class(t_rot):
+    # Pièces identiques à une rotation près (même séquence cyclique de
+    # couleurs) : les échanger, réorientation comprise, ne change rien.
+    # Deux pièces de même multiensemble de couleurs mais d'ordre cyclique
+    # différent ne sont pas équivalentes.
+    N = t_rot.shape[0] // ROT
+    equiv_class = np.zeros(N, dtype=np.int64)
+    seen = {}
+    for p in range(N):
+        key = min(tuple(t_rot[p*ROT+r]) for r in range(ROT))
+        equiv_class[p] = seen.setdefault(key, len(seen))
+    return equiv_class
+
+
+def build_color_index(t_rot):
+    rot_mask = build_rot_mask(t_rot)
+    side_start, side_items = build_side_lists(t_rot)
+    equiv_class = build_equiv_class(t_rot)
+    return rot_mask, side_start, side_items, equiv_class
+
+
+@njit(cache=True)
+def best_rotation_from_masks(m0, m1, m2, m3):
+    # Chaque masque donne les rotations qui satisfont un côté. Addition
+    # bit à bit des quatre masques (compteur sur 3 bits par rotation), puis
+    # plus petite rotation au compte maximal (orient_cells de s_a.py).
+    s0 = m0 ^ m1
+    c0 = m0 & m1
+    t0 = s0 ^ m2
+    c1 = s0 & m2
+    ones = t0 ^ m3
+    c2 = t0 & m3
+    twos = c0 ^ c1 ^ c2
+    fours = (c0 & c1) | (c0 & c2) | (c1 & c2)
+    if fours:
+        best = fours
+    elif twos & ones:
+        best = twos & ones
+    elif twos:
+        best = twos
+    elif ones:
+        best = ones
+    else:
+        return 0
+    r = 0
+    while not (best >> r) & 1:
+        r += 1
+    return r
@@ -0,0 +1,135 @@
+import json
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+# ==============================
+# Portefeuille de chaînes
+# ==============================
+# Chaque chaîne publie dans son emplacement du bloc partagé son pas, son
+# score courant et son meilleur plateau. Comme pour GlobalBest, chaque
+# emplacement a un compteur de séquence (impair pendant l'écriture) : les
+# chaînes écrivent sans verrou (un seul écrivain par emplacement) et le
+# planificateur relit l'emplacement si une écriture l'a chevauché. Une
+# chaîne tuée en cours d'écriture laisse le compteur impair : après
+# READ_RETRIES essais la lecture renvoie None (emplacement sans données)
+# jusqu'à ce que reset le remette à un état pair.
+# Disposition : int64 (n, 5) [seq, seed, step, current, best], puis les
+# meilleurs plateaux board_p et board_r (n, H, W) en int16.
+
+SLOT_FIELDS = 5
+READ_RETRIES = 1000
+
+
+class PortfolioArena:
+    def __init__(self, n, shape, name=None):
+        self.n = n
+        self.shape = tuple(shape)
+        nbytes = 8 * SLOT_FIELDS * n + 2 * 2 * n * self.shape[0] * self.shape[1]
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self._attach()
+        if name is None:
+            self._slots[:] = 0
+            self._slots[:, 4] = -1
+
+    def _attach(self):
+        buf = self.shm.buf
+        H, W = self.shape
+        offset = 8 * SLOT_FIELDS * self.n
+        self._slots = np.ndarray((self.n, SLOT_FIELDS), dtype=np.int64, buffer=buf, offset=0)
+        self._boards_p = np.ndarray((self.n, H, W), dtype=np.int16, buffer=buf, offset=offset)
+        self._boards_r = np.ndarray((self.n, H, W), dtype=np.int16, buffer=buf,
+                                    offset=offset + 2 * self.n * H * W)
+
+    def __getstate__(self):
+        return {"name": self.shm.name, "n": self.n, "shape": self.shape}
+
+    def __setstate__(self, state):
+        self.n = state["n"]
+        self.shape = state["shape"]
+        self.shm = shared_memory.SharedMemory(name=state["name"])
+        self._attach()
+
+    def publish(self, slot, seed, step, current, best=None, board_p=None, board_r=None):
+        # best/board : seulement quand le meilleur de la chaîne a changé
+        row = self._slots[slot]
+        row[0] += 1
+        row[1] = seed
+        row[2] = step
+        row[3] = current
+        if best is not None:
+            row[4] = best
+            self._boards_p[slot] = board_p
+            self._boards_r[slot] = board_r
+        row[0] += 1
+
+    def read(self, slot, boards=True):
+        # {"seed", "step", "current", "best"} (+ "board_p", "board_r"), ou
+        # None si l'emplacement reste en cours d'écriture
+        row = self._slots[slot]
+        for _ in range(READ_RETRIES):
+            seq = row[0]
+            if seq % 2:
+                continue
+            info = {"seed": int(row[1]), "step": int(row[2]), "current": int(row[3]),
+                    "best": int(row[4])}
+            if boards:
+                info["board_p"] = self._boards_p[slot].copy()
+                info["board_r"] = self._boards_r[slot].copy()
+            if row[0] == seq:
+                return info
+        return None
+
+    def reset(self, slot):
+        # Emplacement d'une chaîne arrêtée, avant son remplaçant ; le
+        # compteur est impair pendant l'écriture même si la chaîne a été
+        # arrêtée au milieu d'une publication
+        row = self._slots[slot]
+        row[0] |= 1
+        row[1:4] = 0
+        row[4] = -1
+        row[0] += 1
+
+    def close(self, unlink=False):
+        del self._slots, self._boards_p, self._boards_r
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def board_distance(a_p, b_p):
+    # Part des cellules portant des pièces différentes
+    return float(np.mean(a_p != b_p))
+
+
+def rank_chains(chains, min_age):
+    # chains : {slot: {"best", "rate", "age", ...}}. Rang du meilleur score
+    # plus rang du taux d'amélioration récent (0 = meilleur) ; les chaînes
+    # plus jeunes que min_age ne sont pas classées parmi les retardataires.
+    slots = sorted(chains)
+    by_best = sorted(slots, key=lambda s: -chains[s]["best"])
+    by_rate = sorted(slots, key=lambda s: -chains[s]["rate"])
+    rank = {s: by_best.index(s) + by_rate.index(s) for s in slots}
+    order = sorted(slots, key=lambda s: (rank[s], -chains[s]["best"]))
+    eligible = [s for s in order if chains[s]["age"] >= min_age]
+    return order, rank, eligible
+
+
+def pick_laggards(order, eligible, n):
+    # Les n derniers éligibles du classement, jamais le meneur (order[0])
+    return [s for s in reversed(eligible) if s != order[0]][:n]
+
+
+class DecisionLog:
+    # Journal JSON-lines des décisions du planificateur (une ligne par
+    # décision, plus une ligne par tour avec le classement)
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, record):
+        record = dict(record, time=time.time())
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
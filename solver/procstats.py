@@ -0,0 +1,55 @@
+import os
+
+# ==============================
+# Mémoire et temps CPU des processus
+# ==============================
+# RSS compte en entier les pages partagées (code compilé hérité du parent,
+# bibliothèques) dans chaque processus ; PSS les divise entre les processus
+# qui les partagent, ce qui donne le vrai coût mémoire d'une chaîne.
+# Le temps CPU d'un processus compte tous ses threads (pool de numba du
+# polissage compris).
+# Linux uniquement (/proc) ; ailleurs les valeurs sont None.
+
+
+def process_memory(pid="self"):
+    # {"rss": kB, "pss": kB}
+    memory = {"rss": None, "pss": None}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("Rss", "Pss"):
+                    memory[key.lower()] = int(value.split()[0])
+    except OSError:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        memory["rss"] = int(line.split()[1])
+        except OSError:
+            pass
+    return memory
+
+
+def process_cpu_seconds(pid="self"):
+    # Temps CPU utilisateur + système d'un processus vivant (ou pas encore
+    # attendu), en secondes
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Champs après le nom entre parenthèses : utime et stime sont
+            # les champs 14 et 15 de stat
+            fields = f.read().rpartition(")")[2].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def children_cpu_seconds():
+    # Temps CPU cumulé des processus fils terminés et attendus (join)
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+def format_memory(memory):
+    return " | ".join(f"{key.upper()} {value / 1024:.0f} MB"
+                      for key, value in memory.items() if value is not None)
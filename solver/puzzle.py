@@ -0,0 +1,95 @@
+import os
+import numpy as np
+from core.defs import PuzzleDefinition, TYPE_CORNER, TYPE_EDGE, TYPE_INNER
+
+# ==============================
+# Instance de puzzle vue par le solveur
+# ==============================
+# Dimensions, pièces (côtés N, E, S, O dans le repère du solveur, gris = -1,
+# pièces indexées à partir de 0) et cellules fixées (i, j, pièce, rotation).
+# Les noyaux compilés lisent les dimensions sur la forme des plateaux : une
+# même compilation sert toutes les tailles.
+
+ROT = 4
+
+
+class Puzzle:
+    def __init__(self, tiles, height, width, fixed=(), name="puzzle", conf=None):
+        self.tiles = np.asarray(tiles, dtype=np.int16)
+        self.height = height
+        self.width = width
+        self.N = len(self.tiles)
+        if self.N != height * width:
+            raise ValueError(f"{self.N} pieces for a {height}x{width} board")
+        self.fixed = [tuple(int(x) for x in f) for f in fixed]
+        self.name = name
+        self.conf = conf
+        # t_rot[p*4+r] : côtés de la pièce p tournée de r
+        self.t_rot = np.stack([np.roll(self.tiles, -r, axis=1) for r in range(ROT)],
+                              axis=1).reshape(self.N * ROT, 4)
+        greys = (self.tiles == -1).sum(axis=1)
+        self.piece_types = np.where(greys == 2, TYPE_CORNER,
+                                    np.where(greys == 1, TYPE_EDGE, TYPE_INNER)).astype(np.int64)
+
+    @property
+    def shape(self):
+        return self.height, self.width
+
+    def cell_type(self, i, j):
+        on_i = i == 0 or i == self.height - 1
+        on_j = j == 0 or j == self.width - 1
+        if on_i and on_j:
+            return TYPE_CORNER
+        if on_i or on_j:
+            return TYPE_EDGE
+        return TYPE_INNER
+
+    def max_score(self, border_weight=1):
+        h, w = self.height, self.width
+        return h * (w - 1) + w * (h - 1) + 2 * (h + w) * border_weight
+
+    @classmethod
+    def from_definition(cls, puzzle_def, name="puzzle", conf=None):
+        # Couleurs de PieceDef dans l'ordre E, S, O, N (0 = gris) ; l'indice
+        # 0 du solveur correspond à E, ce qui conserve la conversion
+        # d'orientation o = 3 - r des fichiers d'indices
+        tiles = [[c if c else -1 for c in puzzle_def.all[k].colors]
+                 for k in sorted(puzzle_def.all)]
+        fixed = [(i, j, piece_id - 1, (3 - orientation) % ROT)
+                 for i, j, piece_id, orientation in puzzle_def.hints]
+        return cls(tiles, puzzle_def.height, puzzle_def.width, fixed, name, conf)
+
+    @classmethod
+    def load(cls, conf, hints=None):
+        puzzle_def = PuzzleDefinition()
+        puzzle_def.load(conf, hints)
+        name = os.path.splitext(os.path.basename(conf))[0]
+        return cls.from_definition(puzzle_def, name, conf)
+
+    @classmethod
+    def synthetic(cls, height, width, edge_colors=3, inner_colors=4, seed=0, n_fixed=0):
+        # Instance aléatoire soluble : couleurs tirées sur les arêtes d'une
+        # grille, pièces découpées puis tournées et mélangées. Les arêtes
+        # entre deux cellules du cadre prennent les couleurs de bord.
+        rng = np.random.default_rng(seed)
+        horiz = rng.integers(0, inner_colors, (height, width - 1)) + edge_colors + 1
+        vert = rng.integers(0, inner_colors, (height - 1, width)) + edge_colors + 1
+        horiz[[0, -1], :] = rng.integers(1, edge_colors + 1, (2, width - 1))
+        vert[:, [0, -1]] = rng.integers(1, edge_colors + 1, (height - 1, 2))
+
+        solution = np.full((height, width, 4), -1, dtype=np.int16)
+        solution[1:, :, 0] = vert
+        solution[:, :-1, 1] = horiz
+        solution[:-1, :, 2] = vert
+        solution[:, 1:, 3] = horiz
+
+        order = rng.permutation(height * width)
+        rotations = rng.integers(0, ROT, height * width)
+        cells = solution.reshape(-1, 4)[order]
+        tiles = np.stack([np.roll(t, r) for t, r in zip(cells, rotations)])
+        # Cellules fixées : pièces de la solution tirées au hasard
+        fixed = []
+        for k in rng.permutation(height * width)[:n_fixed]:
+            piece = int(np.flatnonzero(order == k)[0])
+            fixed.append((k // width, k % width, piece, int(rotations[piece])))
+        return cls(tiles, height, width, fixed, f"synthetic_{height}x{width}_{seed}")
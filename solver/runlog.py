@@ -0,0 +1,182 @@
+import json
+import os
+import queue
+import threading
+import multiprocessing
+
+# ==============================
+# Journal du solveur (JSON lines)
+# ==============================
+# Une entrée JSON par ligne, ajoutée en fin de fichier : écrire une entrée
+# ne relit ni ne réécrit le journal. Les chaînes déposent leurs entrées
+# dans une file bornée sans jamais attendre (une entrée est perdue si la
+# file est pleine) ; un thread du lanceur est le seul écrivain et fait
+# tourner le fichier au-delà de max_bytes (log.jsonl -> log.jsonl.1 ...).
+# Les lecteurs (app.py) ne lisent que la fin du fichier.
+
+TAIL_BLOCK = 64 * 1024
+
+
+class RunLog:
+    def __init__(self, path, max_bytes=16 * 1024 * 1024, backups=3, queue_size=10000, ctx=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = (ctx or multiprocessing).Queue(queue_size)
+        self.thread = None
+
+    def write(self, entry):
+        # Côté chaîne : ne bloque jamais
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            pass
+
+    def start(self):
+        # Côté lanceur, avant de démarrer les chaînes
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        f = open(self.path, "ab")
+        size = f.tell()
+        try:
+            while True:
+                entry = self.queue.get()
+                if entry is None:
+                    break
+                line = (json.dumps(entry) + "\n").encode("utf-8")
+                f.write(line)
+                size += len(line)
+                if size > self.max_bytes:
+                    f.close()
+                    rotate(self.path, self.backups)
+                    f = open(self.path, "ab")
+                    size = 0
+                elif self.queue.empty():
+                    f.flush()
+        finally:
+            f.close()
+
+
+def rotate(path, backups):
+    for k in range(backups - 1, 0, -1):
+        if os.path.exists(f"{path}.{k}"):
+            os.replace(f"{path}.{k}", f"{path}.{k+1}")
+    if backups > 0:
+        os.replace(path, f"{path}.1")
+    else:
+        os.remove(path)
+
+
+def append_entry(path, entry):
+    # Écriture directe d'une entrée (une seule écriture en mode ajout), pour
+    # les processus lancés sans RunLog
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def tail_lines(path, n):
+    # Les n dernières lignes complètes du fichier, lues par blocs depuis la fin
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        end = pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            size = min(TAIL_BLOCK, pos)
+            pos -= size
+            f.seek(pos)
+            data = f.read(size) + data
+    lines = data.split(b"\n")
+    if end and not data.endswith(b"\n"):
+        lines = lines[:-1]  # ligne en cours d'écriture
+    if pos > 0:
+        lines = lines[1:]  # ligne coupée par le début du bloc
+    return [line for line in lines if line][-n:]
+
+
+def read_tail(path, n):
+    # Les n dernières entrées, en remontant dans le fichier tourné si besoin
+    entries = []
+    for line in tail_lines(path, n):
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    if len(entries) < n and os.path.exists(f"{path}.1"):
+        entries = read_tail(f"{path}.1", n - len(entries)) + entries
+    return entries
+
+
+class LogTail:
+    # Lecture incrémentale du journal à partir d'un curseur "inode:offset"
+    # (position après la dernière ligne lue, commune à tous les processus
+    # qui lisent le même fichier). Sans curseur, la lecture part de la fin.
+    # Une rotation est détectée au changement d'inode : la fin de l'ancien
+    # fichier (devenu path.1) est lue avant de repartir du début du nouveau.
+    def __init__(self, path, cursor=None):
+        self.path = path
+        self.inode, self.offset = None, 0
+        if cursor:
+            try:
+                inode, offset = cursor.split(":")
+                self.inode, self.offset = int(inode), int(offset)
+            except ValueError:
+                pass
+        if self.inode is None:
+            try:
+                st = os.stat(path)
+                self.inode, self.offset = st.st_ino, st.st_size
+            except OSError:
+                pass
+
+    @property
+    def cursor(self):
+        return f"{self.inode}:{self.offset}"
+
+    def poll(self):
+        # Nouvelles entrées depuis le dernier appel
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+        entries = []
+        if st.st_ino != self.inode:
+            try:
+                if self.inode is not None and os.stat(f"{self.path}.1").st_ino == self.inode:
+                    entries, _ = read_from(f"{self.path}.1", self.offset)
+            except OSError:
+                pass
+            self.inode, self.offset = st.st_ino, 0
+        elif st.st_size < self.offset:
+            self.offset = 0
+        if st.st_size > self.offset:
+            new_entries, self.offset = read_from(self.path, self.offset)
+            entries += new_entries
+        return entries
+
+
+def read_from(path, offset):
+    # Entrées des lignes complètes à partir de offset ; (entrées, nouvel offset)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    entries = []
+    for line in data[:end].split(b"\n"):
+        if line:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries, offset + end
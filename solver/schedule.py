@@ -0,0 +1,102 @@
+import numpy as np
+
+# ==============================
+# Refroidissement adaptatif
+# ==============================
+# La température n'est plus une constante qui décroît géométriquement :
+# - T0 est calibrée au démarrage sur un échantillon de variations de score
+#   (mouvements proposés puis annulés), pour que la part des mouvements
+#   dégradants acceptés vaille acc_start ;
+# - à chaque fenêtre de pas, T est corrigée pour suivre une courbe cible
+#   d'acceptation, décroissant log-linéairement de acc_start à acc_end sur
+#   cycle_steps pas ;
+# - une fois la courbe parcourue, la chaîne est réchauffée quand le
+#   meilleur score du cycle stagne depuis stall_factor fois l'écart moyen
+#   (moyenne glissante) entre ses améliorations.
+
+
+def acceptance(deltas, T):
+    # Part des mouvements dégradants (dS < 0) acceptés à la température T
+    worse = deltas[deltas < 0]
+    if len(worse) == 0:
+        return 1.0
+    return float(np.mean(np.exp(worse / T)))
+
+
+def calibrate_temperature(deltas, target, t_min, t_max=1e6):
+    # Température dont l'acceptation des mouvements dégradants vaut target
+    # (dichotomie en échelle log, l'acceptation croissant avec T)
+    if not np.any(deltas < 0):
+        return t_min
+    lo, hi = np.log(t_min), np.log(t_max)
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if acceptance(deltas, np.exp(mid)) < target:
+            lo = mid
+        else:
+            hi = mid
+    return float(np.exp(hi))
+
+
+class AdaptiveSchedule:
+    def __init__(self, acc_start, acc_end, cycle_steps, stall_factor, t_min,
+                 gain=0.5, gap_smoothing=0.2):
+        self.acc_start = acc_start
+        self.acc_end = acc_end
+        self.cycle_steps = cycle_steps
+        self.stall_factor = stall_factor
+        self.t_min = t_min
+        self.gain = gain
+        self.gap_smoothing = gap_smoothing
+        self.start_step = 0
+        self.acc_cycle = acc_start
+        self.cycle_best = None
+        self.last_gain_step = 0
+        self.mean_gap = cycle_steps / 10
+        self.reheats = 0
+
+    def start_cycle(self, step, score, acc):
+        # Nouveau cycle partant de l'acceptation acc
+        self.start_step = step
+        self.acc_cycle = acc
+        self.cycle_best = score
+        self.last_gain_step = step
+
+    def resume(self, step, score, acc):
+        # Reprise : la courbe est placée au point où la cible vaut acc
+        acc = min(max(acc, self.acc_end), self.acc_start)
+        progress = np.log(acc / self.acc_start) / np.log(self.acc_end / self.acc_start)
+        self.start_cycle(step - int(progress * self.cycle_steps), score, self.acc_start)
+        self.last_gain_step = step
+
+    def progress(self, step):
+        return min(max((step - self.start_step) / self.cycle_steps, 0.0), 1.0)
+
+    def target(self, step):
+        return self.acc_cycle * (self.acc_end / self.acc_cycle) ** self.progress(step)
+
+    def update(self, T, step, score, uphill, uphill_accepted):
+        # Fin de fenêtre : (uphill, uphill_accepted) mouvements dégradants
+        # proposés / acceptés depuis la précédente. Renvoie la nouvelle
+        # température et True si la chaîne doit être réchauffée.
+        if score > self.cycle_best:
+            gap = step - self.last_gain_step
+            self.mean_gap += self.gap_smoothing * (gap - self.mean_gap)
+            self.cycle_best = score
+            self.last_gain_step = step
+
+        if uphill > 0:
+            # Pour des variations de taille d, acc ≈ exp(-d/T) : T est
+            # corrigée du rapport des logarithmes (acceptation nulle
+            # comptée comme un demi-mouvement accepté)
+            measured = max(uphill_accepted, 0.5) / uphill
+            target = self.target(step)
+            if measured < 1.0:
+                ratio = np.log(measured) / np.log(target)
+                T *= min(max(ratio, 0.5), 2.0) ** self.gain
+            else:
+                T *= 2.0 ** self.gain
+            T = max(T, self.t_min)
+
+        stalled = step - self.last_gain_step > self.stall_factor * self.mean_gap
+        return T, self.progress(step) >= 1.0 and stalled
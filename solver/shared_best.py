@@ -0,0 +1,95 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+# ==============================
+# Meilleur global en mémoire partagée
+# ==============================
+# Disposition du bloc : int64 [seq, score, seed], float64 [time],
+# puis board_p et board_r (int16, hauteur x largeur).
+# Les écritures (rares) sont sérialisées par un verrou et encadrées par un
+# compteur de séquence (impair pendant l'écriture) : les lectures se font
+# sans verrou ni IPC et recommencent si une écriture les a chevauchées.
+
+HEADER_BYTES = 4 * 8
+
+
+class GlobalBest:
+    def __init__(self, lock, size=16, name=None):
+        # size : côté d'un plateau carré ou forme (hauteur, largeur)
+        self.shape = (size, size) if np.isscalar(size) else tuple(size)
+        self.lock = lock
+        nbytes = HEADER_BYTES + 2 * 2 * self.shape[0] * self.shape[1]
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self._attach()
+        if name is None:
+            self._header[:] = [0, -1, -1]
+            self._time[0] = 0.0
+
+    def _attach(self):
+        buf = self.shm.buf
+        n = self.shape[0] * self.shape[1]
+        self._header = np.ndarray((3,), dtype=np.int64, buffer=buf, offset=0)
+        self._time = np.ndarray((1,), dtype=np.float64, buffer=buf, offset=24)
+        self._board_p = np.ndarray(self.shape, dtype=np.int16, buffer=buf, offset=HEADER_BYTES)
+        self._board_r = np.ndarray(self.shape, dtype=np.int16, buffer=buf, offset=HEADER_BYTES + 2 * n)
+
+    # Transmis aux processus fils par nom de bloc
+    def __getstate__(self):
+        return {"name": self.shm.name, "lock": self.lock, "shape": self.shape}
+
+    def __setstate__(self, state):
+        self.shape = state["shape"]
+        self.lock = state["lock"]
+        self.shm = shared_memory.SharedMemory(name=state["name"])
+        self._attach()
+
+    @property
+    def score(self):
+        return int(self._header[1])
+
+    @property
+    def seed(self):
+        return int(self._header[2])
+
+    def read(self):
+        # Lecture cohérente (score, seed, time, board_p, board_r) sans verrou
+        while True:
+            seq = self._header[0]
+            if seq % 2:
+                continue
+            score, seed = int(self._header[1]), int(self._header[2])
+            elapsed = float(self._time[0])
+            board_p = self._board_p.copy()
+            board_r = self._board_r.copy()
+            if self._header[0] == seq:
+                return score, seed, elapsed, board_p, board_r
+
+    def snapshot(self):
+        score, seed, elapsed, _, _ = self.read()
+        return {'score': score, 'seed': seed, 'time': elapsed}
+
+    def try_update(self, score, seed, elapsed, board_p, board_r):
+        # Comparaison sans verrou d'abord : la plupart des améliorations
+        # locales ne battent pas le meilleur global
+        if score <= self._header[1]:
+            return False
+        with self.lock:
+            if score <= self._header[1]:
+                return False
+            self._header[0] += 1
+            self._header[1] = score
+            self._header[2] = seed
+            self._time[0] = elapsed
+            self._board_p[:] = board_p
+            self._board_r[:] = board_r
+            self._header[0] += 1
+        return True
+
+    def close(self, unlink=False):
+        del self._header, self._time, self._board_p, self._board_r
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
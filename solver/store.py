@@ -0,0 +1,158 @@
+import hashlib
+import os
+import sqlite3
+import time
+import numpy as np
+
+# ==============================
+# Index des solutions (SQLite)
+# ==============================
+# Chaque plateau sauvegardé est identifié par une empreinte canonique : les
+# rotations du plateau entier (quart de tour pour un plateau carré, demi-tour
+# sinon) donnent la même empreinte, une solution tournée n'est donc ni
+# réécrite ni re-rendue. Une ligne par (puzzle, empreinte) porte le score,
+# la graine, la chaîne, la date, le nombre d'arêtes intérieures fausses, les
+# points de bord compris dans le score maximal, le CSV et les images rendues ; le meilleur-N et la rétention des rendus sont
+# des requêtes sur l'index (puzzle, score).
+# Les chaînes écrivent (rarement) depuis plusieurs processus : journal WAL
+# et attente du verrou ; chaque processus ouvre sa propre connexion.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    puzzle TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    mismatches INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    chain INTEGER NOT NULL,
+    time REAL NOT NULL,
+    csv TEXT NOT NULL,
+    border INTEGER,
+    image_with TEXT,
+    image_without TEXT,
+    PRIMARY KEY (puzzle, hash)
+);
+CREATE INDEX IF NOT EXISTS solutions_score ON solutions (puzzle, score DESC, time DESC);
+CREATE INDEX IF NOT EXISTS solutions_rendered ON solutions (puzzle, score DESC, time DESC)
+    WHERE image_with IS NOT NULL;
+"""
+
+ROT = 4
+
+
+def migrate(conn):
+    # Bases écrites par une version antérieure : colonne border absente
+    # (NULL pour les lignes existantes) et index des rendus sans le puzzle
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(solutions)")]
+    if columns and "border" not in columns:
+        conn.execute("ALTER TABLE solutions ADD COLUMN border INTEGER")
+    row = conn.execute("SELECT sql FROM sqlite_master "
+                       "WHERE type = 'index' AND name = 'solutions_rendered'").fetchone()
+    if row is not None and "puzzle" not in row[0]:
+        conn.execute("DROP INDEX solutions_rendered")
+
+
+def board_rotations(board_p, board_r):
+    # Rotations du plateau entier : np.rot90 (k quarts de tour) fait tourner
+    # chaque pièce de k crans
+    H, W = board_p.shape
+    for k in (range(4) if H == W else (0, 2)):
+        yield np.rot90(board_p, k), (np.rot90(board_r, k) + k) % ROT
+
+
+def canonical_hash(board_p, board_r):
+    # Plus petite représentation (octets int16 pièces puis rotations) parmi
+    # les rotations du plateau
+    key = min(np.ascontiguousarray(p, dtype=np.int16).tobytes() +
+              np.ascontiguousarray(r, dtype=np.int16).tobytes()
+              for p, r in board_rotations(board_p, board_r))
+    return hashlib.sha1(key).hexdigest()
+
+
+def count_mismatches(board_p, board_r, t_rot):
+    # Arêtes intérieures dont les couleurs diffèrent (couleurs N, E, S, W)
+    colors = t_rot[board_p.astype(np.int64) * ROT + board_r]
+    horizontal = colors[:, :-1, 1] != colors[:, 1:, 3]
+    vertical = colors[:-1, :, 2] != colors[1:, :, 0]
+    return int(np.count_nonzero(horizontal) + np.count_nonzero(vertical))
+
+
+class SolutionStore:
+    def __init__(self, path, readonly=False, timeout=30.0):
+        self.path = path
+        self.readonly = readonly
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+
+    @property
+    def conn(self):
+        # Connexion propre au processus (une connexion ne survit pas au fork)
+        if self._conn is None or self._pid != os.getpid():
+            if self.readonly:
+                uri = f"file:{os.path.abspath(self.path)}?mode=ro"
+                self._conn = sqlite3.connect(uri, uri=True, timeout=self.timeout,
+                                             check_same_thread=False)
+            else:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._conn = sqlite3.connect(self.path, timeout=self.timeout)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                migrate(self._conn)
+                self._conn.executescript(SCHEMA)
+            self._pid = os.getpid()
+        return self._conn
+
+    def add(self, puzzle, key, score, mismatches, seed, chain, csv, border=None):
+        # False si le plateau (à une rotation près) est déjà indexé ; border :
+        # points de bord du score maximal (score affiché = score - border)
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO solutions "
+                "(puzzle, hash, score, mismatches, seed, chain, time, csv, border) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (puzzle, key, int(score), int(mismatches), int(seed), int(chain), time.time(), csv,
+                 None if border is None else int(border)))
+        return cursor.rowcount == 1
+
+    def set_images(self, puzzle, key, image_with, image_without):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE solutions SET image_with = ?, image_without = ? WHERE puzzle = ? AND hash = ?",
+                (image_with, image_without, puzzle, key))
+
+    def top(self, n, puzzle=None, rendered=False):
+        # Les n meilleurs plateaux (les plus récents d'abord à score égal)
+        where, args = [], []
+        if puzzle is not None:
+            where.append("puzzle = ?")
+            args.append(puzzle)
+        if rendered:
+            where.append("image_with IS NOT NULL")
+        query = "SELECT * FROM solutions"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY score DESC, time DESC LIMIT ?"
+        cursor = self.conn.execute(query, args + [n])
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def evict_renders(self, keep, puzzle):
+        # Rétention : seuls les `keep` meilleurs plateaux rendus du puzzle
+        # gardent leurs images ; renvoie les fichiers à supprimer
+        with self.conn:
+            rows = self.conn.execute(
+                "SELECT hash, image_with, image_without FROM solutions "
+                "WHERE puzzle = ? AND image_with IS NOT NULL "
+                "ORDER BY score DESC, time DESC LIMIT -1 OFFSET ?",
+                (puzzle, keep)).fetchall()
+            self.conn.executemany(
+                "UPDATE solutions SET image_with = NULL, image_without = NULL "
+                "WHERE puzzle = ? AND hash = ?", [(puzzle, row[0]) for row in rows])
+        return [path for row in rows for path in row[1:] if path]
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
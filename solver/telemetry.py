@@ -0,0 +1,148 @@
+import os
+import time
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+# ==============================
+# Télémétrie des chaînes en mémoire partagée
+# ==============================
+# Un bloc par puzzle (telemetry_name), créé par le lanceur, garde un
+# emplacement par chaîne (indice de la chaîne modulo le nombre
+# d'emplacements). Chaque chaîne y réécrit ses compteurs après chaque lot,
+# sans verrou ni fichier : un seul écrivain par emplacement, encadré par un
+# compteur de séquence (impair pendant l'écriture) comme GlobalBest. app.py
+# ouvre le bloc du puzzle affiché par son nom à chaque lecture, ce qui suit
+# les redémarrages du solveur ; deux solveurs lancés sur des puzzles
+# différents ne partagent pas de bloc. Un emplacement qui reste impair
+# après READ_RETRIES essais (chaîne tuée en pleine écriture) est rendu
+# comme périmé, avec ses dernières valeurs.
+# Disposition : int64 [magic, n, pid du lanceur, points de bord], puis
+# int64 (n, 8) [seq, pid, seed, steps, accepts, boosts, current, best],
+# puis float64 (n, 3) [temperature, steps_per_sec, updated]. Les scores
+# comptent les points de bord (puzzle.max_score(poids) - puzzle.max_score(0)),
+# que le tableau de bord retire pour afficher les arêtes appariées.
+
+TELEMETRY_NAME = "edge_puzzle_telemetry"
+MAGIC = 0x45324D54  # "E2MT"
+HEADER_FIELDS = 4
+INT_FIELDS = 8
+FLOAT_FIELDS = 3
+READ_RETRIES = 1000
+
+
+def telemetry_name(puzzle_name):
+    # Nom du bloc d'un puzzle (caractères hors [A-Za-z0-9_] remplacés)
+    safe = "".join(c if c.isalnum() or c == "_" else "_" for c in puzzle_name)
+    return f"{TELEMETRY_NAME}_{safe}"
+
+
+def telemetry_size(n):
+    return 8 * (HEADER_FIELDS + n * (INT_FIELDS + FLOAT_FIELDS))
+
+
+class Telemetry:
+    def __init__(self, n, name=TELEMETRY_NAME, border=0):
+        # Côté lanceur : crée le bloc, en remplaçant celui d'un lancement
+        # arrêté sans nettoyage
+        try:
+            shared_memory.SharedMemory(name=name).unlink()
+        except FileNotFoundError:
+            pass
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=telemetry_size(n))
+        self.n = n
+        self._attach()
+        self._header[:] = [MAGIC, n, os.getpid(), border]
+        self._ints[:] = 0
+        self._ints[:, 2] = -1
+        self._floats[:] = 0.0
+        self._last = {}
+
+    def _attach(self):
+        self._header, self._ints, self._floats = telemetry_arrays(self.shm.buf, self.n)
+
+    def __getstate__(self):
+        return {"name": self.shm.name, "n": self.n}
+
+    def __setstate__(self, state):
+        self.n = state["n"]
+        self.shm = shared_memory.SharedMemory(name=state["name"])
+        self._attach()
+        self._last = {}
+
+    def publish(self, chain, seed, steps, accepts, boosts, current, best, temperature):
+        # Côté chaîne, après chaque lot ; le débit est mesuré entre deux
+        # publications du même processus
+        slot = chain % self.n
+        now = time.time()
+        last = self._last.get(slot)
+        rate = self._floats[slot, 1]
+        if last is not None and now > last[1] and steps >= last[0]:
+            rate = (steps - last[0]) / (now - last[1])
+        self._last[slot] = (steps, now)
+        row = self._ints[slot]
+        row[0] += 1
+        row[1:] = [os.getpid(), seed, steps, accepts, boosts, current, best]
+        self._floats[slot] = [temperature, rate, now]
+        row[0] += 1
+
+    def close(self, unlink=False):
+        del self._header, self._ints, self._floats
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def telemetry_arrays(buf, n):
+    header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=buf, offset=0)
+    offset = 8 * HEADER_FIELDS
+    ints = np.ndarray((n, INT_FIELDS), dtype=np.int64, buffer=buf, offset=offset)
+    offset += 8 * n * INT_FIELDS
+    floats = np.ndarray((n, FLOAT_FIELDS), dtype=np.float64, buffer=buf, offset=offset)
+    return header, ints, floats
+
+
+def read_telemetry(name=TELEMETRY_NAME):
+    # Côté lecteur (autre processus) : liste des chaînes ayant publié, vide
+    # si le solveur ne tourne pas ; "border" : points de bord des scores
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return []
+    if os.name != "nt":
+        # Le bloc appartient au lanceur : le suivi de ressources du lecteur
+        # ne doit pas le supprimer à sa sortie
+        resource_tracker.unregister(shm._name, "shared_memory")
+    try:
+        return read_slots(shm.buf, shm.size)
+    finally:
+        shm.close()
+
+
+def read_slots(buf, size):
+    if size < telemetry_size(0):
+        return []
+    header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=buf)
+    n, border = int(header[1]), int(header[3])
+    if header[0] != MAGIC or n <= 0 or size < telemetry_size(n):
+        return []
+    _, ints, floats = telemetry_arrays(buf, n)
+    chains = []
+    for slot in range(n):
+        row = ints[slot]
+        # Écriture jamais terminée : dernières valeurs lues, marquées périmées
+        stale = True
+        for _ in range(READ_RETRIES):
+            seq = row[0]
+            pid, seed, steps, accepts, boosts, current, best = (int(x) for x in row[1:])
+            temperature, rate, updated = (float(x) for x in floats[slot])
+            if seq % 2 == 0 and row[0] == seq:
+                stale = False
+                break
+        if seq == 0:
+            continue  # chaîne pas encore démarrée
+        chains.append({"chain": slot, "pid": pid, "seed": seed, "steps": steps,
+                       "accepts": accepts, "boosts": boosts, "current": current,
+                       "best": best, "temperature": temperature,
+                       "steps_per_sec": rate, "updated": updated, "stale": stale,
+                       "border": border})
+    return chains
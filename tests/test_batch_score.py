@@ -0,0 +1,81 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import s_a
+from core.board import Board
+from core.defs import PieceDef, PuzzleDefinition
+from solver.batch_score import score_boards
+from solver.puzzle import Puzzle
+
+# Score vectorisé (solver/batch_score.py) comparé, plateau par plateau, à
+# s_a.score_numba, à core.board.Board.evaluate et à un décompte direct des
+# côtés en défaut, sur des plateaux aléatoires (pièces et rotations
+# quelconques, bords compris).
+
+
+def random_boards(puzzle, n, seed):
+    rng = np.random.default_rng(seed)
+    boards_p = np.stack([rng.permutation(puzzle.N).reshape(puzzle.shape) for _ in range(n)])
+    boards_r = rng.integers(0, 4, (n, *puzzle.shape))
+    # Un plateau résolu dans le lot : score maximal, aucun défaut
+    solved = Puzzle.synthetic(puzzle.height, puzzle.width, seed=0, n_fixed=puzzle.N)
+    for i, j, p, r in solved.fixed:
+        boards_p[0, i, j], boards_r[0, i, j] = p, r
+    return boards_p, boards_r
+
+
+def core_board(puzzle):
+    # Même jeu de pièces au format de core.defs (identifiants à partir de 1,
+    # couleurs E, S, O, N, gris = 0)
+    puzzle_def = PuzzleDefinition()
+    puzzle_def.height, puzzle_def.width = puzzle.shape
+    for p, colors in enumerate(puzzle.tiles):
+        puzzle_def.all[p + 1] = PieceDef(p + 1, *[int(c) if c > 0 else 0 for c in colors])
+    return Board(puzzle_def)
+
+
+def mismatched_sides(board_p, board_r, t_rot):
+    H, W = board_p.shape
+    cells = np.zeros((H, W), dtype=np.int64)
+    for i in range(H):
+        for j in range(W):
+            sides = t_rot[board_p[i, j] * 4 + board_r[i, j]]
+            for d, (di, dj) in enumerate(s_a.DIRS):
+                ni, nj = i + di, j + dj
+                if 0 <= ni < H and 0 <= nj < W:
+                    other = t_rot[board_p[ni, nj] * 4 + board_r[ni, nj]]
+                    cells[i, j] += sides[d] != other[(d + 2) % 4]
+                else:
+                    cells[i, j] += sides[d] != -1
+    return cells
+
+
+@pytest.mark.parametrize("n, height, width", [(1, 3, 3), (6, 4, 7), (4, 16, 16)])
+def test_score_boards(n, height, width):
+    puzzle = Puzzle.synthetic(height, width, seed=0)
+    t_rot = puzzle.t_rot
+    boards_p, boards_r = random_boards(puzzle, n, seed=height * width)
+
+    scores = score_boards(boards_p, boards_r, t_rot, s_a.BORDER_PENALTY_WEIGHT)
+    matches = score_boards(boards_p, boards_r, t_rot, border_weight=0)
+    scores_m, cells = score_boards(boards_p, boards_r, t_rot, s_a.BORDER_PENALTY_WEIGHT,
+                                   mismatch=True)
+    assert scores.shape == (n,) and cells.shape == (n, height, width)
+    assert np.array_equal(scores_m, scores)
+    assert scores[0] == puzzle.max_score() and not cells[0].any()
+
+    board = core_board(puzzle)
+    for b in range(n):
+        assert scores[b] == s_a.score_numba(boards_p[b], boards_r[b], t_rot)
+        board.set_arrays(boards_p[b] + 1, (3 - boards_r[b]) % 4)
+        assert matches[b] == board.evaluate()
+        assert np.array_equal(cells[b], mismatched_sides(boards_p[b], boards_r[b], t_rot))
+
+    # Plateau seul : scalaire et grille (H, W)
+    score, grid = score_boards(boards_p[-1], boards_r[-1], t_rot, mismatch=True)
+    assert score == scores[-1] and np.array_equal(grid, cells[-1])
@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.board import Board
+from core.defs import PieceDef, PuzzleDefinition
+from solver.puzzle import Puzzle
+
+# Score tenu à jour par core.board.Board (carte des arêtes concordantes)
+# comparé, après chaque modification, au recalcul complet de evaluate().
+
+
+def solved_board(height, width, seed):
+    # Plateau résolu d'un puzzle synthétique au format de core.defs
+    # (identifiants à partir de 1, couleurs E, S, O, N, gris = 0)
+    puzzle = Puzzle.synthetic(height, width, seed=seed, n_fixed=height * width)
+    puzzle_def = PuzzleDefinition()
+    puzzle_def.height, puzzle_def.width = puzzle.shape
+    for p, colors in enumerate(puzzle.tiles):
+        puzzle_def.all[p + 1] = PieceDef(p + 1, *[int(c) if c > 0 else 0 for c in colors])
+    pieces = np.zeros(puzzle.shape, dtype=np.int16)
+    dirs = np.zeros(puzzle.shape, dtype=np.int8)
+    for i, j, p, r in puzzle.fixed:
+        pieces[i, j], dirs[i, j] = p + 1, (3 - r) % 4
+    board = Board(puzzle_def)
+    board.set_arrays(pieces, dirs)
+    return board
+
+
+def test_incremental_score():
+    rng = random.Random(0)
+    board = solved_board(6, 7, seed=2)
+    H, W = board.height, board.width
+    assert board.score == board.evaluate() == board.max_score()
+
+    def cell():
+        return rng.randrange(H), rng.randrange(W)
+
+    for step in range(400):
+        move = step % 5
+        if move == 0:
+            i1, j1 = cell()
+            i2, j2 = cell()
+            board.exchange(i1, j1, i2, j2)
+            board.heuristic_orientation([(i1, j1), (i2, j2)])
+            board.fix_orientation([(i1, j1), (i2, j2)])
+        elif move == 1:
+            board.rotate(*cell(), rng.randrange(1, 4))
+        elif move == 2:
+            board.set_dir(*cell(), rng.randrange(4))
+        elif move == 3:
+            i, j = cell()
+            board.board[i][j].dir = rng.randrange(4)
+        else:
+            changed = board.heuristic_orientation()
+            assert all(board.is_inner(i, j) for i, j in changed)
+        assert board.score == board.evaluate(), (step, move)
+
+    # Couleur d'un côté modifiée sur le plateau
+    for _ in range(20):
+        i, j = cell()
+        board.board[i][j].set_color(rng.randrange(4), rng.randrange(1, 4))
+        assert board.score == board.evaluate()
+
+    # Modifications en bloc puis pièces posées une à une sur un plateau vide
+    board.fix_orientation()
+    assert board.score == board.evaluate()
+    pieces, dirs = board.pieces.copy(), board.dirs.copy()
+    board.clear()
+    assert board.score == board.evaluate() == 0
+    order = [(i, j) for i in range(H) for j in range(W)]
+    rng.shuffle(order)
+    for i, j in order:
+        board.put_piece(i, j, board.puzzle_def.all[int(pieces[i, j])], int(dirs[i, j]))
+        assert board.score == board.evaluate()
+    assert np.array_equal(board.pieces, pieces)
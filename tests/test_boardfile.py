@@ -0,0 +1,112 @@
+import os
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from solver.boardfile import (HEADER_BYTES, MASK, SCORES, BoardFile, append_board,
+                              boards_to_csv, csv_to_boards, read_csv_board, write_csv_board)
+
+# Format binaire des plateaux (solver/boardfile.py) : allers-retours avec les
+# CSV (plateaux complets et indices partiels), ajout en fin de fichier et
+# lecture projetée en mémoire.
+
+
+def random_board(rng, shape, holes=0):
+    H, W = shape
+    board_p = rng.permutation(H * W).reshape(shape).astype(np.int16)
+    board_r = rng.integers(0, 4, shape).astype(np.int16)
+    if holes:
+        cells = rng.choice(H * W, holes, replace=False)
+        board_p.ravel()[cells] = -1
+        board_r.ravel()[cells] = 0
+    return board_p, board_r
+
+
+def csv_lines(filename):
+    with open(filename) as f:
+        return sorted(f.read().splitlines())
+
+
+def round_trip(tmp_path, boards, shape):
+    sources = []
+    for k, (board_p, board_r) in enumerate(boards):
+        sources.append(str(tmp_path / f"source_{k}.csv"))
+        write_csv_board(sources[-1], board_p, board_r)
+    path = str(tmp_path / "boards.e2b")
+    csv_to_boards(sources, path, shape)
+    names = boards_to_csv(path, str(tmp_path / "out"))
+    assert len(names) == len(boards)
+    for source, name, (board_p, board_r) in zip(sources, names, boards):
+        assert csv_lines(name) == csv_lines(source)
+        p, r = read_csv_board(name, shape)
+        assert np.array_equal(p, board_p) and np.array_equal(r, board_r)
+    return BoardFile(path)
+
+
+def test_csv_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    shape = (16, 16)
+    boards = [random_board(rng, shape) for _ in range(3)]
+    boards_file = round_trip(tmp_path, boards, shape)
+    assert boards_file.flags == 0 and boards_file.scores is None
+    boards_p, boards_r = boards_file.boards()
+    assert np.array_equal(boards_p, [b[0] for b in boards])
+    assert np.array_equal(boards_r, [b[1] for b in boards])
+
+
+def test_hints_round_trip(tmp_path):
+    # Indices : la plupart des cellules vides, conservées grâce au masque
+    rng = np.random.default_rng(1)
+    shape = (6, 9)
+    boards = [random_board(rng, shape, holes=50), random_board(rng, shape, holes=1)]
+    boards_file = round_trip(tmp_path, boards, shape)
+    assert boards_file.flags == MASK and boards_file.shape == shape
+    board_p, board_r = boards_file.board(0)
+    assert np.array_equal(board_p, boards[0][0]) and np.array_equal(board_r, boards[0][1])
+    assert (board_p < 0).sum() == 50
+
+
+def test_append_and_memmap(tmp_path):
+    rng = np.random.default_rng(2)
+    shape = (5, 7)
+    path = str(tmp_path / "boards.e2b")
+    boards = [random_board(rng, shape) for _ in range(4)]
+    for k, (board_p, board_r) in enumerate(boards):
+        append_board(path, board_p, board_r, 100 + k)
+
+    boards_file = BoardFile(path)
+    assert isinstance(boards_file.records, np.memmap)
+    assert boards_file.flags == SCORES and len(boards_file) == 4
+    assert boards_file.scores.tolist() == [100, 101, 102, 103]
+    assert np.array_equal(boards_file.pieces, [b[0] for b in boards])
+    assert np.array_equal(boards_file.rotations(), [b[1] for b in boards])
+    assert np.array_equal(boards_file.rotations(2)[0], boards[2][1])
+    board_p, board_r = boards_file.board(3)
+    assert np.array_equal(board_p, boards[3][0]) and np.array_equal(board_r, boards[3][1])
+    boards_file.close()
+
+
+def test_truncated_record_ignored(tmp_path):
+    # Enregistrement en cours d'ajout : les plateaux complets restent lisibles
+    rng = np.random.default_rng(3)
+    shape = (4, 4)
+    path = str(tmp_path / "boards.e2b")
+    boards = [random_board(rng, shape) for _ in range(2)]
+    for board_p, board_r in boards:
+        append_board(path, board_p, board_r, 7)
+    record_bytes = (os.path.getsize(path) - HEADER_BYTES) // 2
+    with open(path, "ab") as f:
+        f.write(b"\x01" * (record_bytes - 1))
+
+    boards_file = BoardFile(path)
+    assert len(boards_file) == 2
+    boards_p, boards_r = boards_file.boards()
+    assert np.array_equal(boards_p, [b[0] for b in boards])
+    assert np.array_equal(boards_r, [b[1] for b in boards])
+
+    # Premier enregistrement incomplet : aucun plateau
+    with open(path, "r+b") as f:
+        f.truncate(HEADER_BYTES + record_bytes - 1)
+    assert len(BoardFile(path)) == 0
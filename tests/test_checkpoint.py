@@ -0,0 +1,102 @@
+import os
+import sys
+import numpy as np
+from numba import njit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import s_a
+from solver.checkpoint import (CHECKPOINT_VERSION, save_checkpoint, load_checkpoint,
+                               save_population, load_population)
+from solver.puzzle import Puzzle
+
+# Points de reprise (solver/checkpoint.py) : aller-retour complet d'une
+# chaîne, générateurs aléatoires compris, et relecture des populations
+# mémétiques au format .npz d'avant le format e2b.
+
+
+@njit
+def numba_draws(n):
+    return np.random.randint(0, 1 << 30, n)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    puzzle = Puzzle.synthetic(5, 5, seed=3)
+    slots, class_start, cell_mask, border_rot = s_a.build_move_tables(puzzle)
+    s_a.seed_numba(7)
+    np.random.seed(7)
+    board_p, board_r = s_a.init_board(puzzle, slots, class_start, cell_mask, border_rot)
+    best_p, best_r = s_a.init_board(puzzle, slots, class_start, cell_mask, border_rot)
+    counters = np.arange(s_a.N_COUNTERS, dtype=np.int64) * 1000
+    move_stats = np.arange(len(s_a.MOVE_NAMES) * 3, dtype=np.int64).reshape(-1, 3)
+    numba_draws(5)
+    np.random.rand(5)
+
+    path = str(tmp_path / "ckpt" / "sa_chain_7.npz")
+    save_checkpoint(path, board_p, board_r, best_p, best_r, 0.25, 31, 35,
+                    counters, move_stats, 12.5)
+    expected = numba_draws(8), np.random.rand(8)
+
+    # Générateurs déplacés puis restaurés par la relecture
+    s_a.seed_numba(99)
+    np.random.seed(99)
+    state = load_checkpoint(path)
+    assert np.array_equal(numba_draws(8), expected[0])
+    assert np.array_equal(np.random.rand(8), expected[1])
+
+    assert np.array_equal(state["board_p"], board_p) and np.array_equal(state["board_r"], board_r)
+    assert np.array_equal(state["best_p"], best_p) and np.array_equal(state["best_r"], best_r)
+    assert (state["T"], state["elapsed"]) == (0.25, 12.5)
+    assert (state["current_score"], state["best_score"]) == (31, 35)
+    assert np.array_equal(state["counters"], counters)
+    assert np.array_equal(state["move_stats"], move_stats)
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_checkpoint_missing_or_corrupt(tmp_path):
+    assert load_checkpoint(str(tmp_path / "absent.npz")) is None
+    path = tmp_path / "broken.npz"
+    path.write_bytes(b"not a zip")
+    assert load_checkpoint(str(path)) is None
+
+
+def test_population_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    scores = np.array([40, 38, 12], dtype=np.int64)
+    boards_p = np.stack([rng.permutation(36).reshape(6, 6) for _ in range(3)])
+    boards_r = rng.integers(0, 4, (3, 6, 6))
+    path = str(tmp_path / "memetic_population.e2b")
+    save_population(path, scores, boards_p, boards_r)
+    loaded = load_population(path)
+    assert np.array_equal(loaded[0], scores)
+    assert np.array_equal(loaded[1], boards_p) and np.array_equal(loaded[2], boards_r)
+
+
+def test_legacy_population(tmp_path):
+    # Population .npz écrite avant le format e2b, sans fichier .e2b à côté
+    scores = np.array([460, 455], dtype=np.int64)
+    boards_p = np.arange(2 * 256, dtype=np.int64).reshape(2, 16, 16) % 256
+    boards_r = np.ones((2, 16, 16), dtype=np.int64)
+    np.savez(tmp_path / "memetic_population.npz", version=CHECKPOINT_VERSION,
+             scores=scores, boards_p=boards_p, boards_r=boards_r)
+    loaded = load_population(str(tmp_path / "memetic_population.e2b"))
+    assert np.array_equal(loaded[0], scores)
+    assert np.array_equal(loaded[1], boards_p) and np.array_equal(loaded[2], boards_r)
+
+    # Version inconnue : population ignorée
+    np.savez(tmp_path / "memetic_population.npz", version=CHECKPOINT_VERSION + 1,
+             scores=scores, boards_p=boards_p, boards_r=boards_r)
+    assert load_population(str(tmp_path / "memetic_population.e2b")) is None
+
+
+def test_large_population_uses_npz(tmp_path):
+    # Au-delà de MAX_PIECES pièces, la population reste au format .npz
+    scores = np.array([10], dtype=np.int64)
+    boards_p = np.arange(18 * 18, dtype=np.int64).reshape(1, 18, 18)
+    boards_r = np.zeros((1, 18, 18), dtype=np.int64)
+    path = str(tmp_path / "memetic_population.e2b")
+    save_population(path, scores, boards_p, boards_r)
+    assert not os.path.exists(path)
+    loaded = load_population(path)
+    assert np.array_equal(loaded[0], scores) and np.array_equal(loaded[1], boards_p)
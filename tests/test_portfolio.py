@@ -0,0 +1,92 @@
+import os
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import s_a
+from solver.portfolio import PortfolioArena, board_distance, rank_chains, pick_laggards
+from solver.puzzle import Puzzle
+
+# Décisions du planificateur de portefeuille (classement, retardataires,
+# plateau de redémarrage) et lectures du bloc partagé des chaînes.
+
+
+def test_board_distance():
+    a = np.arange(16).reshape(4, 4)
+    b = a.copy()
+    assert board_distance(a, b) == 0.0
+    b[0, :2] = b[0, 1::-1]
+    assert board_distance(a, b) == 2 / 16
+
+
+def test_rank_chains():
+    chains = {
+        0: {"best": 400, "rate": 0.0, "age": 900},
+        1: {"best": 410, "rate": 30.0, "age": 900},
+        2: {"best": 395, "rate": 5.0, "age": 900},
+        3: {"best": 380, "rate": 50.0, "age": 100},
+        4: {"best": 390, "rate": 1.0, "age": 900},
+    }
+    order, rank, eligible = rank_chains(chains, min_age=600)
+    # Rangs : meilleur score + taux ; à égalité, le meilleur score passe devant
+    assert rank == {0: 1 + 4, 1: 0 + 1, 2: 2 + 2, 3: 4 + 0, 4: 3 + 3}
+    assert order == [1, 2, 3, 0, 4]
+    assert eligible == [1, 2, 0, 4]
+    # Les plus mal classés d'abord, hors meneur et chaînes trop jeunes
+    assert pick_laggards(order, eligible, 1) == [4]
+    assert pick_laggards(order, eligible, 3) == [4, 0, 2]
+    assert pick_laggards(order, eligible, 10) == [4, 0, 2]
+    # Meneur trop jeune pour être éligible : jamais remplacé non plus
+    order, _, eligible = rank_chains({0: {"best": 5, "rate": 1.0, "age": 0},
+                                      1: {"best": 1, "rate": 0.0, "age": 900}}, 600)
+    assert order == [0, 1] and pick_laggards(order, eligible, 2) == [1]
+    assert pick_laggards([1, 0], [1], 1) == []
+
+
+def test_restart_board(monkeypatch):
+    puzzle = Puzzle.synthetic(6, 6, seed=1)
+    scheduler = s_a.PortfolioScheduler(None, puzzle, None, None, (), "fixed")
+    slots, class_start, cell_mask, border_rot = scheduler.tables[:4]
+    board_p, board_r = s_a.init_board(puzzle, slots, class_start, cell_mask, border_rot)
+    leader = {"board_p": board_p, "board_r": board_r}
+
+    # Autres chaînes éloignées : copie conforme du meneur
+    far = {"board_p": np.roll(board_p, 1)}
+    p, r, kick, distance = scheduler.restart_board(leader, [far])
+    assert kick == 0 and np.array_equal(p, board_p) and np.array_equal(r, board_r)
+    assert distance == board_distance(board_p, far["board_p"])
+
+    # Autre chaîne identique au meneur : perturbation jusqu'au plancher
+    p, r, kick, distance = scheduler.restart_board(leader, [leader])
+    assert kick > 0 and distance >= s_a.PORTFOLIO_DIVERSITY
+    assert distance == board_distance(p, board_p)
+    assert sorted(p.ravel()) == list(range(puzzle.N))
+
+    # Plancher inatteignable : graine neuve
+    monkeypatch.setattr(s_a, "PORTFOLIO_DIVERSITY", 1.1)
+    assert scheduler.restart_board(leader, [leader]) is None
+
+
+def test_arena_seqlock():
+    arena = PortfolioArena(2, (3, 3))
+    try:
+        board = np.arange(9, dtype=np.int16).reshape(3, 3)
+        arena.publish(0, 7, 100, 12, 15, board, board % 4)
+        info = arena.read(0)
+        assert (info["seed"], info["step"], info["current"], info["best"]) == (7, 100, 12, 15)
+        assert np.array_equal(info["board_p"], board)
+        assert arena.read(1, boards=False)["best"] == -1
+
+        # Chaîne tuée en pleine publication : compteur impair, pas de données
+        arena._slots[0, 0] += 1
+        assert arena.read(0) is None
+        # reset rend l'emplacement lisible (compteur pair) et vide
+        arena.reset(0)
+        assert arena._slots[0, 0] % 2 == 0
+        assert arena.read(0, boards=False) == {"seed": 0, "step": 0, "current": 0, "best": -1}
+        arena.reset(1)
+        assert arena._slots[1, 0] % 2 == 0
+    finally:
+        arena.close(unlink=True)
@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from solver.runlog import RunLog, LogTail, read_tail, tail_lines
+
+# Journal JSON-lines (solver/runlog.py) : rotation par l'écrivain, lecture
+# incrémentale à partir d'un curseur inode:offset et lecture de la fin.
+
+
+def poll_until(tail, seen, count, timeout=10.0):
+    # L'écrivain est un thread : relève les entrées jusqu'à en avoir `count`
+    deadline = time.time() + timeout
+    while len(seen) < count and time.time() < deadline:
+        seen += tail.poll()
+        time.sleep(0.01)
+    return seen
+
+
+def test_rotation_and_log_tail(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    run_log = RunLog(path, max_bytes=400, backups=3)
+    run_log.start()
+    tail = LogTail(path)
+    seen = []
+    try:
+        k = 0
+        for chunk in range(20):
+            # Moins de max_bytes par lot : au plus une rotation entre deux relevés
+            for _ in range(15):
+                run_log.write({"k": k})
+                k += 1
+            seen = poll_until(tail, seen, k)
+            if chunk == 9:
+                # Reprise par un autre lecteur au curseur publié (app.py,
+                # Last-Event-ID d'un flux SSE)
+                assert tail.cursor == f"{os.stat(path).st_ino}:{tail.offset}"
+                tail = LogTail(path, tail.cursor)
+    finally:
+        run_log.close()
+
+    # Chaque entrée exactement une fois, dans l'ordre, malgré les rotations
+    assert [e["k"] for e in seen] == list(range(300))
+    assert os.path.exists(path + ".3") and not os.path.exists(path + ".4")
+    for name in (path, path + ".1", path + ".2"):
+        assert os.path.getsize(name) <= 400 + len(json.dumps({"k": 299}) + "\n")
+
+    # Fin du journal, fichier tourné compris
+    assert [e["k"] for e in read_tail(path, 50)] == list(range(250, 300))
+    assert tail.poll() == []
+
+
+def test_log_tail_partial_line(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_text("")
+    tail = LogTail(str(path))
+    with open(path, "a") as f:
+        f.write('{"k": 0}\n{"k": ')
+    # Ligne en cours d'écriture : laissée pour le relevé suivant
+    assert tail.poll() == [{"k": 0}]
+    assert tail_lines(str(path), 5) == [b'{"k": 0}']
+    with open(path, "a") as f:
+        f.write('1}\n{"k": 2}\n')
+    assert tail.poll() == [{"k": 1}, {"k": 2}]
+    assert tail.poll() == []
+    assert [e["k"] for e in read_tail(str(path), 2)] == [1, 2]
+
+
+def test_log_tail_without_cursor_starts_at_end(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_text('{"k": 0}\n')
+    tail = LogTail(str(path))
+    assert tail.poll() == []
+    with open(path, "a") as f:
+        f.write('{"k": 1}\n')
+    assert tail.poll() == [{"k": 1}]
+    # Curseur illisible : même comportement qu'en l'absence de curseur
+    assert LogTail(str(path), "garbage").poll() == []
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from solver.store import SolutionStore
+
+# Rétention des rendus de l'index de solutions (solver/store.py) : les
+# `keep` meilleurs plateaux rendus de chaque puzzle gardent leurs images, et
+# migration des bases écrites par une version antérieure.
+
+
+def add_rendered(store, puzzle, key, score):
+    assert store.add(puzzle, key, score, 0, 0, 0, f"{key}.csv", border=64)
+    store.set_images(puzzle, key, f"{puzzle}_{key}_with.png", f"{puzzle}_{key}_without.png")
+
+
+def test_evict_renders_per_puzzle(tmp_path):
+    store = SolutionStore(str(tmp_path / "solutions.sqlite"))
+    for score in range(5):
+        add_rendered(store, "a", f"a{score}", 100 + score)
+    add_rendered(store, "b", "b0", 10)
+
+    removed = store.evict_renders(2, "a")
+    assert sorted(removed) == sorted(f"a_a{s}_{kind}.png" for s in range(3)
+                                     for kind in ("with", "without"))
+    assert [row["hash"] for row in store.top(10, puzzle="a", rendered=True)] == ["a4", "a3"]
+    # Plateau d'un autre puzzle, moins bien noté : intact
+    assert [row["hash"] for row in store.top(10, puzzle="b", rendered=True)] == ["b0"]
+    assert store.evict_renders(2, "a") == []
+    assert store.top(1, puzzle="a")[0]["border"] == 64
+    store.close()
+
+
+def test_store_migrated(tmp_path):
+    # Base d'une version antérieure : index partiel sans la colonne puzzle,
+    # pas de colonne border
+    path = str(tmp_path / "solutions.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE solutions (puzzle TEXT, score INTEGER, time REAL, image_with TEXT)")
+    conn.execute("CREATE INDEX solutions_rendered ON solutions (score DESC, time DESC) "
+                 "WHERE image_with IS NOT NULL")
+    conn.execute("INSERT INTO solutions VALUES ('a', 470, 0, NULL)")
+    conn.commit()
+    conn.close()
+    store = SolutionStore(path)
+    sql, = store.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'solutions_rendered'").fetchone()
+    assert "puzzle" in sql
+    assert store.top(1, puzzle="a")[0]["border"] is None
+    store.close()
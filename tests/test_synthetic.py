@@ -0,0 +1,178 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import s_a
+from core.defs import TYPE_CORNER, TYPE_EDGE, TYPE_INNER
+from solver.puzzle import Puzzle
+
+# Tests de non-régression sur des instances synthétiques (petits plateaux,
+# classes de cellules réduites par les cellules fixées). Les lancements
+# complets passent par la ligne de commande, dans un dossier temporaire
+# (journal, solutions et points de reprise y sont écrits).
+
+
+def run_solver(tmp_path, *args):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "s_a.py"), *args],
+                          cwd=tmp_path, capture_output=True, text=True, timeout=600)
+
+
+def solution(height, width, seed=0):
+    # Pièces et placement de la solution d'une instance synthétique
+    full = Puzzle.synthetic(height, width, seed=seed, n_fixed=height * width)
+    return full.tiles, {(i, j): (p, r) for i, j, p, r in full.fixed}
+
+
+def with_fixed(height, width, cells, seed=0):
+    # Instance synthétique dont les cellules `cells` sont fixées à leur
+    # pièce de la solution
+    tiles, placed = solution(height, width, seed)
+    fixed = [(i, j, *placed[i, j]) for i, j in cells]
+    return Puzzle(tiles, height, width, fixed, f"fixed_{height}x{width}")
+
+
+def write_definition(path, puzzle, cells):
+    # Fichiers de définition et d'indices au format de core.defs
+    tiles, placed = solution(puzzle.height, puzzle.width)
+    conf, hints = path / "puzzle.csv", path / "hints.csv"
+    with open(conf, "w") as f:
+        f.write(f"{puzzle.height},{puzzle.width},3,4,\n")
+        for p, colors in enumerate(tiles):
+            f.write(",".join([str(p + 1)] + [str(c) if c > 0 else "" for c in colors]) + "\n")
+    with open(hints, "w") as f:
+        for i, j in cells:
+            p, r = placed[i, j]
+            f.write(f"{i},{j},{p + 1},{(3 - r) % 4}\n")
+    return str(conf), str(hints)
+
+
+@pytest.mark.parametrize("move", s_a.MOVE_NAMES)
+def test_move_delta_and_undo(move):
+    # Chaque mouvement renvoie la variation exacte du score complet, et le
+    # journal d'annulation rend le plateau d'origine à l'identique
+    puzzle = with_fixed(8, 8, [(0, 0), (4, 4), (0, 3)])
+    slots, class_start, cell_mask, border_rot = s_a.build_move_tables(puzzle)
+    rot_mask, _, _, equiv_class = s_a.build_color_index(puzzle.t_rot)
+    move_cdf = s_a.build_move_cdf({move: 1.0}, puzzle)
+    board_p, board_r = s_a.init_board(puzzle, slots, class_start, cell_mask, border_rot)
+    affected = np.zeros((s_a.UNDO_CAP, 2), dtype=np.int64)
+    undo = np.zeros((s_a.UNDO_CAP, 4), dtype=np.int64)
+    np.random.seed(1)
+    s_a.seed_numba(1)
+    for step in range(500):
+        before_p, before_r = board_p.copy(), board_r.copy()
+        before = s_a.score_numba(board_p, board_r, puzzle.t_rot)
+        kind, n, dS = s_a.propose_move_numba(board_p, board_r, puzzle.t_rot, slots, class_start,
+                                             cell_mask, border_rot, rot_mask, equiv_class,
+                                             move_cdf, affected, undo)
+        assert s_a.MOVE_NAMES[kind] == move
+        assert dS == s_a.score_numba(board_p, board_r, puzzle.t_rot) - before
+        for i, j, p, r in puzzle.fixed:
+            assert (board_p[i, j], board_r[i, j]) == (p, r)
+        if step % 2:
+            # Un pas sur deux est conservé pour varier les plateaux testés
+            continue
+        s_a.undo_move_numba(board_p, board_r, undo, n)
+        assert np.array_equal(board_p, before_p) and np.array_equal(board_r, before_r)
+
+
+@pytest.mark.parametrize("mode", ["sa", "tabu"])
+def test_3x3(tmp_path, mode):
+    # Une seule cellule intérieure : ni échange ni cycle dans cette classe
+    result = run_solver(tmp_path, "-synthetic", "3x3", "-mode", mode)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "SOLVED synthetic_3x3_0" in result.stdout
+
+
+def test_small_classes():
+    # 4x4 : deux coins et trois cellules intérieures fixés, il reste 2 coins,
+    # 8 bords et 1 cellule intérieure mobiles
+    puzzle = with_fixed(4, 4, [(0, 0), (3, 3), (1, 1), (1, 2), (2, 1)])
+    assert list(s_a.class_slot_counts(puzzle)) == [2, 8, 1]
+    ok = s_a.applicable_moves(puzzle)
+    assert ok[s_a.MOVE_SWAP] and ok[s_a.MOVE_ROTATE] and ok[s_a.MOVE_CYCLE3]
+    assert not ok[s_a.MOVE_BLOCK] and not ok[s_a.MOVE_SHIFT]
+
+    slots, class_start, cell_mask, border_rot = s_a.build_move_tables(puzzle)
+    classes = np.searchsorted(class_start, np.arange(class_start[3]), side="right") - 1
+    np.random.seed(0)
+    s_a.seed_numba(0)
+    pairs = [s_a.random_swap_pair(class_start) for _ in range(2000)]
+    assert {int(classes[k1]) for k1, _ in pairs} == {TYPE_CORNER, TYPE_EDGE}
+    assert all(classes[k1] == classes[k2] and k1 != k2 for k1, k2 in pairs)
+    cycles = [s_a.random_slot_class(class_start, 3) for _ in range(2000)]
+    assert {c for _, c in cycles} == {TYPE_EDGE}
+
+    # Recuit compilé : pas de boucle sans fin, score incrémental exact,
+    # cellules fixées intactes
+    rot_mask, _, _, equiv_class = s_a.build_color_index(puzzle.t_rot)
+    board_p, board_r = s_a.init_board(puzzle, slots, class_start, cell_mask, border_rot)
+    best_p, best_r = board_p.copy(), board_r.copy()
+    score = s_a.score_numba(board_p, board_r, puzzle.t_rot)
+    _, current, best, _ = s_a.run_batch(
+        board_p, board_r, best_p, best_r, puzzle.t_rot, slots, class_start, cell_mask,
+        border_rot, rot_mask, equiv_class, s_a.build_move_cdf(s_a.MOVE_PROBS, puzzle),
+        np.zeros((s_a.UNDO_CAP, 2), dtype=np.int64), np.zeros((s_a.UNDO_CAP, 4), dtype=np.int64),
+        np.zeros(s_a.N_COUNTERS, dtype=np.int64), np.zeros((len(s_a.MOVE_NAMES), 3), dtype=np.int64),
+        np.zeros((s_a.IMPROV_CAP, 2), dtype=np.int64), 1.0, score, score, 20000,
+        s_a.max_possible_score(puzzle), 0.9995, np.iinfo(np.int64).max)
+    assert current == s_a.score_numba(board_p, board_r, puzzle.t_rot)
+    assert best == s_a.score_numba(best_p, best_r, puzzle.t_rot)
+    for i, j, p, r in puzzle.fixed:
+        assert (board_p[i, j], board_r[i, j]) == (p, r)
+
+
+def test_no_swap(tmp_path):
+    # 3x3 dont tout le cadre est fixé : seule la rotation de la pièce
+    # centrale s'applique. Le recuit résout l'instance ; la recherche tabou
+    # ne peut pas démarrer et le lanceur sort en erreur.
+    cells = [(i, j) for i in range(3) for j in range(3) if (i, j) != (1, 1)]
+    puzzle = with_fixed(3, 3, cells)
+    ok = s_a.applicable_moves(puzzle)
+    assert list(np.flatnonzero(ok)) == [s_a.MOVE_ROTATE]
+    conf, hints = write_definition(tmp_path, puzzle, cells)
+
+    result = run_solver(tmp_path, "-conf", conf, "-hints", hints, "-mode", "sa")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "SOLVED puzzle" in result.stdout
+
+    result = run_solver(tmp_path, "-conf", conf, "-hints", hints, "-mode", "tabu")
+    assert result.returncode == 1
+    assert "NO CHAIN PRODUCED A SCORE" in result.stdout
+
+
+def test_guided_swap_cell():
+    # La cellule proposée est mobile, de même classe, et sa pièce peut
+    # montrer à l'un des voisins de (i1, j1) la couleur qu'il lui présente
+    puzzle = with_fixed(5, 5, [(0, 0), (2, 2)])
+    slots, class_start, cell_mask, border_rot = s_a.build_move_tables(puzzle)
+    rot_mask, side_start, side_items, equiv_class = s_a.build_color_index(puzzle.t_rot)
+    board_p, board_r = s_a.init_board(puzzle, slots, class_start, cell_mask, border_rot)
+    piece_cell = np.empty(puzzle.N, dtype=np.int64)
+    s_a.locate_pieces(board_p, piece_cell)
+    assert all(piece_cell[board_p[i, j]] == i * 5 + j for i in range(5) for j in range(5))
+    np.random.seed(0)
+    s_a.seed_numba(0)
+    found = 0
+    for _ in range(2000):
+        i1, j1 = slots[np.random.randint(0, class_start[3])]
+        cell = s_a.guided_swap_cell(board_p, board_r, puzzle.t_rot, cell_mask, side_start,
+                                    side_items, piece_cell, i1, j1)
+        if cell < 0:
+            continue
+        found += 1
+        i2, j2 = divmod(cell, 5)
+        assert (i2, j2) != (i1, j1) and not cell_mask[i2, j2] & s_a.CELL_FIXED
+        assert puzzle.cell_type(i2, j2) == puzzle.cell_type(i1, j1)
+        p2 = board_p[i2, j2]
+        shown = {(d, puzzle.t_rot[p2 * 4 + r, d]) for d in range(4) for r in range(4)}
+        wanted = {(d, puzzle.t_rot[board_p[i1 + di, j1 + dj] * 4 + board_r[i1 + di, j1 + dj], (d + 2) % 4])
+                  for d, (di, dj) in enumerate(s_a.DIRS)
+                  if 0 <= i1 + di < 5 and 0 <= j1 + dj < 5}
+        assert shown & wanted
+    assert found > 0
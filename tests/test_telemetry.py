@@ -0,0 +1,56 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from solver.telemetry import Telemetry, read_telemetry, telemetry_name
+
+# Télémétrie des chaînes en mémoire partagée (solver/telemetry.py), lue
+# comme le fait app.py.
+
+NAME = telemetry_name("test-%d" % os.getpid())
+
+
+def test_publish_and_read():
+    telemetry = Telemetry(3, NAME, border=64)
+    try:
+        assert read_telemetry(NAME) == []
+        telemetry.publish(1, 11, 5000, 1200, 2, 400, 410, 0.25)
+        (chain,) = read_telemetry(NAME)
+        assert {k: chain[k] for k in ("chain", "seed", "steps", "accepts", "boosts",
+                                      "current", "best", "temperature", "stale", "border")} == {
+            "chain": 1, "seed": 11, "steps": 5000, "accepts": 1200, "boosts": 2,
+            "current": 400, "best": 410, "temperature": 0.25, "stale": False, "border": 64}
+        assert chain["pid"] == os.getpid()
+    finally:
+        telemetry.close(unlink=True)
+    assert read_telemetry(NAME) == []
+
+
+def test_unfinished_write_is_stale():
+    # Chaîne tuée en pleine écriture : compteur de séquence resté impair
+    telemetry = Telemetry(2, NAME)
+    try:
+        telemetry.publish(0, 3, 100, 10, 0, 50, 55, 1.0)
+        telemetry._ints[0, 0] += 1
+        (chain,) = read_telemetry(NAME)
+        assert chain["stale"] and chain["best"] == 55
+    finally:
+        telemetry.close(unlink=True)
+
+
+def test_one_segment_per_puzzle():
+    # Deux solveurs sur des puzzles différents : blocs distincts
+    names = [telemetry_name(f"{puzzle}_{os.getpid()}")
+             for puzzle in ("eternity2_256_1", "synthetic_6x6_0")]
+    assert names[0] != names[1] and "/" not in telemetry_name("a/b")
+    first, second = Telemetry(1, names[0]), Telemetry(1, names[1])
+    try:
+        first.publish(0, 1, 10, 1, 0, 5, 6, 0.5)
+        second.publish(0, 2, 20, 2, 0, 7, 8, 0.5)
+        assert read_telemetry(names[0])[0]["seed"] == 1
+        assert read_telemetry(names[1])[0]["seed"] == 2
+    finally:
+        first.close(unlink=True)
+        second.close(unlink=True)
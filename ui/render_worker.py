@@ -0,0 +1,130 @@
+import os
+import queue
+import multiprocessing
+import numpy as np
+
+# ==============================
+# Rendu asynchrone des solutions
+# ==============================
+# Un processus de rendu unique garde le puzzle, le plateau et les images
+# des pièces (1024 sprites tournés) en mémoire. Les chaînes lui envoient
+# (score, enregistrement e2b de solver/boardfile.py) par une file bornée,
+# sans jamais attendre : une demande est perdue si la file est pleine, le
+# CSV restant sur disque. Le processus vide la file avant chaque rendu et ne
+# garde que la demande la plus récente de chaque seau de `bucket` points.
+# Avec un index de solutions (solver/store.py), les images sont nommées par
+# l'empreinte du plateau et enregistrées dans l'index ; seules celles des
+# `keep` meilleurs plateaux rendus de chaque puzzle sont gardées sur disque.
+
+
+class RenderQueue:
+    def __init__(self, conf, img_dir="img", bucket=1, queue_size=256, ctx=None,
+                 store=None, keep=12):
+        self.conf = conf
+        self.img_dir = img_dir
+        self.bucket = bucket
+        self.store = store
+        self.keep = keep
+        self.ctx = ctx or multiprocessing
+        self.queue = self.ctx.Queue(queue_size)
+        self.process = None
+
+    def submit(self, score, record, puzzle=None, key=None):
+        # Côté chaîne : ne bloque jamais ; record : un enregistrement e2b
+        # (octets), (puzzle, key) : ligne de l'index
+        try:
+            self.queue.put_nowait((score, record, puzzle, key))
+        except queue.Full:
+            pass
+
+    def start(self):
+        self.process = self.ctx.Process(target=render_worker,
+                                        args=(self.queue, self.conf, self.img_dir, self.bucket,
+                                              self.store, self.keep),
+                                        daemon=True)
+        self.process.start()
+
+    def close(self, timeout=30):
+        # Les demandes déjà en file sont rendues avant l'arrêt
+        if self.process is None:
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+
+
+def next_requests(requests):
+    # Bloque jusqu'à une demande puis vide la file ; renvoie les demandes
+    # en attente et False si l'arrêt a été demandé
+    pending = []
+    item = requests.get()
+    while True:
+        if item is None:
+            return pending, False
+        pending.append(item)
+        try:
+            item = requests.get_nowait()
+        except queue.Empty:
+            return pending, True
+
+
+def render_worker(requests, conf, img_dir, bucket, store=None, keep=12):
+    if os.name != "nt":  # Linux headless / Docker
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+    from core.defs import PuzzleDefinition
+    from core.board import Board
+    from ui.headless import BoardUi
+    from solver.boardfile import record_dtype, unpack_rotations
+
+    puzzle_def = PuzzleDefinition()
+    puzzle_def.load(conf)
+    board = Board(puzzle_def)
+    shape = (puzzle_def.height, puzzle_def.width)
+    ui = BoardUi(board)
+    ui.init()
+    os.makedirs(img_dir, exist_ok=True)
+
+    running = True
+    while running:
+        pending, running = next_requests(requests)
+        newest, puzzles = {}, set()
+        for request in pending:
+            puzzles.add(request[2])
+            newest[request[0] // bucket] = request
+        for _, (score, record, puzzle, key) in sorted(newest.items(), reverse=True):
+            record = np.frombuffer(record, dtype=record_dtype(shape))
+            board_r = unpack_rotations(record["rotations"], shape)[0]
+            images = render_board(board, ui, record["pieces"][0], board_r, img_dir, key)
+            if store is not None and key is not None:
+                store.set_images(puzzle, key, *images)
+        if store is not None:
+            for puzzle in puzzles:
+                for path in store.evict_renders(keep, puzzle):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+    if store is not None:
+        store.close()
+    pygame.quit()
+
+
+def render_board(board, ui, board_p, board_r, img_dir, key=None):
+    # Plateau dans la convention du solveur (pièces à partir de 0) ;
+    # renvoie les chemins des images avec et sans marques
+    board.set_arrays(board_p.astype(np.int16) + 1, (3 - board_r.astype(np.int16)) % 4)
+    board.marks = (board_p.astype(np.int64) + 1).tolist()
+    board.fix_orientation()
+    name = f"partial_solution_{board.evaluate()}"
+    if key is not None:
+        name += f"_{key[:12]}"
+    images = f"{img_dir}/{name}_with_marks.jpg", f"{img_dir}/{name}_without_marks.jpg"
+    ui.save(images[0], marks=True)
+    ui.save(images[1], marks=False)
+    return images